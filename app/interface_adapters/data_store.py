@@ -0,0 +1,219 @@
+import hashlib
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_key(valor) -> str:
+    """
+    Normaliza um código (vaga ou aplicante) para a forma textual usada nos índices.
+    Aceita int, float ou str e remove separadores de milhar (ex.: "4,530" -> "4530").
+    """
+    if isinstance(valor, (float, np.floating)) and float(valor).is_integer():
+        valor = int(valor)
+    return str(valor).replace(",", "").strip()
+
+
+def file_hash(path: str) -> str:
+    """Hash do conteúdo de um arquivo (identifica a versão dos dados usados em um artefato derivado)."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def hash_by_key(df: pd.DataFrame, key: str) -> pd.Series:
+    """
+    Hash do conteúdo agregado por chave: cada linha recebe um hash de todas as
+    colunas e as linhas de uma mesma chave são combinadas por soma (uint64,
+    independente da ordem).
+    """
+    if df.empty:
+        return pd.Series(dtype='uint64')
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    chaves = df[key].astype(str).to_numpy()
+    ordem = np.argsort(chaves, kind='stable')
+    chaves_ordenadas = chaves[ordem]
+    unicas, inicios = np.unique(chaves_ordenadas, return_index=True)
+    return pd.Series(np.add.reduceat(hashes[ordem], inicios), index=unicas)
+
+
+def compare_hashes(atual: pd.Series, anterior: pd.Series):
+    """Retorna (novas, alteradas, removidas) comparando hashes por chave (ver `hash_by_key`)."""
+    comuns = atual.index.intersection(anterior.index)
+    novas = set(atual.index.difference(anterior.index))
+    alteradas = set(comuns[atual.loc[comuns].to_numpy() != anterior.loc[comuns].to_numpy()])
+    removidas = set(anterior.index.difference(atual.index))
+    return novas, alteradas, removidas
+
+
+def _compare(serie: pd.Series, operador: str, valor) -> pd.Series:
+    """Avalia um filtro no formato do leitor parquet sobre uma coluna em memória."""
+    if operador in ('==', '='):
+        return serie == valor
+    if operador == '!=':
+        return serie != valor
+    if operador == '<':
+        return serie < valor
+    if operador == '<=':
+        return serie <= valor
+    if operador == '>':
+        return serie > valor
+    if operador == '>=':
+        return serie >= valor
+    if operador == 'in':
+        return serie.isin(valor)
+    if operador == 'not in':
+        return ~serie.isin(valor)
+    raise ValueError(f"Operador de filtro não suportado: {operador}")
+
+
+class IndexedTable:
+    """
+    Tabela carregada em memória com índices hash (chave -> posições das linhas).
+    """
+
+    def __init__(self, df: pd.DataFrame, index_columns: List[str], mtime: float):
+        self.df = df
+        self.mtime = mtime
+        self.indexes: Dict[str, Dict[str, np.ndarray]] = {}
+        for col in index_columns:
+            if col in df.columns:
+                chaves = df[col].map(normalize_key).to_numpy()
+                self.indexes[col] = pd.Series(np.arange(len(df))).groupby(chaves).indices
+
+    def positions(self, column: str, valor) -> np.ndarray:
+        """Retorna as posições das linhas cuja coluna indexada é igual ao valor."""
+        index = self.indexes.get(column)
+        if index is None:
+            raise KeyError(f"A coluna '{column}' não está indexada.")
+        return index.get(normalize_key(valor), np.empty(0, dtype=np.int64))
+
+    def lookup(self, column: str, valor) -> pd.DataFrame:
+        """Retorna as linhas cuja coluna indexada é igual ao valor (O(k))."""
+        return self.df.take(self.positions(column, valor))
+
+    def select(self, columns: Optional[List[str]] = None, filters: Optional[List[tuple]] = None) -> pd.DataFrame:
+        """
+        Aplica filtros e projeção de colunas sobre a tabela em memória.
+
+        Os filtros seguem o formato do leitor parquet (lista de tuplas
+        `(coluna, operador, valor)` combinadas com AND). Igualdades sobre
+        colunas indexadas são resolvidas pelo índice hash.
+        """
+        posicoes = None
+        restantes = []
+        for filtro in filters or []:
+            coluna, operador, valor = filtro
+            if coluna in self.indexes and operador in ('==', '=', 'in'):
+                valores = valor if operador == 'in' else [valor]
+                encontradas = np.concatenate(
+                    [self.positions(coluna, v) for v in valores] or [np.empty(0, dtype=np.int64)]
+                )
+                posicoes = encontradas if posicoes is None else np.intersect1d(posicoes, encontradas)
+            else:
+                restantes.append(filtro)
+
+        if posicoes is None:
+            df = self.df
+        else:
+            df = self.df.take(np.sort(posicoes))
+
+        if restantes:
+            mascara = np.ones(len(df), dtype=bool)
+            for coluna, operador, valor in restantes:
+                mascara &= _compare(df[coluna], operador, valor).to_numpy(dtype=bool)
+            df = df[mascara]
+
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+
+        return df.copy(deep=False)
+
+    def keys(self, column: str) -> List[str]:
+        return list(self.indexes.get(column, {}).keys())
+
+
+class DataStore:
+    """
+    Armazenamento em memória compartilhado pelo processo inteiro.
+
+    Cada tabela da camada silver é lida uma única vez e mantida em cache junto
+    com seus índices. O cache é invalidado automaticamente quando o mtime do
+    arquivo muda no disco.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def instance(cls) -> "DataStore":
+        """Retorna a instância única (singleton) do processo."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def get(self, path: str, builder: Callable[[str], object], name: Optional[str] = None):
+        """
+        Retorna o objeto construído por `builder` a partir do arquivo informado,
+        reconstruindo-o apenas se o arquivo foi modificado desde a última leitura.
+
+        Args:
+            path: Caminho do arquivo
+            builder: Função que recebe o caminho e devolve o objeto a ser mantido em cache
+            name: Nome do tipo de objeto (permite cachear visões diferentes do mesmo arquivo)
+
+        Returns:
+            Objeto construído pelo builder
+        """
+        chave = (os.path.abspath(path), name or getattr(builder, '__qualname__', repr(builder)))
+        mtime = os.path.getmtime(chave[0])
+
+        with self._lock:
+            entrada = self._entries.get(chave)
+            if entrada is not None and entrada[0] == mtime:
+                return entrada[1]
+
+            objeto = builder(chave[0])
+            self._entries[chave] = (mtime, objeto)
+            return objeto
+
+    def get_table(self, path: str, index_columns: Optional[List[str]] = None,
+                  loader: Optional[Callable[[str], pd.DataFrame]] = None) -> IndexedTable:
+        """
+        Retorna a tabela indexada para o arquivo informado.
+
+        Args:
+            path: Caminho do arquivo parquet
+            index_columns: Colunas que devem receber índice hash
+            loader: Função de leitura alternativa (padrão: pd.read_parquet)
+
+        Returns:
+            IndexedTable com o DataFrame e seus índices
+        """
+        colunas = list(index_columns or [])
+
+        def builder(caminho):
+            return IndexedTable((loader or pd.read_parquet)(caminho), colunas, os.path.getmtime(caminho))
+
+        return self.get(path, builder, name=f"table:{','.join(colunas)}")
+
+    def invalidate(self, path: Optional[str] = None):
+        """Remove as entradas de um arquivo (ou todas) do cache."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                caminho = os.path.abspath(path)
+                for chave in [k for k in self._entries if k[0] == caminho]:
+                    del self._entries[chave]
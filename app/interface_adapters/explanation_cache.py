@@ -0,0 +1,132 @@
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.data_store import normalize_key
+from interface_adapters.storage import DEFAULT_STORAGE, StorageOptions
+
+
+def row_hashes(X: np.ndarray) -> List[str]:
+    """
+    Hash de cada linha da matriz de features (identifica a entrada explicada).
+    Calculado em float32, para que a mesma linha lida do parquet (float64) ou
+    do snapshot de features (float32) tenha o mesmo hash.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    return [hashlib.blake2b(linha.tobytes(), digest_size=8).hexdigest() for linha in X]
+
+
+class ExplanationCache:
+    """
+    Cache das atribuições (valores SHAP, DeepLIFT ou gradientes integrados)
+    de pares (aplicante, vaga) de uma versão do modelo e um método de explicação.
+
+    As entradas são indexadas por (codigo, id_vaga) e guardam o hash da linha
+    de features explicada: um par só é explicado novamente quando as features
+    mudam. Em memória o cache é um LRU limitado a `max_entries`; com `path`
+    as entradas também são persistidas em parquet (um arquivo por versão do
+    modelo e método), de onde são lidas sob demanda.
+    """
+
+    def __init__(self, model_version: str, path: Optional[str] = None, max_entries: int = 10000,
+                 storage: StorageOptions = DEFAULT_STORAGE, method: str = "shap"):
+        """
+        Args:
+            model_version: Versão do modelo cujas atribuições são guardadas
+            path: Diretório do cache em disco (None desativa a persistência)
+            max_entries: Quantidade máxima de entradas mantidas em memória
+            storage: Opções de gravação do parquet
+            method: Método (e configuração) das atribuições, parte do nome do arquivo
+        """
+        self.model_version = model_version
+        self.method = method
+        self.path = os.path.join(path, f"{method}_{model_version}.parquet") if path else None
+        self.max_entries = max_entries
+        self.storage = storage
+        self._lru: "OrderedDict[str, Tuple[str, np.ndarray]]" = OrderedDict()
+        self._disco: Optional[Dict[str, Tuple[str, np.ndarray]]] = None
+        self._novas: Dict[str, Tuple[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(codigo, id_vaga) -> str:
+        return f"{normalize_key(codigo)}|{normalize_key(id_vaga)}"
+
+    def _read_file(self) -> Dict[str, Tuple[str, np.ndarray]]:
+        df = pd.read_parquet(self.path)
+        return {
+            chave: (hash_linha, np.asarray(valores, dtype=np.float32))
+            for chave, hash_linha, valores in zip(df["chave"], df["hash"], df["valores"])
+        }
+
+    def _load_disk(self) -> Dict[str, Tuple[str, np.ndarray]]:
+        if self._disco is None:
+            self._disco = self._read_file() if self.path and os.path.exists(self.path) else {}
+        return self._disco
+
+    def _lembrar(self, chave: str, entrada: Tuple[str, np.ndarray]):
+        self._lru[chave] = entrada
+        self._lru.move_to_end(chave)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str], hashes: Iterable[str]) -> List[Optional[np.ndarray]]:
+        """
+        Atribuições de cada par (None quando ausente ou calculado para outras features).
+
+        Args:
+            keys: Chaves dos pares (ver `key`)
+            hashes: Hash da linha de features de cada par (ver `row_hashes`)
+        """
+        with self._lock:
+            resultado = []
+            for chave, hash_linha in zip(keys, hashes):
+                entrada = self._lru.get(chave)
+                if entrada is None and self.path:
+                    entrada = self._load_disk().get(chave)
+                if entrada is not None and entrada[0] == hash_linha:
+                    self._lembrar(chave, entrada)
+                    resultado.append(entrada[1])
+                else:
+                    resultado.append(None)
+            return resultado
+
+    def put_many(self, keys: Iterable[str], hashes: Iterable[str], values: np.ndarray):
+        """Guarda as atribuições (uma linha por par) calculados para as features informadas."""
+        with self._lock:
+            for chave, hash_linha, valores in zip(keys, hashes, np.asarray(values, dtype=np.float32)):
+                entrada = (hash_linha, valores)
+                self._lembrar(chave, entrada)
+                if self.path:
+                    self._novas[chave] = entrada
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def save(self):
+        """Persiste no disco (escrita atômica) as entradas novas, se houver persistência."""
+        with self._lock:
+            if not self.path or not self._novas:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+            # Relê o arquivo: outro processo pode ter salvo entradas desde a nossa leitura
+            entradas = self._read_file() if os.path.exists(self.path) else {}
+            entradas.update(self._novas)
+
+            df = pd.DataFrame({
+                "chave": list(entradas.keys()),
+                "hash": [hash_linha for hash_linha, _ in entradas.values()],
+                "valores": [valores for _, valores in entradas.values()],
+            })
+            self.storage.write(df, self.path, atomic=True)
+            self._disco = entradas
+            self._novas = {}
@@ -0,0 +1,242 @@
+import json
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.data_store import file_hash, normalize_key
+
+# Versão do formato em disco. Snapshots gravados com outra versão são ignorados.
+SNAPSHOT_VERSION = "2"
+# Colunas de chave do arquivo de features (não entram na matriz)
+KEY_COLUMNS = ('id_vaga', 'codigo')
+# Colunas que não são entrada do modelo (alvo do treino): gravadas no fim da
+# matriz, para que as features do modelo formem um bloco contíguo de colunas
+LABEL_COLUMNS = ('status_geral_codificado',)
+
+ARQUIVOS = ('matrix', 'id_vaga', 'codigo', 'vaga_keys', 'vaga_offsets',
+            'applicant_order', 'applicant_keys', 'applicant_offsets')
+
+
+def snapshot_path(features_path: str) -> str:
+    """Diretório do snapshot correspondente a um arquivo de features."""
+    return f"{os.path.splitext(features_path)[0]}_snapshot"
+
+
+class FeatureSnapshot:
+    """
+    Snapshot da matriz de features para o caminho de leitura do app.
+
+    Cada estrutura é um arquivo .npy no diretório do snapshot:
+        - matrix: features numéricas em float32 (linhas x colunas), com as
+          linhas ordenadas por vaga e o alvo nas últimas colunas
+        - id_vaga / codigo: chaves normalizadas de cada linha
+        - vaga_keys / vaga_offsets: vagas ordenadas e o início do bloco de
+          cada uma (o bloco de uma vaga é uma fatia contígua da matriz)
+        - applicant_order / applicant_keys / applicant_offsets: o mesmo por
+          aplicante, sobre uma permutação das linhas ordenada por código (e,
+          dentro de um aplicante, pela ordem do arquivo de features)
+        - _meta.json: versão, colunas e hash do parquet de origem, gravado por último
+
+    Os arquivos são abertos com memory-map: abrir o snapshot não decodifica
+    nada, as consultas leem só as linhas pedidas e processos diferentes (ex.:
+    workers do Streamlit) compartilham a mesma cópia no cache de páginas do
+    sistema operacional.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Diretório de um snapshot gravado por `build`
+        """
+        meta = self.read_meta(path)
+        if meta is None:
+            raise FileNotFoundError(f"Snapshot de features não encontrado em {path}")
+        self.path = path
+        self.meta = meta
+        for nome in ARQUIVOS:
+            setattr(self, nome, np.load(os.path.join(path, f'{nome}.npy'), mmap_mode='r'))
+        self.columns: List[str] = list(meta['columns'])
+        self.column_index = {coluna: i for i, coluna in enumerate(self.columns)}
+        self._selecoes: Dict[Tuple[str, ...], Union[slice, Tuple[np.ndarray, np.ndarray]]] = {}
+
+    @staticmethod
+    def read_meta(path: str) -> Optional[dict]:
+        """Metadados do snapshot, ou None se não existir ou for de outra versão do formato."""
+        caminho = os.path.join(path, '_meta.json')
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, encoding='utf-8') as f:
+            meta = json.load(f)
+        return meta if meta.get('version') == SNAPSHOT_VERSION else None
+
+    @staticmethod
+    def _offsets(chaves_ordenadas: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Chaves únicas e início de cada uma (mais o total) em um array já ordenado."""
+        unicas, inicios = np.unique(chaves_ordenadas, return_index=True)
+        return unicas, np.append(inicios, len(chaves_ordenadas)).astype(np.int64)
+
+    @staticmethod
+    def _texto(chaves: Sequence[str]) -> np.ndarray:
+        return np.array(chaves, dtype=str) if len(chaves) else np.array([], dtype='<U1')
+
+    @classmethod
+    def build(cls, path: str, df_features: pd.DataFrame, source: str = "") -> "FeatureSnapshot":
+        """
+        Grava o snapshot das features informadas.
+
+        Args:
+            path: Diretório de saída
+            df_features: DataFrame de features (com `id_vaga` e `codigo`)
+            source: Identificação do arquivo de origem (para detectar snapshot desatualizado)
+
+        Returns:
+            O snapshot recém-gravado, aberto com memory-map
+        """
+        colunas = [col for col in df_features.columns
+                   if col not in KEY_COLUMNS and pd.api.types.is_numeric_dtype(df_features[col].dtype)]
+        colunas = ([col for col in colunas if col not in LABEL_COLUMNS]
+                   + [col for col in colunas if col in LABEL_COLUMNS])
+        id_vaga = df_features['id_vaga'].map(normalize_key).to_numpy(dtype=object)
+        codigo = df_features['codigo'].map(normalize_key).to_numpy(dtype=object)
+
+        # Mesma ordem do FeatureStore: por vaga, estável dentro de cada vaga
+        ordem = np.argsort(id_vaga, kind='stable')
+        id_vaga, codigo = id_vaga[ordem], codigo[ordem]
+        matriz = np.zeros((len(df_features), len(colunas)), dtype=np.float32)
+        for i, coluna in enumerate(colunas):
+            matriz[:, i] = df_features[coluna].to_numpy(dtype=np.float32)[ordem]
+
+        vaga_keys, vaga_offsets = cls._offsets(id_vaga)
+        # Linhas na ordem original do arquivo, ordenadas (estável) por código
+        na_ordem_do_arquivo = np.argsort(ordem)
+        applicant_order = na_ordem_do_arquivo[np.argsort(codigo[na_ordem_do_arquivo], kind='stable')]
+        applicant_order = applicant_order.astype(np.int64)
+        applicant_keys, applicant_offsets = cls._offsets(codigo[applicant_order])
+
+        estruturas = {
+            'matrix': matriz,
+            'id_vaga': cls._texto(id_vaga),
+            'codigo': cls._texto(codigo),
+            'vaga_keys': cls._texto(vaga_keys),
+            'vaga_offsets': vaga_offsets,
+            'applicant_order': applicant_order,
+            'applicant_keys': cls._texto(applicant_keys),
+            'applicant_offsets': applicant_offsets,
+        }
+
+        os.makedirs(path, exist_ok=True)
+        for nome, valores in estruturas.items():
+            temporario = os.path.join(path, f'{nome}.tmp.npy')
+            np.save(temporario, valores)
+            os.replace(temporario, os.path.join(path, f'{nome}.npy'))
+
+        meta = {
+            'version': SNAPSHOT_VERSION,
+            'source': source,
+            'n_rows': int(len(matriz)),
+            'columns': colunas,
+        }
+        temporario = os.path.join(path, '_meta.json.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, os.path.join(path, '_meta.json'))
+        print(f"Snapshot de features gravado em {path}: {meta['n_rows']} linhas, {len(colunas)} colunas.")
+        return cls(path)
+
+    def __len__(self) -> int:
+        return int(self.meta['n_rows'])
+
+    @staticmethod
+    def _bloco(chaves: np.ndarray, offsets: np.ndarray, valor) -> Tuple[int, int]:
+        """(início, fim) do bloco da chave ((0, 0) se ausente), por busca binária."""
+        chave = normalize_key(valor)
+        if not len(chaves):
+            return 0, 0
+        posicao = int(np.searchsorted(chaves, chave))
+        if posicao < len(chaves) and chaves[posicao] == chave:
+            return int(offsets[posicao]), int(offsets[posicao + 1])
+        return 0, 0
+
+    def vaga_rows(self, vaga_codigo) -> slice:
+        """Fatia das linhas de uma vaga."""
+        inicio, fim = self._bloco(self.vaga_keys, self.vaga_offsets, vaga_codigo)
+        return slice(inicio, fim)
+
+    def applicant_rows(self, applicant_codigo) -> np.ndarray:
+        """Posições das linhas de um aplicante (na ordem do arquivo de features)."""
+        inicio, fim = self._bloco(self.applicant_keys, self.applicant_offsets, applicant_codigo)
+        return np.asarray(self.applicant_order[inicio:fim])
+
+    def feature_matrix(self, feature_columns: Optional[Sequence[str]] = None, rows=None) -> np.ndarray:
+        """
+        Matriz de features (float32) na ordem de colunas pedida.
+
+        Quando as colunas pedidas são uma sequência contígua das colunas do
+        snapshot, na mesma ordem (ex.: as features do modelo, que só não têm o
+        alvo `status_geral_codificado`), e `rows` é uma fatia (ou None), devolve
+        uma visão do arquivo mapeado, sem cópia. Nos demais casos copia apenas
+        as linhas e colunas pedidas; colunas que o snapshot não tem ficam 0,
+        como em `InferencePlan.matrix`.
+
+        Args:
+            feature_columns: Colunas na ordem esperada (padrão: as do snapshot)
+            rows: Fatia ou posições das linhas (padrão: todas)
+        """
+        bloco = self.matrix if rows is None else self.matrix[rows]
+        if feature_columns is None or list(feature_columns) == self.columns:
+            return bloco
+
+        chave = tuple(feature_columns)
+        selecao = self._selecoes.get(chave)
+        if selecao is None:
+            destino = [i for i, coluna in enumerate(feature_columns) if coluna in self.column_index]
+            origem = [self.column_index[feature_columns[i]] for i in destino]
+            if len(destino) == len(feature_columns) and origem == list(range(origem[0], origem[0] + len(origem))):
+                # Colunas contíguas: basta fatiar as colunas da matriz
+                selecao = slice(origem[0], origem[0] + len(origem))
+            else:
+                selecao = (np.asarray(origem, dtype=np.int64), np.asarray(destino, dtype=np.int64))
+            self._selecoes[chave] = selecao
+        if isinstance(selecao, slice):
+            return bloco[:, selecao]
+        origem, destino = selecao
+        X = np.zeros((len(bloco), len(feature_columns)), dtype=np.float32)
+        X[:, destino] = bloco[:, origem]
+        return X
+
+    def keys(self, rows) -> pd.DataFrame:
+        """DataFrame só com as chaves (id_vaga e codigo) das linhas informadas, para junções."""
+        return pd.DataFrame({
+            'id_vaga': self.id_vaga[rows].astype(object),
+            'codigo': self.codigo[rows].astype(object),
+        })
+
+    def frame(self, rows) -> pd.DataFrame:
+        """
+        DataFrame (id_vaga, codigo e features) das linhas informadas. As
+        features de uma fatia são uma visão somente leitura do arquivo mapeado.
+        """
+        df = pd.DataFrame(self.matrix[rows], columns=self.columns, copy=False)
+        df.insert(0, 'id_vaga', self.id_vaga[rows].astype(object))
+        df.insert(1, 'codigo', self.codigo[rows].astype(object))
+        return df
+
+    def get_vaga(self, vaga_codigo) -> pd.DataFrame:
+        """Features dos candidatos de uma vaga (mesmas linhas do `FeatureStore.get_vaga`)."""
+        return self.frame(self.vaga_rows(vaga_codigo))
+
+    def get_applicant(self, applicant_codigo) -> pd.DataFrame:
+        """Features de todas as candidaturas de um aplicante."""
+        return self.frame(self.applicant_rows(applicant_codigo))
+
+
+if __name__ == "__main__":
+    # (Re)gera o snapshot de um arquivo de features já existente
+    features_path = sys.argv[1] if len(sys.argv) > 1 else 'app/data/silver/df_features.parquet'
+    FeatureSnapshot.build(snapshot_path(features_path), pd.read_parquet(features_path),
+                          source=file_hash(features_path))
@@ -0,0 +1,64 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.data_store import normalize_key
+
+
+class FeatureStore:
+    """
+    Tabela de features com chaves normalizadas e offsets por vaga e por aplicante.
+
+    As colunas `id_vaga` e `codigo` são normalizadas uma única vez na carga. As
+    linhas ficam ordenadas por vaga, de modo que o bloco de candidatos de uma vaga
+    é uma fatia contígua; para aplicantes é mantida uma permutação ordenada por
+    código com seus próprios offsets. Dentro de uma vaga ou de um aplicante as
+    linhas seguem a ordem do arquivo, como no filtro sobre a tabela inteira.
+    """
+
+    def __init__(self, df_features: pd.DataFrame):
+        df = df_features.reset_index(drop=True)
+        df["id_vaga"] = df["id_vaga"].map(normalize_key)
+        df["codigo"] = df["codigo"].map(normalize_key)
+
+        ordem_vaga = np.argsort(df["id_vaga"].to_numpy(dtype=object), kind="stable")
+        self.df = df.take(ordem_vaga).reset_index(drop=True)
+
+        chaves_vaga = self.df["id_vaga"].to_numpy(dtype=object)
+        self.vaga_offsets = self._build_offsets(chaves_vaga)
+
+        # Linhas de self.df na ordem original do arquivo, ordenadas (estável) por código
+        na_ordem_do_arquivo = np.argsort(ordem_vaga)
+        chaves_applicant = self.df["codigo"].to_numpy(dtype=object)
+        self.applicant_order = na_ordem_do_arquivo[
+            np.argsort(chaves_applicant[na_ordem_do_arquivo], kind="stable")
+        ]
+        self.applicant_offsets = self._build_offsets(chaves_applicant[self.applicant_order])
+
+    @staticmethod
+    def _build_offsets(chaves_ordenadas: np.ndarray) -> Dict[str, Tuple[int, int]]:
+        """Calcula (início, fim) de cada chave em um array já ordenado."""
+        if len(chaves_ordenadas) == 0:
+            return {}
+        unicas, inicios = np.unique(chaves_ordenadas, return_index=True)
+        fins = np.append(inicios[1:], len(chaves_ordenadas))
+        return {chave: (int(i), int(f)) for chave, i, f in zip(unicas, inicios, fins)}
+
+    @classmethod
+    def from_parquet(cls, path: str) -> "FeatureStore":
+        return cls(pd.read_parquet(path))
+
+    def get_vaga(self, vaga_codigo) -> pd.DataFrame:
+        """Retorna o bloco de features dos candidatos de uma vaga (fatia O(k))."""
+        inicio, fim = self.vaga_offsets.get(normalize_key(vaga_codigo), (0, 0))
+        return self.df.iloc[inicio:fim]
+
+    def get_applicant(self, applicant_codigo) -> pd.DataFrame:
+        """Retorna as features de todas as candidaturas de um aplicante."""
+        inicio, fim = self.applicant_offsets.get(normalize_key(applicant_codigo), (0, 0))
+        return self.df.take(self.applicant_order[inicio:fim])
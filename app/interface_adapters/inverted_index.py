@@ -0,0 +1,227 @@
+import json
+import os
+from array import array
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+# Versão do formato em disco. Índices gravados com outra versão são reconstruídos.
+INDEX_VERSION = "1"
+# Termos mais longos que isso (URLs coladas, lixo de extração) não entram no índice
+MAX_TERM_LENGTH = 64
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+ARQUIVOS = ('terms', 'offsets', 'doc_ids', 'tfs', 'doc_lengths', 'doc_keys')
+
+
+class InvertedIndex:
+    """
+    Índice invertido: termo -> lista de postings
+    (documento, frequência do termo no documento).
+
+    As estruturas são arrays NumPy, gravados por `build` como arquivos .npy
+    no diretório do índice:
+        - terms: vocabulário ordenado (busca binária)
+        - offsets: início da lista de postings de cada termo
+        - doc_ids / tfs: postings de todos os termos, concatenados
+        - doc_lengths: quantidade de termos de cada documento
+        - doc_keys: chave (codigo) de cada documento
+        - _meta.json: versão, origem e estatísticas, gravado por último
+
+    `open` abre os arquivos com memory-map: carregar o índice não lê as
+    listas de postings, e uma consulta só toca as listas dos seus termos.
+    A pontuação é BM25, ponderada pelo peso de cada termo na consulta.
+    """
+
+    def __init__(self, terms: np.ndarray, offsets: np.ndarray, doc_ids: np.ndarray,
+                 tfs: np.ndarray, doc_lengths: np.ndarray, doc_keys: np.ndarray,
+                 meta: Optional[dict] = None):
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        self.doc_keys = doc_keys
+        self.meta = meta or {}
+        self.n_docs = len(doc_keys)
+        self.avg_length = (float(doc_lengths.mean()) if len(doc_lengths) else 0.0) or 1.0
+        self._posicoes: Optional[Dict[str, int]] = None
+
+    @staticmethod
+    def _estruturas(keys: List[str], documents: Iterable[Mapping[str, int]]) -> Dict[str, np.ndarray]:
+        """Arrays do índice para os documentos (termo -> frequência, na ordem de `keys`)."""
+        vocabulario: Dict[str, int] = {}
+        termos_ids, docs, frequencias = array('i'), array('i'), array('i')
+        comprimentos = np.zeros(len(keys), dtype=np.float32)
+        for doc_id, documento in enumerate(documents):
+            for termo, tf in documento.items():
+                if len(termo) > MAX_TERM_LENGTH:
+                    continue
+                termos_ids.append(vocabulario.setdefault(termo, len(vocabulario)))
+                docs.append(doc_id)
+                frequencias.append(tf)
+                comprimentos[doc_id] += tf
+
+        # Renumera os termos em ordem lexicográfica e agrupa os postings por termo
+        termos = np.array(list(vocabulario), dtype=f'<U{MAX_TERM_LENGTH}')
+        ordem_termos = np.argsort(termos, kind='stable')
+        novo_id = np.empty(len(termos), dtype=np.int64)
+        novo_id[ordem_termos] = np.arange(len(termos))
+        termos_ids = novo_id[np.frombuffer(termos_ids, dtype=np.int32)]
+        ordem = np.argsort(termos_ids, kind='stable')
+
+        offsets = np.zeros(len(termos) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(termos_ids, minlength=len(termos)), out=offsets[1:])
+        return {
+            'terms': termos[ordem_termos],
+            'offsets': offsets,
+            'doc_ids': np.frombuffer(docs, dtype=np.int32)[ordem],
+            'tfs': np.minimum(np.frombuffer(frequencias, dtype=np.int32)[ordem], np.iinfo(np.uint16).max).astype(np.uint16),
+            'doc_lengths': comprimentos,
+            'doc_keys': np.array(keys, dtype=str) if len(keys) else np.array([], dtype='<U1'),
+        }
+
+    @classmethod
+    def from_documents(cls, keys: List[str], documents: Iterable[Mapping[str, int]]) -> "InvertedIndex":
+        """
+        Constrói o índice em memória.
+
+        Args:
+            keys: Chave de cada documento
+            documents: Termo -> frequência, um por documento (na ordem de `keys`)
+        """
+        return cls(**cls._estruturas(keys, documents))
+
+    @staticmethod
+    def read_meta(path: str) -> Optional[dict]:
+        """Metadados do índice, ou None se não existir ou for de outra versão do formato."""
+        caminho = os.path.join(path, '_meta.json')
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, encoding='utf-8') as f:
+            meta = json.load(f)
+        return meta if meta.get('version') == INDEX_VERSION else None
+
+    @classmethod
+    def open(cls, path: str) -> "InvertedIndex":
+        """
+        Abre um índice gravado por `build`, com memory-map.
+
+        Args:
+            path: Diretório do índice
+        """
+        meta = cls.read_meta(path)
+        if meta is None:
+            raise FileNotFoundError(f"Índice invertido não encontrado em {path}")
+        estruturas = {nome: np.load(os.path.join(path, f'{nome}.npy'), mmap_mode='r') for nome in ARQUIVOS}
+        return cls(**estruturas, meta=meta)
+
+    @classmethod
+    def build(cls, path: str, keys: List[str], documents: Iterable[Mapping[str, int]],
+              source: str = "") -> "InvertedIndex":
+        """
+        Constrói o índice e grava no diretório informado.
+
+        Args:
+            path: Diretório de saída
+            keys: Chave de cada documento
+            documents: Termo -> frequência, um por documento (na ordem de `keys`)
+            source: Identificação dos dados de origem (para detectar índice desatualizado)
+
+        Returns:
+            O índice recém-gravado, aberto com memory-map
+        """
+        estruturas = cls._estruturas(keys, documents)
+        os.makedirs(path, exist_ok=True)
+        for nome, valores in estruturas.items():
+            temporario = os.path.join(path, f'{nome}.tmp.npy')
+            np.save(temporario, valores)
+            os.replace(temporario, os.path.join(path, f'{nome}.npy'))
+
+        comprimentos = estruturas['doc_lengths']
+        meta = {
+            'version': INDEX_VERSION,
+            'source': source,
+            'n_docs': len(keys),
+            'n_terms': int(len(estruturas['terms'])),
+            'n_postings': int(len(estruturas['doc_ids'])),
+            'avg_length': float(comprimentos.mean()) if len(keys) else 0.0,
+        }
+        with open(os.path.join(path, '_meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+        print(f"Índice invertido gravado em {path}: {meta['n_docs']} documentos, {meta['n_terms']} termos.")
+        return cls.open(path)
+
+    def _term_ids(self, termos: List[str]) -> np.ndarray:
+        """Posição de cada termo no vocabulário (-1 se ausente)."""
+        ids = np.full(len(termos), -1, dtype=np.int64)
+        validos = [i for i, t in enumerate(termos) if len(t) <= MAX_TERM_LENGTH]
+        if not validos or not len(self.terms):
+            return ids
+        consulta = np.array([termos[i] for i in validos], dtype=self.terms.dtype)
+        posicoes = np.minimum(np.searchsorted(self.terms, consulta), len(self.terms) - 1)
+        encontrados = self.terms[posicoes] == consulta
+        ids[np.asarray(validos)[encontrados]] = posicoes[encontrados]
+        return ids
+
+    def _idf(self, df: np.ndarray) -> np.ndarray:
+        return np.log1p((self.n_docs - df + 0.5) / (df + 0.5))
+
+    def scores(self, termos: Mapping[str, float]) -> np.ndarray:
+        """
+        Pontuação BM25 de todos os documentos para a consulta.
+
+        Args:
+            termos: Termo -> peso na consulta
+
+        Returns:
+            Array (n_docs,) com a pontuação de cada documento (0 se nenhum termo em comum)
+        """
+        lista = list(termos)
+        ids = self._term_ids(lista)
+        docs, contribuicoes = [], []
+        for termo, termo_id in zip(lista, ids):
+            if termo_id < 0:
+                continue
+            inicio, fim = int(self.offsets[termo_id]), int(self.offsets[termo_id + 1])
+            doc_ids = np.asarray(self.doc_ids[inicio:fim])
+            tf = self.tfs[inicio:fim].astype(np.float32)
+            normalizacao = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_ids] / self.avg_length)
+            peso = termos[termo] * self._idf(fim - inicio)
+            docs.append(doc_ids)
+            contribuicoes.append(peso * tf * (BM25_K1 + 1) / (tf + normalizacao))
+        if not docs:
+            return np.zeros(self.n_docs, dtype=np.float64)
+        return np.bincount(np.concatenate(docs), weights=np.concatenate(contribuicoes), minlength=self.n_docs)
+
+    def _posicao_das_chaves(self) -> Dict[str, int]:
+        if self._posicoes is None:
+            self._posicoes = {chave: i for i, chave in enumerate(self.doc_keys.tolist())}
+        return self._posicoes
+
+    def query(self, termos: Mapping[str, float], limit: int,
+              excluir: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Documentos com maior pontuação para os termos da consulta.
+
+        Args:
+            termos: Termo -> peso na consulta
+            limit: Quantidade máxima de documentos retornados
+            excluir: Chaves a ignorar
+
+        Returns:
+            Lista (chave, pontuação) em ordem decrescente de pontuação (apenas pontuação > 0)
+        """
+        pontuacao = self.scores(termos)
+        if excluir:
+            posicoes = self._posicao_das_chaves()
+            ignorar = [posicoes[chave] for chave in excluir if chave in posicoes]
+            pontuacao[ignorar] = 0
+        candidatos = np.flatnonzero(pontuacao > 0)
+        if len(candidatos) > limit:
+            candidatos = candidatos[np.argpartition(-pontuacao[candidatos], limit - 1)[:limit]]
+        # Ordem determinística: pontuação decrescente, depois chave
+        ordem = sorted(candidatos, key=lambda i: (-pontuacao[i], self.doc_keys[i]))
+        return [(str(self.doc_keys[i]), float(pontuacao[i])) for i in ordem]
@@ -0,0 +1,192 @@
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+_WHITESPACE = " \t\n\r"
+# Caracteres que podem vir depois de uma chave ou valor do nível superior
+_FIM_DE_VALOR = _WHITESPACE + ",:}"
+
+
+def iter_json_object(json_path, chunk_size: int = 1 << 20) -> Iterator[Tuple[str, Any]]:
+    """
+    Percorre incrementalmente um objeto JSON de nível superior, devolvendo os
+    pares (chave, valor) um de cada vez.
+
+    Apenas o valor corrente e um bloco de leitura ficam em memória, de modo que
+    arquivos de vários GB podem ser lidos com memória constante.
+
+    Args:
+        json_path: Caminho do arquivo JSON (objeto no nível superior)
+        chunk_size: Quantidade de caracteres lidos do disco por vez
+
+    Yields:
+        Tuplas (chave, valor) na ordem do arquivo
+    """
+    decoder = json.JSONDecoder()
+
+    with open(json_path, encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def ler_mais():
+            nonlocal buffer, pos, eof
+            bloco = f.read(chunk_size)
+            if not bloco:
+                eof = True
+            # Descarta o que já foi consumido para manter a memória limitada
+            buffer = buffer[pos:] + bloco
+            pos = 0
+
+        def pular_espacos():
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    return
+                ler_mais()
+
+        def decodificar():
+            nonlocal pos
+            while True:
+                try:
+                    valor, fim = decoder.raw_decode(buffer, pos)
+                    # Um número pode ter sido cortado pelo fim do bloco e ainda assim
+                    # decodificar (ex.: "-1.25e" vira -1.25): só é aceito quando o
+                    # caractere seguinte já foi lido e encerra o valor
+                    if eof or (fim < len(buffer) and buffer[fim] in _FIM_DE_VALOR):
+                        pos = fim
+                        return valor
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                ler_mais()
+
+        def esperar(caractere):
+            nonlocal pos
+            pular_espacos()
+            if pos >= len(buffer) or buffer[pos] != caractere:
+                raise ValueError(f"JSON inválido em {json_path}: esperado '{caractere}'.")
+            pos += 1
+
+        esperar("{")
+        primeiro = True
+        while True:
+            pular_espacos()
+            if pos < len(buffer) and buffer[pos] == "}":
+                return
+            if not primeiro:
+                esperar(",")
+                pular_espacos()
+            primeiro = False
+            chave = decodificar()
+            esperar(":")
+            pular_espacos()
+            yield chave, decodificar()
+
+
+def _nested_columns(valor: Dict[str, Any], prefixo: str) -> Iterator[str]:
+    for chave, item in valor.items():
+        nome = f"{prefixo}{chave}"
+        if isinstance(item, dict):
+            yield from _nested_columns(item, f"{nome}.")
+        else:
+            yield nome
+
+
+def _flat_columns(registro: Dict[str, Any]) -> Iterator[str]:
+    """
+    Nomes das colunas geradas por pd.json_normalize para um registro, na mesma
+    ordem: primeiro os campos simples do nível superior, depois os aninhados.
+    """
+    for chave, valor in registro.items():
+        if not isinstance(valor, dict):
+            yield chave
+    for chave, valor in registro.items():
+        if isinstance(valor, dict):
+            yield from _nested_columns(valor, f"{chave}.")
+
+
+def _column_type(serie: pd.Series) -> pa.DataType:
+    """Tipo Arrow inferido para a coluna, como na gravação do DataFrame inteiro (nulo se não há valores)."""
+    if serie.isna().all():
+        return pa.null()
+    return pa.array(serie, from_pandas=True).type
+
+
+def _column_array(serie: pd.Series, tipo: pa.DataType) -> pa.Array:
+    # Coluna sem valores no lote (ausente nos registros): NaN float, que não converte para listas/structs
+    if serie.isna().all():
+        return pa.nulls(len(serie), type=tipo)
+    return pa.array(serie, type=tipo, from_pandas=True)
+
+
+def _batches(records: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    lote: List[Dict[str, Any]] = []
+    for registro in records:
+        lote.append(registro)
+        if len(lote) >= batch_size:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def write_records_streaming(records: Callable[[], Iterable[Dict[str, Any]]], output_path,
+                            batch_size: int = 5000, **parquet_options) -> int:
+    """
+    Grava registros JSON achatados em parquet, um row group por lote.
+
+    São feitas duas passagens sobre `records`, ambas em lotes de `batch_size`
+    registros achatados com pd.json_normalize. A primeira descobre as colunas
+    e o tipo de cada uma (o schema do ParquetWriter é fixo): o tipo inferido
+    em cada lote é promovido entre os lotes (ex.: inteiros e valores ausentes
+    viram double, colunas sem valores em um lote não restringem o tipo). O
+    resultado tem as mesmas colunas, ordem e tipos de
+    `pd.json_normalize(registros).to_parquet(...)`. A segunda passagem grava
+    cada lote convertido para esse schema.
+
+    Args:
+        records: Função que devolve um novo iterador de registros a cada chamada
+        output_path: Caminho do parquet de saída
+        batch_size: Quantidade de registros por lote/row group
+        **parquet_options: Opções repassadas ao pyarrow.parquet.ParquetWriter
+
+    Returns:
+        Quantidade de linhas gravadas
+    """
+    # Quantidade de registros em que cada coluna aparece, na ordem do json_normalize
+    colunas: Dict[str, int] = {}
+    schemas: List[pa.Schema] = []
+    n_registros = 0
+    for lote in _batches(records(), batch_size):
+        for registro in lote:
+            for coluna in _flat_columns(registro):
+                colunas[coluna] = colunas.get(coluna, 0) + 1
+        n_registros += len(lote)
+        df = pd.json_normalize(lote)
+        schemas.append(pa.schema([(nome, _column_type(df[nome])) for nome in df.columns]))
+    tipos = pa.unify_schemas(schemas, promote_options='permissive') if schemas else pa.schema([])
+    campos = []
+    for nome, presentes in colunas.items():
+        campo = tipos.field(nome)
+        # Sem valores em nenhum registro: o pandas só mantém a coluna como nula (None)
+        # se ela estiver em todos os registros; com chaves ausentes ela vira NaN (double)
+        if pa.types.is_null(campo.type) and presentes < n_registros:
+            campo = campo.with_type(pa.float64())
+        campos.append(campo)
+    schema = pa.schema(campos)
+
+    total = 0
+    with pq.ParquetWriter(output_path, schema, **parquet_options) as writer:
+        for lote in _batches(records(), batch_size):
+            df = pd.json_normalize(lote).reindex(columns=schema.names)
+            arrays = [_column_array(df[campo.name], campo.type) for campo in schema]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            total += len(lote)
+
+    return total
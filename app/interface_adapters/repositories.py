@@ -1,16 +1,96 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import os
+import sys
+from typing import List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.data_store import DataStore
+from interface_adapters.silver_schema import apply_silver_schema, id_columns, to_id
 
 
 class Repositories:
-    def __init__(self, data_path="app/data/silver"):
+    """
+    Acesso às tabelas da camada silver.
+
+    Todos os métodos de leitura aceitam `columns` (projeção) e `filters`
+    (lista de tuplas `(coluna, operador, valor)` no formato do pyarrow).
+
+    Com `in_memory=True` (padrão) as leituras passam pelo DataStore do processo:
+    cada arquivo é decodificado uma única vez e as consultas por código usam
+    índices hash em memória. Com `in_memory=False` a projeção e os filtros são
+    enviados ao leitor parquet, que descarta row groups pelas estatísticas e
+    pelo dicionário das colunas, lendo apenas o necessário do disco.
+
+    Em ambos os modos as tabelas chegam com o schema declarado da silver (ids
+    int64, datas como timestamp e campos de baixa cardinalidade como category),
+    inclusive arquivos gravados antes dele. Os códigos dos filtros podem ser
+    informados como texto ou inteiro.
+    """
+
+    INDEXES = {
+        'vagas': ['codigo'],
+        'prospects': ['vaga_codigo', 'codigo'],
+        'applicants': ['codigo'],
+    }
+
+    def __init__(self, data_path="app/data/silver", in_memory=True):
         self.data_path = data_path
+        self.in_memory = in_memory
+        self.store = DataStore.instance()
+
+    def _read(self, name: str, columns: Optional[List[str]] = None,
+              filters: Optional[List[tuple]] = None) -> pd.DataFrame:
+        path = f"{self.data_path}/{name}.parquet"
+        if self.in_memory:
+            tabela = self.store.get_table(
+                path, self.INDEXES[name], loader=lambda caminho: apply_silver_schema(pd.read_parquet(caminho), name)
+            )
+            return tabela.select(columns, filters)
+        schema = pq.read_schema(path)
+        if columns is not None:
+            # Assim como no modo em memória, colunas ausentes são ignoradas
+            columns = [col for col in columns if col in schema.names]
+        filters = self._filtros_de_codigo(name, schema, filters)
+        return apply_silver_schema(pd.read_parquet(path, columns=columns, filters=filters or None), name)
+
+    @staticmethod
+    def _filtros_de_codigo(name: str, schema: pa.Schema, filters: Optional[List[tuple]]) -> Optional[List[tuple]]:
+        """Converte os valores dos filtros por código para inteiro quando a coluna é int64 no arquivo."""
+        if not filters:
+            return filters
+        inteiras = {col for col in id_columns(name)
+                    if col in schema.names and pa.types.is_integer(schema.field(col).type)}
+        convertidos = []
+        for coluna, operador, valor in filters:
+            if coluna in inteiras:
+                valor = [to_id(v) for v in valor] if operador in ('in', 'not in') else to_id(valor)
+            convertidos.append((coluna, operador, valor))
+        return convertidos
+
+    def load_vagas(self, columns=None, filters=None):
+        return self._read('vagas', columns, filters)
+
+    def load_prospects(self, columns=None, filters=None):
+        return self._read('prospects', columns, filters)
+
+    def load_applicants(self, columns=None, filters=None):
+        return self._read('applicants', columns, filters)
+
+    def get_vaga(self, vaga_codigo, columns=None) -> pd.DataFrame:
+        """Retorna a(s) linha(s) da vaga com o código informado."""
+        return self.load_vagas(columns, [('codigo', '==', vaga_codigo)])
+
+    def get_applicant(self, applicant_codigo, columns=None) -> pd.DataFrame:
+        """Retorna a(s) linha(s) do aplicante com o código informado."""
+        return self.load_applicants(columns, [('codigo', '==', applicant_codigo)])
 
-    def load_vagas(self):
-        return pd.read_parquet(f"{self.data_path}/vagas.parquet",)
- 
-    def load_prospects(self):
-        return pd.read_parquet(f"{self.data_path}/prospects.parquet")
+    def get_prospects_by_vaga(self, vaga_codigo, columns=None) -> pd.DataFrame:
+        """Retorna os prospects que aplicaram para a vaga informada."""
+        return self.load_prospects(columns, [('vaga_codigo', '==', vaga_codigo)])
 
-    def load_applicants(self):
-        return pd.read_parquet(f"{self.data_path}/applicants.parquet")
-    
+    def get_prospects_by_applicant(self, applicant_codigo, columns=None) -> pd.DataFrame:
+        """Retorna as candidaturas do aplicante informado."""
+        return self.load_prospects(columns, [('codigo', '==', applicant_codigo)])
@@ -0,0 +1,165 @@
+import os
+import sys
+from typing import Dict, List
+
+import pandas as pd
+
+# Formato das datas nos JSONs exportados. Valores fora do formato
+# (ex.: "00-00-0000" ou vazio) viram NaT.
+FORMATO_DATA = '%d-%m-%Y'
+FORMATO_DATA_HORA = '%d-%m-%Y %H:%M:%S'
+
+# Schema declarado das tabelas da camada silver:
+#   - ids: códigos de vaga/aplicante, gravados como int64
+#   - datas: coluna -> formato de leitura, gravadas como timestamp
+#   - categorias: campos de enumeração (níveis, estado, modalidade, situação...),
+#     gravados como category (dicionário no parquet, códigos inteiros em memória)
+# As colunas não listadas (textos livres, nomes, títulos, telefones, valores e
+# listas de áreas) continuam como texto.
+SILVER_SCHEMA: Dict[str, Dict[str, object]] = {
+    'vagas': {
+        'ids': ['codigo'],
+        'datas': {
+            'informacoes_basicas.data_requicisao': FORMATO_DATA,
+            'informacoes_basicas.limite_esperado_para_contratacao': FORMATO_DATA,
+            'informacoes_basicas.data_inicial': FORMATO_DATA,
+            'informacoes_basicas.data_final': FORMATO_DATA,
+        },
+        'categorias': [
+            'informacoes_basicas.vaga_sap',
+            'informacoes_basicas.empresa_divisao',
+            'informacoes_basicas.tipo_contratacao',
+            'informacoes_basicas.prazo_contratacao',
+            'informacoes_basicas.objetivo_vaga',
+            'informacoes_basicas.prioridade_vaga',
+            'informacoes_basicas.origem_vaga',
+            'perfil_vaga.pais',
+            'perfil_vaga.estado',
+            'perfil_vaga.regiao',
+            'perfil_vaga.local_trabalho',
+            'perfil_vaga.vaga_especifica_para_pcd',
+            'perfil_vaga.faixa_etaria',
+            'perfil_vaga.nivel profissional',
+            'perfil_vaga.nivel_academico',
+            'perfil_vaga.nivel_ingles',
+            'perfil_vaga.nivel_espanhol',
+            'perfil_vaga.viagens_requeridas',
+            'perfil_vaga.equipamentos_necessarios',
+        ],
+    },
+    'prospects': {
+        'ids': ['vaga_codigo', 'codigo'],
+        'datas': {
+            'data_candidatura': FORMATO_DATA,
+            'ultima_atualizacao': FORMATO_DATA,
+        },
+        'categorias': [
+            'modalidade',
+            'situacao_candidado',
+        ],
+    },
+    'applicants': {
+        'ids': ['codigo'],
+        'datas': {
+            'infos_basicas.data_criacao': FORMATO_DATA_HORA,
+            'infos_basicas.data_atualizacao': FORMATO_DATA_HORA,
+            'informacoes_pessoais.data_nascimento': FORMATO_DATA,
+        },
+        'categorias': [
+            'infos_basicas.sabendo_de_nos',
+            'informacoes_pessoais.sexo',
+            'informacoes_pessoais.estado_civil',
+            'informacoes_pessoais.pcd',
+            'informacoes_profissionais.nivel_profissional',
+            'formacao_e_idiomas.nivel_academico',
+            'formacao_e_idiomas.nivel_ingles',
+            'formacao_e_idiomas.nivel_espanhol',
+        ],
+    },
+}
+
+
+def id_columns(table: str) -> List[str]:
+    """Colunas de código (int64) da tabela silver."""
+    return list(SILVER_SCHEMA.get(table, {}).get('ids', []))
+
+
+def to_id(valor) -> int:
+    """Converte um código (int, float ou texto, ex.: "4,530") para o inteiro gravado na silver."""
+    if isinstance(valor, str):
+        valor = valor.replace(",", "").strip()
+    return int(float(valor)) if isinstance(valor, float) else int(valor)
+
+
+def _ids(serie: pd.Series, coluna: str) -> pd.Series:
+    if pd.api.types.is_integer_dtype(serie.dtype):
+        return serie.astype('int64')
+    texto = serie.astype(str).str.replace(",", "", regex=False).str.strip()
+    try:
+        return pd.to_numeric(texto, errors='raise').astype('int64')
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Coluna de código '{coluna}' com valores não inteiros: {e}") from e
+
+
+def _datas(serie: pd.Series, formato: str) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return serie
+    return pd.to_datetime(serie, format=formato, errors='coerce')
+
+
+def _texto(serie: pd.Series) -> pd.Series:
+    """Categoria fora do schema (ex.: parquet gravado por uma versão anterior) de volta a texto."""
+    return serie.astype(serie.cat.categories.dtype)
+
+
+def apply_silver_schema(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """
+    Converte as colunas de uma tabela silver para os tipos declarados em
+    `SILVER_SCHEMA`. É idempotente: colunas já convertidas (ex.: lidas de um
+    parquet gravado com o schema) são mantidas, e colunas ausentes são ignoradas.
+    Colunas category que não estão no schema voltam a ser texto.
+
+    Args:
+        df: DataFrame da tabela
+        table: Nome da tabela ('vagas', 'prospects' ou 'applicants')
+
+    Returns:
+        Novo DataFrame com ids int64, datas como timestamp e categorias como category
+    """
+    schema = SILVER_SCHEMA.get(table)
+    if schema is None:
+        return df
+    convertidas = {}
+    for coluna in schema['ids']:
+        if coluna in df.columns:
+            convertidas[coluna] = _ids(df[coluna], coluna)
+    for coluna, formato in schema['datas'].items():
+        if coluna in df.columns:
+            convertidas[coluna] = _datas(df[coluna], formato)
+    for coluna in schema['categorias']:
+        if coluna in df.columns and not isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            convertidas[coluna] = df[coluna].astype('category')
+    for coluna in df.columns:
+        if isinstance(df[coluna].dtype, pd.CategoricalDtype) and coluna not in schema['categorias']:
+            convertidas[coluna] = _texto(df[coluna])
+    if not convertidas:
+        return df
+    return df.assign(**convertidas)
+
+
+if __name__ == "__main__":
+    # Memória ocupada pelas tabelas silver com todas as colunas como texto
+    # (object, como eram lidas antes do schema) e com o schema declarado
+    silver_path = sys.argv[1] if len(sys.argv) > 1 else 'app/data/silver'
+    for tabela in SILVER_SCHEMA:
+        caminho = os.path.join(silver_path, f'{tabela}.parquet')
+        if not os.path.exists(caminho):
+            continue
+        df = pd.read_parquet(caminho)
+        texto = df.astype({col: object for col in df.columns
+                           if not pd.api.types.is_object_dtype(df[col].dtype)})
+        tipado = apply_silver_schema(df, tabela)
+        antes = texto.memory_usage(deep=True).sum() / 1e6
+        depois = tipado.memory_usage(deep=True).sum() / 1e6
+        print(f"{tabela}: {len(df)} linhas, {antes:.1f} MB como texto -> {depois:.1f} MB com schema "
+              f"({antes / depois:.1f}x)")
@@ -0,0 +1,173 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Codec padrão dos arquivos parquet do projeto. O zstd gera arquivos do tamanho
+# dos do gzip, mas grava e descomprime bem mais rápido — o que importa para o
+# caminho de leitura do app, em que cada arquivo é lido muitas vezes e gravado
+# poucas. Compare os codecs com `python app/interface_adapters/storage.py`.
+DEFAULT_COMPRESSION = 'zstd'
+
+# Codecs comparados pelo benchmark: (codec, nível de compressão)
+BENCHMARK_CODECS: List[Tuple[str, Optional[int]]] = [
+    ('gzip', None),
+    ('snappy', None),
+    ('lz4', None),
+    ('zstd', 1),
+    ('zstd', None),
+    ('zstd', 9),
+    ('none', None),
+]
+
+
+class StorageOptions:
+    """
+    Opções de gravação parquet (codec, row groups, dicionário e estatísticas)
+    compartilhadas pelos escritores do projeto.
+
+    Cada camada mantém o seu conjunto de opções (ex.: `SILVER_STORAGE` em
+    use_cases/pipeline) e os jobs que gravam arquivos aceitam um
+    `StorageOptions` para substituí-lo.
+    """
+
+    def __init__(self, compression: str = DEFAULT_COMPRESSION, compression_level: Optional[int] = None,
+                 row_group_size: Optional[int] = None,
+                 use_dictionary: Union[bool, Sequence[str]] = True,
+                 write_statistics: Union[bool, Sequence[str]] = True):
+        """
+        Args:
+            compression: Codec ('zstd', 'lz4', 'snappy', 'gzip', 'brotli' ou 'none')
+            compression_level: Nível do codec (None usa o padrão do codec)
+            row_group_size: Linhas por row group (None usa o padrão do pyarrow)
+            use_dictionary: Codificação por dicionário em todas as colunas (True),
+                em nenhuma (False) ou apenas nas colunas listadas
+            write_statistics: Estatísticas (min/max) em todas as colunas, em
+                nenhuma ou apenas nas listadas — são elas que permitem descartar
+                row groups na leitura com filtros
+        """
+        self.compression = compression
+        self.compression_level = compression_level
+        self.row_group_size = row_group_size
+        self.use_dictionary = use_dictionary
+        self.write_statistics = write_statistics
+
+    def replace(self, **alteracoes) -> "StorageOptions":
+        """Cópia com as opções informadas alteradas."""
+        opcoes = dict(vars(self))
+        opcoes.update(alteracoes)
+        return StorageOptions(**opcoes)
+
+    def writer_options(self) -> dict:
+        """Opções aceitas por `pyarrow.parquet.ParquetWriter` (o tamanho do row group é do chamador)."""
+        opcoes = {
+            'compression': self.compression,
+            'use_dictionary': _lista_ou_bool(self.use_dictionary),
+            'write_statistics': _lista_ou_bool(self.write_statistics),
+        }
+        if self.compression_level is not None:
+            opcoes['compression_level'] = self.compression_level
+        return opcoes
+
+    def to_parquet_options(self) -> dict:
+        """Opções para `DataFrame.to_parquet` (motor pyarrow)."""
+        opcoes = self.writer_options()
+        if self.row_group_size is not None:
+            opcoes['row_group_size'] = self.row_group_size
+        return opcoes
+
+    def write(self, df: pd.DataFrame, path: str, atomic: bool = False):
+        """
+        Grava o DataFrame (sem o índice) com estas opções.
+
+        Args:
+            df: DataFrame a gravar
+            path: Caminho do arquivo
+            atomic: Se True, grava em um arquivo temporário e o renomeia, de modo
+                que leitores concorrentes nunca vejam um arquivo parcial
+        """
+        if not atomic:
+            df.to_parquet(path, index=False, **self.to_parquet_options())
+            return
+        temporario = f"{path}.tmp-{os.getpid()}"
+        df.to_parquet(temporario, index=False, **self.to_parquet_options())
+        os.replace(temporario, path)
+
+    def __repr__(self) -> str:
+        nivel = f":{self.compression_level}" if self.compression_level is not None else ""
+        return (f"StorageOptions({self.compression}{nivel}, row_group_size={self.row_group_size}, "
+                f"use_dictionary={self.use_dictionary}, write_statistics={self.write_statistics})")
+
+
+def _lista_ou_bool(valor):
+    return valor if isinstance(valor, bool) else list(valor)
+
+
+# Opções padrão (caches, estados e demais arquivos sem opções próprias)
+DEFAULT_STORAGE = StorageOptions()
+
+
+def _melhor_tempo(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def benchmark_codecs(paths: List[str], codecs: List[Tuple[str, Optional[int]]] = BENCHMARK_CODECS,
+                     repeticoes: int = 3) -> pd.DataFrame:
+    """
+    Regrava cada arquivo com cada codec (em um diretório temporário, sem tocar
+    nos originais) e mede gravação, tamanho e leitura completa — só a
+    decodificação do parquet (tabela Arrow) e até o DataFrame pandas.
+
+    Os row groups e o restante das opções de cada arquivo são mantidos; só o
+    codec muda.
+
+    Returns:
+        DataFrame com arquivo, codec, tamanho (MB) e tempos de gravação e de leitura (ms)
+    """
+    linhas = []
+    diretorio = tempfile.mkdtemp(prefix='storage_benchmark_')
+    try:
+        for path in paths:
+            df = pd.read_parquet(path)
+            metadados = pq.ParquetFile(path).metadata
+            row_group_size = max(metadados.row_group(i).num_rows for i in range(metadados.num_row_groups)) \
+                if metadados.num_row_groups else None
+            nome = os.path.basename(path)
+            for codec, nivel in codecs:
+                opcoes = StorageOptions(codec, nivel, row_group_size=row_group_size)
+                destino = os.path.join(diretorio, f"{codec}_{nivel}_{nome}")
+                escrita = _melhor_tempo(lambda: opcoes.write(df, destino), repeticoes)
+                decodificacao = _melhor_tempo(lambda: pq.read_table(destino), repeticoes)
+                leitura = _melhor_tempo(lambda: pd.read_parquet(destino), repeticoes)
+                linhas.append({
+                    'arquivo': nome,
+                    'codec': codec if nivel is None else f"{codec}:{nivel}",
+                    'tamanho_mb': round(os.path.getsize(destino) / 1e6, 2),
+                    'gravacao_ms': round(escrita * 1000, 1),
+                    'leitura_arrow_ms': round(decodificacao * 1000, 1),
+                    'leitura_pandas_ms': round(leitura * 1000, 1),
+                })
+    finally:
+        shutil.rmtree(diretorio, ignore_errors=True)
+    return pd.DataFrame(linhas)
+
+
+if __name__ == "__main__":
+    # Benchmark de codecs nas tabelas reais (padrão: silver e features)
+    arquivos = sys.argv[1:] or [
+        os.path.join('app/data/silver', nome)
+        for nome in ('vagas.parquet', 'prospects.parquet', 'applicants.parquet', 'df_features.parquet')
+    ]
+    arquivos = [caminho for caminho in arquivos if os.path.exists(caminho)]
+    with pd.option_context('display.width', 120):
+        print(benchmark_codecs(arquivos).to_string(index=False))
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import sys
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.storage import DEFAULT_STORAGE, StorageOptions
+
+# Versão da tokenização. Deve ser incrementada sempre que a limpeza de texto
+# ou a lista de stopwords mudar, invalidando os tokens já persistidos.
+# "2": stopwords embutidas em use_cases/text_normalization (antes vinham dos
+# dados do NLTK instalados na máquina, que variam entre versões).
+TOKENIZER_VERSION = "2"
+
+
+def content_hash(text: Optional[str], version: str = TOKENIZER_VERSION) -> str:
+    """Hash do conteúdo de um texto, combinado com a versão da tokenização."""
+    texto = text if isinstance(text, str) else ""
+    return hashlib.blake2b(f"{version}\x00{texto}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TokenCache:
+    """
+    Cache persistente dos conjuntos de palavras limpas (sem stopwords) dos CVs.
+
+    As entradas são indexadas pelo `codigo` do aplicante e pelo hash do conteúdo
+    do CV: um CV só é tokenizado novamente quando o texto muda. O cache é salvo
+    em parquet e compartilhado entre execuções e processos.
+    """
+
+    _shared: Dict[Tuple[str, str], "TokenCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, tokenize: Callable[[Optional[str]], Iterable[str]],
+                 path: str = "app/data/cache/cv_tokens.parquet", version: str = TOKENIZER_VERSION,
+                 storage: StorageOptions = DEFAULT_STORAGE):
+        """
+        Args:
+            tokenize: Função que devolve as palavras limpas de um texto
+            path: Caminho do arquivo parquet do cache
+            version: Versão da tokenização (entra no hash do conteúdo)
+            storage: Opções de gravação do parquet
+        """
+        self.tokenize = tokenize
+        self.path = path
+        self.version = version
+        self.storage = storage
+        self._entries: Optional[Dict[str, Tuple[str, frozenset]]] = None
+        self._loaded_mtime: Optional[float] = None
+        self._dirty = False
+        # Entradas tokenizadas desde o último `pop_new_entries` (só registradas
+        # depois de `track_new_entries`, ex.: nos workers do pool)
+        self._novas: Optional[Dict[str, Tuple[str, frozenset]]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, tokenize: Callable[[Optional[str]], Iterable[str]],
+               path: str = "app/data/cache/cv_tokens.parquet", version: str = TOKENIZER_VERSION) -> "TokenCache":
+        """Retorna a instância do processo para o arquivo e versão informados."""
+        chave = (os.path.abspath(path), version)
+        with cls._shared_lock:
+            if chave not in cls._shared:
+                cls._shared[chave] = cls(tokenize, path, version)
+            return cls._shared[chave]
+
+    def _read_file(self) -> Dict[str, Tuple[str, frozenset]]:
+        df = pd.read_parquet(self.path)
+        return {
+            codigo: (hash_cv, frozenset(tokens))
+            for codigo, hash_cv, tokens in zip(df["codigo"], df["hash"], df["tokens"])
+        }
+
+    def _load(self) -> Dict[str, Tuple[str, frozenset]]:
+        if self._entries is None:
+            self._entries = {}
+            if os.path.exists(self.path):
+                self._loaded_mtime = os.path.getmtime(self.path)
+                self._entries = self._read_file()
+        return self._entries
+
+    def get(self, codigo, text: Optional[str]) -> frozenset:
+        """Retorna o conjunto de palavras do CV, tokenizando apenas se necessário."""
+        return self.get_many([codigo], [text])[0]
+
+    def get_many(self, codigos: Iterable, texts: Iterable[Optional[str]]) -> List[frozenset]:
+        """
+        Retorna o conjunto de palavras de cada CV (um por posição de entrada).
+
+        Args:
+            codigos: Códigos dos aplicantes
+            texts: Textos dos CVs (mesma ordem dos códigos)
+
+        Returns:
+            Lista de conjuntos de palavras, alinhada com a entrada
+        """
+        with self._lock:
+            entries = self._load()
+            resultado = []
+            # Linhas repetidas (mesmo aplicante em várias vagas) são resolvidas uma única vez
+            vistos: Dict[Tuple[str, str], frozenset] = {}
+            for codigo, texto in zip(codigos, texts):
+                chave_codigo = str(codigo)
+                hash_cv = content_hash(texto, self.version)
+                chave = (chave_codigo, hash_cv)
+                if chave in vistos:
+                    resultado.append(vistos[chave])
+                    continue
+
+                entrada = entries.get(chave_codigo)
+                if entrada is not None and entrada[0] == hash_cv:
+                    tokens = entrada[1]
+                else:
+                    tokens = frozenset(self.tokenize(texto))
+                    entries[chave_codigo] = (hash_cv, tokens)
+                    if self._novas is not None:
+                        self._novas[chave_codigo] = entries[chave_codigo]
+                    self._dirty = True
+
+                vistos[chave] = tokens
+                resultado.append(tokens)
+            return resultado
+
+    def track_new_entries(self):
+        """Passa a registrar as entradas tokenizadas, para `pop_new_entries` (ex.: em um worker)."""
+        with self._lock:
+            if self._novas is None:
+                self._novas = {}
+
+    def pop_new_entries(self) -> Dict[str, Tuple[str, frozenset]]:
+        """Retorna e esquece as entradas tokenizadas desde a última chamada (vazio sem `track_new_entries`)."""
+        with self._lock:
+            if self._novas is None:
+                return {}
+            novas, self._novas = self._novas, {}
+            return novas
+
+    def add_entries(self, entries: Dict[str, Tuple[str, frozenset]]):
+        """Incorpora entradas tokenizadas por outro processo (ver `pop_new_entries`)."""
+        if not entries:
+            return
+        with self._lock:
+            self._load().update(entries)
+            self._dirty = True
+
+    def save(self):
+        """Persiste o cache no disco (escrita atômica) se houve alterações."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+            # Outro processo pode ter salvo o cache desde a nossa leitura:
+            # mantém as entradas dele que ainda não conhecemos
+            if os.path.exists(self.path) and os.path.getmtime(self.path) != self._loaded_mtime:
+                for codigo, entrada in self._read_file().items():
+                    self._entries.setdefault(codigo, entrada)
+
+            df = pd.DataFrame({
+                "codigo": list(self._entries.keys()),
+                "hash": [hash_cv for hash_cv, _ in self._entries.values()],
+                "tokens": [sorted(tokens) for _, tokens in self._entries.values()],
+            })
+            self.storage.write(df, self.path, atomic=True)
+            self._loaded_mtime = os.path.getmtime(self.path)
+            self._dirty = False
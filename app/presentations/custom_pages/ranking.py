@@ -9,9 +9,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from use_cases.load_vagas_list import LoadVagasListUseCase
 from use_cases.get_prospects import GetProspectsUseCase
 from use_cases.load_applicants_list import LoadApplicantsListUseCase
-from use_cases.match_predictor import MatchPredictor
+from use_cases.model_registry import ModelRegistry
 #from use_cases.featureengineering import CandidateFeatureEngineer
 from use_cases.get_features import GetFeaturesCase    
+from use_cases.ranking_table import RankingTable
 
 
 def exibir():
@@ -21,8 +22,15 @@ def exibir():
 
     #st.markdown(""" Introdução: """)
 
-    predictor = MatchPredictor()
-    predictor.load_model()
+    # Modelo compartilhado entre sessões e reruns (recarregado só quando os artefatos mudam)
+    registry = ModelRegistry.instance()
+    predictor = registry.get_predictor()
+    scoring = registry.get_scoring_service()
+
+    # Rankings pré-calculados (camada gold) são usados quando estão atualizados
+    # para o modelo e as features atuais; caso contrário pontua na hora
+    ranking_table = RankingTable()
+    usar_ranking_pronto = ranking_table.is_fresh(predictor.model_version)
 
     listvagasuse = LoadVagasListUseCase()
     lista_vagas = listvagasuse.load_vagas_list()
@@ -52,7 +60,9 @@ def exibir():
     prospects_df_vaga = prospects.get_prospects_vaga(vaga_selecionada_codigo)
 
     features_case = GetFeaturesCase()
-    features_df_vaga = features_case.get_features_vaga(vaga_selecionada_codigo)
+    # Snapshot memory-mapped das features (None se não existir ou estiver desatualizado):
+    # as linhas são pontuadas direto da matriz mapeada, sem montar DataFrames de features
+    snapshot = features_case.snapshot()
 
     def classificar_aderencia(prob):
         if prob >= 0.8:
@@ -62,7 +72,15 @@ def exibir():
         else:
             return 'Baixa'
 
-    probabilidade = predictor.create_ranking(features_df_vaga)
+    if usar_ranking_pronto:
+        probabilidade = ranking_table.get_vaga(vaga_selecionada_codigo)[['codigo', 'id_vaga', 'probabilidade_match']]
+    elif snapshot is not None:
+        linhas_vaga = snapshot.vaga_rows(vaga_selecionada_codigo)
+        probabilidade = snapshot.keys(linhas_vaga).assign(
+            probabilidade_match=scoring.predict_snapshot(snapshot, linhas_vaga))
+    else:
+        features_df_vaga = features_case.get_features_vaga(vaga_selecionada_codigo)
+        probabilidade = scoring.create_ranking(features_df_vaga)
     prospects_df_vaga = prospects_df_vaga.merge(probabilidade, on='codigo', how='left')
     prospects_df_vaga = prospects_df_vaga.sort_values(by='probabilidade_match', ascending=False)
 
@@ -75,6 +93,7 @@ def exibir():
     prospects_df_vaga = prospects_df_vaga[colunas_para_exibir]
 
     prospects_df_vaga['probabilidade_match'] = prospects_df_vaga['probabilidade_match'].round(2)
+    prospects_df_vaga['data_candidatura'] = prospects_df_vaga['data_candidatura'].dt.strftime('%d-%m-%Y')
     prospects_df_vaga['Nível de Aderência'] = prospects_df_vaga['probabilidade_match'].apply(classificar_aderencia)
     prospects_df_vaga = prospects_df_vaga.rename(columns={
         'nome': 'Nome',
@@ -128,9 +147,14 @@ def exibir():
         st.markdown(f"Vagas aplicadas pelo(a): **{nome_selecionado}**")
         prospects_df_applicants = prospects.get_prospects_applicants(candidato_selecionado)
 
-        features_df_applicants = features_case.get_features_applicants(candidato_selecionado)
-
-        probabilidade_applicants = predictor.create_ranking(features_df_applicants)
+        if usar_ranking_pronto:
+            probabilidade_applicants = ranking_table.get_applicant(candidato_selecionado)[['codigo', 'id_vaga', 'probabilidade_match']]
+        elif snapshot is not None:
+            linhas_applicant = snapshot.applicant_rows(candidato_selecionado)
+            probabilidade_applicants = snapshot.keys(linhas_applicant).assign(
+                probabilidade_match=scoring.predict_snapshot(snapshot, linhas_applicant))
+        else:
+            probabilidade_applicants = scoring.create_ranking(features_case.get_features_applicants(candidato_selecionado))
 
         prospects_df_applicants = prospects_df_applicants.merge(probabilidade_applicants, left_on='vaga_codigo', right_on='id_vaga', how='left')
 
@@ -144,6 +168,7 @@ def exibir():
         prospects_df_applicants = prospects_df_applicants[colunas_para_exibir]
 
         prospects_df_applicants['probabilidade_match'] = prospects_df_applicants['probabilidade_match'].round(2)
+        prospects_df_applicants['data_candidatura'] = prospects_df_applicants['data_candidatura'].dt.strftime('%d-%m-%Y')
         prospects_df_applicants['Nível de Aderência'] = prospects_df_applicants['probabilidade_match'].apply(classificar_aderencia)
 
         prospects_df_applicants = prospects_df_applicants.rename(columns={
@@ -186,18 +211,22 @@ def exibir():
 
         if selected_v is not None and not pd.DataFrame(selected_v).empty:
             vaga_selecionada = selected_v['Vaga'].values[0]
-            st.markdown(f"\n🧠 Tabela descritiva SHAP para o(a) **{nome_selecionado}** na vaga **{vaga_selecionada}** com as variaveis que mais impactaram o modelo.")
+            st.markdown(f"\n🧠 Tabela descritiva (atribuições DeepLIFT) para o(a) **{nome_selecionado}** na vaga **{vaga_selecionada}** com as variaveis que mais impactaram o modelo.")
             
             id_vaga_selecionada = selected_v['id_vaga'].values[0]
 
+            features_df_applicants = features_case.get_features_applicants(candidato_selecionado)
             feature_selecionada = features_df_applicants[features_df_applicants['id_vaga'] == id_vaga_selecionada]
            
             #st.write(feature_selecionada)
 
 
-            # # --- Etapa 3: Gerar e Exibir Explicações SHAP ---
+            # # --- Etapa 3: Gerar e Exibir Explicações (DeepLIFT) ---
             try:
-                df_shap_explanations = predictor.explain_batch_with_shap(feature_selecionada, top_n=3)
+                # Backend NumPy (DeepLIFT sobre a amostra de background do SHAP): sem TensorFlow/SHAP
+                # na requisição, por isso os textos da página falam em DeepLIFT e não em valores SHAP.
+                # Os pares do top-K pré-calculados pelo RankingTableJob (--explain) vêm do cache
+                df_shap_explanations = predictor.explain_batch_numpy(feature_selecionada, top_n=3)
 
                 top_3_asc = df_shap_explanations[:3]
               
@@ -231,7 +260,7 @@ def exibir():
 
 
             except Exception as e:
-                st.write(f"❌ Ocorreu um erro ao gerar as explicações SHAP: {e}")
+                st.write(f"❌ Ocorreu um erro ao gerar as explicações (DeepLIFT): {e}")
 
         else:
             st.info("Selecione uma vaga.", icon="ℹ️")
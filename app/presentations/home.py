@@ -1,3 +1,9 @@
+import time
+
+INICIO_EXECUCAO = time.perf_counter()
+
+import importlib
+import logging
 import streamlit as st
 import sys
 import os
@@ -5,7 +11,32 @@ from streamlit_option_menu import option_menu
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from presentations.custom_pages import ranking, modelo, glossario
+# As páginas são importadas só quando abertas: o ranking depende do modelo
+# (TensorFlow/SHAP) e a Introdução e o Glossário não devem esperar por isso
+PAGINAS = {
+    "Ranking de Candidatos": "presentations.custom_pages.ranking",
+    "Guia Aderis X": "presentations.custom_pages.modelo",
+    "Glossário Aderis": "presentations.custom_pages.glossario",
+}
+
+
+def carregar_pagina(escolha):
+    """Importa o módulo da página (uma vez por processo) e devolve o tempo gasto na importação."""
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(PAGINAS[escolha])
+    return modulo, time.perf_counter() - inicio
+
+
+# Tempos de inicialização em nível DEBUG: silenciosos por padrão, já que o
+# Streamlit reexecuta o script a cada interação
+logger = logging.getLogger("aderis.startup")
+
+
+def relatorio_inicializacao(escolha, tempo_importacao):
+    """Registra no log (DEBUG) o tempo de cada execução do script (importação da página e total)."""
+    total = time.perf_counter() - INICIO_EXECUCAO
+    logger.debug("Página '%s': importação %.0f ms, execução total %.0f ms",
+                 escolha, tempo_importacao * 1000, total * 1000)
 
 st.set_page_config(
     page_title="Aderis X",
@@ -39,12 +70,10 @@ with st.sidebar:
         default_index=0
     )
 
-if escolha == "Ranking de Candidatos":
-    ranking.exibir()
-elif escolha == "Guia Aderis X":
-    modelo.exibir()
-elif escolha == "Glossário Aderis":
-    glossario.exibir()
+tempo_importacao = 0.0
+if escolha in PAGINAS:
+    pagina, tempo_importacao = carregar_pagina(escolha)
+    pagina.exibir()
 elif escolha == "Introdução":
     st.title("Aderis X – Datathon")
 
@@ -118,4 +147,6 @@ st.markdown(
     </div>
     """,
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+relatorio_inicializacao(escolha, tempo_importacao)
@@ -0,0 +1,126 @@
+import pandas as pd
+import os
+import sys
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.data_store import DataStore, file_hash, normalize_key
+from interface_adapters.inverted_index import InvertedIndex
+from interface_adapters.repositories import Repositories
+from interface_adapters.token_cache import TOKENIZER_VERSION
+from use_cases.featureengineering import CandidateFeatureEngineer
+
+# Prefixo dos termos de área de atuação (separados dos tokens de texto no mesmo índice)
+PREFIXO_AREA = 'area::'
+# Peso de uma área de atuação em comum relativo a uma palavra em comum
+AREA_WEIGHT = 5.0
+# Diretório dos índices invertidos persistidos (derivados da camada silver)
+INDEX_PATH = 'app/data/index'
+
+
+class CandidateGenerator:
+    """
+    Geração de candidatos para recomendação: reduz todos os pares possíveis
+    (aplicante x vaga) a uma lista curta antes da pontuação pelo modelo.
+
+    Mantém dois índices invertidos persistidos em `index_path` — de aplicantes
+    (palavras do CV e áreas de atuação) e de vagas (palavras da descrição e
+    áreas). Cada índice guarda o hash do parquet de origem e é reconstruído
+    quando o arquivo muda. A relevância de um par é a pontuação BM25 dos termos
+    em comum, com peso `area_weight` para as áreas de atuação.
+    """
+
+    def __init__(self, data_path="app/data/silver", engineer: Optional[CandidateFeatureEngineer] = None,
+                 area_weight: float = AREA_WEIGHT, index_path: str = INDEX_PATH):
+        self.data_path = data_path
+        self.index_path = index_path
+        self.repositories = Repositories(data_path)
+        self.store = DataStore.instance()
+        self.engineer = engineer or CandidateFeatureEngineer()
+        self.area_weight = area_weight
+
+    def _areas(self, texto) -> List[str]:
+        texto = self.engineer._limpar_e_padronizar_separadores(texto)
+        return [PREFIXO_AREA + item.strip() for item in texto.split(',') if item.strip()]
+
+    def _termos(self, texto_limpo: str, areas: List[str]) -> Dict[str, int]:
+        """Frequência de cada palavra do texto limpo e de cada área de atuação."""
+        termos = Counter(texto_limpo.split())
+        termos.update(dict.fromkeys(areas, 1))
+        return termos
+
+    def _termos_applicants(self, df_applicants: pd.DataFrame) -> List[Dict[str, int]]:
+        textos = df_applicants['cv_pt'].map(self.engineer._clean_and_remove_stopwords)
+        areas = df_applicants['informacoes_profissionais.area_atuacao'].map(self._areas)
+        return [self._termos(texto, area) for texto, area in zip(textos, areas)]
+
+    def _termos_vagas(self, df_vagas: pd.DataFrame) -> List[Dict[str, int]]:
+        textos = self.engineer._get_vagas_texts(df_vagas)
+        areas = df_vagas.drop_duplicates(subset='codigo').set_index('codigo')['perfil_vaga.areas_atuacao'].map(self._areas)
+        return [self._termos(textos[codigo], areas[codigo]) for codigo in textos.index]
+
+    def _abrir_indice(self, nome: str, origem: str, carregar) -> InvertedIndex:
+        """Abre o índice persistido se ele corresponder à origem atual; senão o reconstrói."""
+        caminho = os.path.join(self.index_path, nome)
+        fonte = f"{file_hash(origem)}:{TOKENIZER_VERSION}"
+        meta = InvertedIndex.read_meta(caminho)
+        if meta is not None and meta.get('source') == fonte:
+            return InvertedIndex.open(caminho)
+        df, termos = carregar()
+        return InvertedIndex.build(caminho, df['codigo'].map(normalize_key).tolist(), termos, source=fonte)
+
+    def _indice_applicants(self) -> InvertedIndex:
+        def carregar():
+            df = self.repositories.load_applicants(
+                ['codigo', 'cv_pt', 'informacoes_profissionais.area_atuacao']
+            ).drop_duplicates(subset='codigo')
+            return df, self._termos_applicants(df)
+
+        origem = os.path.join(self.data_path, 'applicants.parquet')
+        return self.store.get(origem, lambda path: self._abrir_indice('applicants', path, carregar),
+                              name='candidate_index')
+
+    def _indice_vagas(self) -> InvertedIndex:
+        def carregar():
+            colunas = ['codigo', 'perfil_vaga.areas_atuacao'] + CandidateFeatureEngineer.COLUNAS_TEXTO_VAGA
+            df = self.repositories.load_vagas(colunas).drop_duplicates(subset='codigo')
+            return df, self._termos_vagas(df)
+
+        origem = os.path.join(self.data_path, 'vagas.parquet')
+        return self.store.get(origem, lambda path: self._abrir_indice('vagas', path, carregar),
+                              name='candidate_index')
+
+    def _pesos(self, termos: Dict[str, int]) -> Dict[str, float]:
+        return {t: (self.area_weight if t.startswith(PREFIXO_AREA) else float(tf)) for t, tf in termos.items()}
+
+    def candidates_for_vaga(self, id_vaga, limit: int = 200, excluir: Optional[set] = None) -> List[Tuple[str, float]]:
+        """
+        Aplicantes mais relevantes para uma vaga.
+
+        Returns:
+            Lista (codigo, pontuação de recuperação), da maior para a menor
+        """
+        df_vaga = self.repositories.get_vaga(
+            id_vaga, ['codigo', 'perfil_vaga.areas_atuacao'] + CandidateFeatureEngineer.COLUNAS_TEXTO_VAGA
+        )
+        if df_vaga.empty:
+            return []
+        termos = self._termos_vagas(df_vaga)[0]
+        return self._indice_applicants().query(self._pesos(termos), limit, excluir)
+
+    def vagas_for_applicant(self, codigo, limit: int = 200, excluir: Optional[set] = None) -> List[Tuple[str, float]]:
+        """
+        Vagas mais relevantes para um aplicante.
+
+        Returns:
+            Lista (codigo da vaga, pontuação de recuperação), da maior para a menor
+        """
+        df_applicant = self.repositories.get_applicant(
+            codigo, ['codigo', 'cv_pt', 'informacoes_profissionais.area_atuacao']
+        )
+        if df_applicant.empty:
+            return []
+        termos = self._termos_applicants(df_applicant.iloc[:1])[0]
+        return self._indice_vagas().query(self._pesos(termos), limit, excluir)
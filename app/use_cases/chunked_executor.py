@@ -0,0 +1,114 @@
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class ChunkedExecutor:
+    """
+    Executa etapas linha a linha em blocos, opcionalmente em um pool de processos.
+
+    O DataFrame é particionado por uma chave (ex.: `id_vaga`) de forma que todas
+    as linhas de uma mesma chave fiquem no mesmo bloco — caches por chave, como o
+    texto limpo das vagas, permanecem locais a cada worker. Os blocos são
+    balanceados pela quantidade de linhas e os resultados são remontados na
+    ordem original, independentemente da ordem de conclusão.
+    """
+
+    def __init__(self, n_workers: int = 1, chunks_per_worker: int = 4):
+        """
+        Args:
+            n_workers: Quantidade de processos (1 executa tudo no processo atual)
+            chunks_per_worker: Blocos por worker (melhora o balanceamento de carga)
+        """
+        self.n_workers = max(1, int(n_workers or 1))
+        self.chunks_per_worker = max(1, chunks_per_worker)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def parallel(self) -> bool:
+        return self.n_workers > 1
+
+    def __enter__(self) -> "ChunkedExecutor":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Encerra o pool de processos (um novo é criado na próxima execução paralela)."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def split_positions(self, df: pd.DataFrame, key: str, n_chunks: Optional[int] = None) -> List[np.ndarray]:
+        """
+        Posições (iloc) das linhas de cada bloco, particionando o DataFrame
+        sem dividir nenhuma chave.
+
+        As chaves são distribuídas da maior para a menor, sempre para o bloco
+        com menos linhas, o que gera blocos de tamanho próximo e determinísticos.
+        """
+        if df.empty:
+            return []
+        n_chunks = n_chunks or self.n_workers * self.chunks_per_worker
+
+        chaves = df[key].astype(str).to_numpy()
+        contagens = pd.Series(chaves).value_counts()
+        # Ordenação estável por (tamanho desc, chave) para resultados reprodutíveis
+        contagens = contagens.sort_index().sort_values(ascending=False, kind='stable')
+
+        blocos = [(0, i) for i in range(min(n_chunks, len(contagens)))]
+        heapq.heapify(blocos)
+        bloco_da_chave = {}
+        for chave, tamanho in contagens.items():
+            linhas, bloco = heapq.heappop(blocos)
+            bloco_da_chave[chave] = bloco
+            heapq.heappush(blocos, (linhas + int(tamanho), bloco))
+
+        ids_bloco = pd.Series(chaves).map(bloco_da_chave).to_numpy()
+        return [np.flatnonzero(ids_bloco == bloco) for bloco in range(len(blocos))]
+
+    def split(self, df: pd.DataFrame, key: str, n_chunks: Optional[int] = None) -> List[pd.DataFrame]:
+        """Particiona o DataFrame em blocos que não dividem nenhuma chave (ver `split_positions`)."""
+        return [df.iloc[posicoes] for posicoes in self.split_positions(df, key, n_chunks)]
+
+    @staticmethod
+    def reassemble(resultados: List[pd.DataFrame], posicoes: List[np.ndarray]) -> pd.DataFrame:
+        """
+        Junta os resultados dos blocos na ordem original das linhas.
+
+        A remontagem é por posição, não pelo índice: cada resultado deve ter
+        uma linha por linha do seu bloco, na mesma ordem. Funciona também com
+        índices repetidos, que uma seleção por rótulo multiplicaria.
+        """
+        ordem = np.concatenate(posicoes)
+        inversa = np.empty(len(ordem), dtype=np.int64)
+        inversa[ordem] = np.arange(len(ordem))
+        return pd.concat(resultados).iloc[inversa]
+
+    def run(self, func: Callable[..., Any], tasks: List[tuple]) -> List[Any]:
+        """
+        Executa `func(*task)` para cada tarefa e devolve os resultados na ordem das tarefas.
+
+        O pool de processos é criado na primeira execução paralela e reaproveitado
+        pelas seguintes até `close` (ou o fim do bloco `with`).
+        """
+        if not self.parallel or len(tasks) <= 1:
+            return [func(*task) for task in tasks]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.n_workers)
+        futuros = [self._pool.submit(func, *task) for task in tasks]
+        return [futuro.result() for futuro in futuros]
+
+    def map_frame(self, func: Callable[..., pd.DataFrame], df: pd.DataFrame, key: str, *args) -> pd.DataFrame:
+        """
+        Aplica `func(bloco, *args)` a cada bloco e remonta o resultado na ordem de `df`.
+        """
+        posicoes = self.split_positions(df, key)
+        if not posicoes:
+            return func(df, *args)
+        resultados = self.run(func, [(df.iloc[p],) + args for p in posicoes])
+        return self.reassemble(resultados, posicoes)
@@ -1,94 +1,61 @@
 import pandas as pd
 import os
 import sys
-from typing import Set, Optional
-import re
-import nltk
-from nltk.corpus import stopwords
+from typing import Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from interface_adapters.data_store import normalize_key
 from interface_adapters.repositories import Repositories
+from interface_adapters.token_cache import TokenCache
+from use_cases.compatibility_engine import CompatibilityEngine
+from use_cases.text_normalization import DEFAULT_NORMALIZER, STOPWORDS_PT
 
 class CompatibilityUseCase:
     """
     Use case para calcular a compatibilidade entre candidatos e vagas,
-    removendo stopwords para uma análise mais precisa usando a biblioteca NLTK.
+    removendo stopwords (lista embutida em `text_normalization`) para uma análise mais precisa.
     """
     
-    try:
-        STOPWORDS_PT = set(stopwords.words('portuguese'))
-    except LookupError:
-        print("Baixando recurso 'stopwords' do NLTK...")
-        nltk.download('stopwords')
-        STOPWORDS_PT = set(stopwords.words('portuguese'))
-    # ----------------------------------------------
+    STOPWORDS_PT = STOPWORDS_PT
 
     def __init__(self):
         """
         Inicializa o caso de uso, preparando o acesso aos repositórios de dados.
         """
         self.repositories = Repositories()
+        self.engine = CompatibilityEngine(self._clean_and_remove_stopwords)
+        self.token_cache = TokenCache.shared(self.engine.tokenize)
+        self._generator = None
 
     def _clean_and_remove_stopwords(self, text: Optional[str]) -> str:
         """
         Limpa o texto, removendo pontuações e stopwords.
         Método privado.
         """
-        if not isinstance(text, str) or not text:
-            return ""
-        
-        text_cleaned = re.sub(r'[^\w\s]', '', text)
-        
-        words = text_cleaned.lower().split()
-        
-        filtered_words = [word for word in words if word not in self.STOPWORDS_PT]
-        
-        return " ".join(filtered_words)
+        return DEFAULT_NORMALIZER.clean(text)
 
-    def _get_vaga_text(self, df_vagas: pd.DataFrame, vaga_codigo: str) -> Optional[str]:
+    def _get_vaga_text(self, vaga_codigo: str) -> Optional[str]:
         """
         Busca, concatena e limpa os textos de uma vaga específica a partir de seu código.
         Método privado.
         """
-        vaga_data = df_vagas[df_vagas['codigo'] == vaga_codigo]
-        if vaga_data.empty:
-            return None
-        
         vagas_columns = [
             'perfil_vaga.demais_observacoes', 
             'informacoes_basicas.titulo_vaga',
             'perfil_vaga.principais_atividades', 
             'perfil_vaga.competencia_tecnicas_e_comportamentais'
         ]
+
+        vaga_data = self.repositories.get_vaga(vaga_codigo, columns=vagas_columns)
+        if vaga_data.empty:
+            return None
         
         vagas_columns_existentes = [col for col in vagas_columns if col in vaga_data.columns]
         descricao_vaga = ' '.join(vaga_data.iloc[0][vagas_columns_existentes].dropna().astype(str))
         
         return self._clean_and_remove_stopwords(descricao_vaga)
 
-    def _calcular_compatibilidade(self, cv_text: str, palavras_vaga: Set[str], caracteres_totais_vaga: int) -> pd.Series:
-        """
-        Calcula a compatibilidade com base na interseção de palavras e na proporção de caracteres.
-        Método privado.
-        """
-
-        cv_limpo = self._clean_and_remove_stopwords(cv_text)
-        if not cv_limpo:
-            return pd.Series([0, 0.0], index=['palavras_em_comum', 'percentual_compatibilidade'])
-
-        palavras_cv = set(cv_limpo.split())
-        palavras_comuns = palavras_cv.intersection(palavras_vaga)
-        
-        contagem_palavras_comuns = len(palavras_comuns)
-        caracteres_palavras_comuns = sum(len(palavra) for palavra in palavras_comuns)
-        
-        percentual = 0.0
-        if caracteres_totais_vaga > 0:
-            percentual = (caracteres_palavras_comuns / caracteres_totais_vaga) * 100
-            
-        return pd.Series([contagem_palavras_comuns, round(percentual, 2)], index=['palavras_em_comum', 'percentual_compatibilidade'])
-
     def get_compatibility_for_vaga(self, vaga_codigo: str) -> pd.DataFrame:
         """
         Retorna o ranking de compatibilidade dos candidatos para uma vaga específica.
@@ -96,11 +63,9 @@ class CompatibilityUseCase:
         if not vaga_codigo:
             raise ValueError("O código da vaga (vaga_codigo) não pode ser nulo ou vazio.")
 
-        df_vagas = self.repositories.load_vagas()
-        df_prospects = self.repositories.load_prospects()
-        df_applicants = self.repositories.load_applicants()
+        df_applicants = self.repositories.load_applicants(columns=['codigo', 'cv_pt'])
         
-        descricao_vaga_completa = self._get_vaga_text(df_vagas, vaga_codigo)
+        descricao_vaga_completa = self._get_vaga_text(vaga_codigo)
         if not descricao_vaga_completa:
             print(f"Aviso: Vaga com código '{vaga_codigo}' não encontrada ou sem texto relevante.")
             return pd.DataFrame()
@@ -108,11 +73,11 @@ class CompatibilityUseCase:
         palavras_vaga_set = set(descricao_vaga_completa.split())
         caracteres_vaga_total = sum(len(p) for p in palavras_vaga_set)
 
-        df_prospects_vaga = df_prospects[df_prospects['vaga_codigo'] == vaga_codigo]
+        df_prospects_vaga = self.repositories.get_prospects_by_vaga(vaga_codigo)
 
         df_merged = pd.merge(
             df_prospects_vaga,
-            df_applicants[['codigo', 'cv_pt']],
+            df_applicants,
             on='codigo',
             how='inner'
         )
@@ -121,8 +86,15 @@ class CompatibilityUseCase:
             print(f"Aviso: Nenhum candidato encontrado para a vaga '{vaga_codigo}'.")
             return pd.DataFrame()
 
-        df_merged[['palavras_em_comum', 'percentual_compatibilidade']] = df_merged['cv_pt'].apply(
-            lambda cv: self._calcular_compatibilidade(cv, palavras_vaga_set, caracteres_vaga_total)
+        # CVs novos ficam no cache em memória; a gravação do arquivo fica com os
+        # jobs em lote (featureengineering), fora do caminho das requisições
+        cv_sets = self.token_cache.get_many(df_merged['codigo'], df_merged['cv_pt'])
+
+        df_merged[['palavras_em_comum', 'percentual_compatibilidade']] = self.engine.score_frame(
+            df_merged['cv_pt'],
+            pd.Series(vaga_codigo, index=df_merged.index),
+            {vaga_codigo: (palavras_vaga_set, caracteres_vaga_total)},
+            cv_sets=cv_sets
         )
 
         final_columns = [
@@ -138,6 +110,32 @@ class CompatibilityUseCase:
         
         return df_final.sort_values(by='percentual_compatibilidade', ascending=False).reset_index(drop=True)
 
+    def search_applicants_for_vaga(self, vaga_codigo: str, top_n: int = 50) -> pd.DataFrame:
+        """
+        Busca, em toda a base de aplicantes (não só nos inscritos), os que mais
+        compartilham palavras e áreas de atuação com a descrição da vaga,
+        usando o índice invertido persistido.
+        """
+        if not vaga_codigo:
+            raise ValueError("O código da vaga (vaga_codigo) não pode ser nulo ou vazio.")
+
+        if self._generator is None:
+            from use_cases.candidate_generation import CandidateGenerator
+            self._generator = CandidateGenerator(self.repositories.data_path)
+        resultados = self._generator.candidates_for_vaga(vaga_codigo, limit=top_n)
+        if not resultados:
+            print(f"Aviso: Nenhum aplicante encontrado para a vaga '{vaga_codigo}'.")
+            return pd.DataFrame()
+
+        df_final = pd.DataFrame(resultados, columns=['codigo', 'pontuacao_relevancia'])
+        df_nomes = self.repositories.load_applicants(
+            columns=['codigo', 'infos_basicas.nome'],
+            filters=[('codigo', 'in', df_final['codigo'].tolist())]
+        ).rename(columns={'infos_basicas.nome': 'nome'})
+        df_nomes['codigo'] = df_nomes['codigo'].map(normalize_key)
+        df_final = df_final.merge(df_nomes.drop_duplicates(subset='codigo'), on='codigo', how='left')
+        return df_final[[col for col in ['codigo', 'nome', 'pontuacao_relevancia'] if col in df_final.columns]]
+
     def get_compatibilities_for_applicant(self, applicant_code: str) -> pd.DataFrame:
         """
         Para um dado aplicante, retorna a compatibilidade com todas as vagas em que ele se inscreveu.
@@ -145,46 +143,51 @@ class CompatibilityUseCase:
         if not applicant_code:
             raise ValueError("O código do aplicante (applicant_code) não pode ser nulo ou vazio.")
 
-        df_vagas = self.repositories.load_vagas()
-        df_prospects = self.repositories.load_prospects()
-        df_applicants = self.repositories.load_applicants()
-
-        applicant_data = df_applicants[df_applicants['codigo'] == applicant_code]
+        applicant_data = self.repositories.get_applicant(applicant_code)
         if applicant_data.empty:
             print(f"Aviso: Aplicante com código '{applicant_code}' não encontrado.")
             return pd.DataFrame()
         cv_text = applicant_data.iloc[0]['cv_pt']
 
-        applicant_prospects = df_prospects[df_prospects['codigo'] == applicant_code]
+        applicant_prospects = self.repositories.get_prospects_by_applicant(applicant_code)
         if applicant_prospects.empty:
             print(f"Aviso: Nenhuma candidatura encontrada para o aplicante '{applicant_code}'.")
             return pd.DataFrame()
         
         vagas_aplicadas_codigos = applicant_prospects['vaga_codigo'].unique()
 
-        results_list = []
+        vagas_info = {}
         for vaga_codigo in vagas_aplicadas_codigos:
-            descricao_vaga = self._get_vaga_text(df_vagas, vaga_codigo)
+            descricao_vaga = self._get_vaga_text(vaga_codigo)
             
             if descricao_vaga:
                 palavras_vaga_set = set(descricao_vaga.split())
-                caracteres_vaga_total = sum(len(p) for p in palavras_vaga_set)
-                
-                compat_series = self._calcular_compatibilidade(cv_text, palavras_vaga_set, caracteres_vaga_total)
-                
-                vaga_info = df_vagas[df_vagas['codigo'] == vaga_codigo].iloc[0]
-                prospect_info = applicant_prospects[applicant_prospects['vaga_codigo'] == vaga_codigo].iloc[0]
-
-                results_list.append({
-                    'titulo_vaga': vaga_info.get('informacoes_basicas.titulo_vaga', 'N/A'),
-                    'data_candidatura': prospect_info.get('data_candidatura', 'N/A'),
-                    'situacao_candidado': prospect_info.get('situacao_candidado', 'N/A'),
-                    'palavras_em_comum': compat_series['palavras_em_comum'],
-                    'percentual_compatibilidade': compat_series['percentual_compatibilidade']
-                })
-
-        if not results_list:
+                vagas_info[vaga_codigo] = (palavras_vaga_set, sum(len(p) for p in palavras_vaga_set))
+
+        if not vagas_info:
             return pd.DataFrame()
 
+        # O CV é comparado com todas as vagas em um único lote
+        vagas_codigos = pd.Series(list(vagas_info.keys()))
+        palavras_cv = self.token_cache.get(applicant_code, cv_text)
+
+        df_compat = self.engine.score_frame(
+            pd.Series(cv_text, index=vagas_codigos.index), vagas_codigos, vagas_info,
+            cv_sets=[palavras_cv] * len(vagas_codigos)
+        )
+
+        results_list = []
+        for vaga_codigo, compat in zip(vagas_codigos, df_compat.itertuples(index=False)):
+            vaga_info = self.repositories.get_vaga(vaga_codigo, columns=['informacoes_basicas.titulo_vaga']).iloc[0]
+            prospect_info = applicant_prospects[applicant_prospects['vaga_codigo'] == vaga_codigo].iloc[0]
+
+            results_list.append({
+                'titulo_vaga': vaga_info.get('informacoes_basicas.titulo_vaga', 'N/A'),
+                'data_candidatura': prospect_info.get('data_candidatura', 'N/A'),
+                'situacao_candidado': prospect_info.get('situacao_candidado', 'N/A'),
+                'palavras_em_comum': compat.palavras_em_comum,
+                'percentual_compatibilidade': compat.percentual_compatibilidade
+            })
+
         df_final = pd.DataFrame(results_list)
         return df_final.sort_values(by='percentual_compatibilidade', ascending=False).reset_index(drop=True)
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class CompatibilityEngine:
+    """
+    Calcula a compatibilidade CV x vaga para um lote inteiro de pares de uma vez.
+
+    Cada texto distinto é tokenizado uma única vez e convertido para ids inteiros
+    de um vocabulário compartilhado (montado a partir das vagas). CVs e vagas viram matrizes binárias CSR
+    (texto x token) e as duas features — quantidade de palavras em comum e
+    percentual de caracteres em comum — são obtidas com produtos esparsos.
+    """
+
+    def __init__(self, clean_text: Callable[[Optional[str]], str], chunk_size: int = 20000):
+        """
+        Args:
+            clean_text: Função que limpa o texto e remove stopwords
+            chunk_size: Quantidade de pares processados por bloco (limita a memória)
+        """
+        self.clean_text = clean_text
+        self.chunk_size = chunk_size
+        self.vocabulario: Dict[str, int] = {}
+
+    def tokenize(self, text: Optional[str]) -> frozenset:
+        """Retorna o conjunto de palavras limpas de um texto."""
+        return frozenset(self.clean_text(text).split())
+
+    def _token_ids(self, palavras: Iterable[str], expandir: bool) -> List[int]:
+        vocabulario = self.vocabulario
+        if expandir:
+            return [vocabulario.setdefault(palavra, len(vocabulario)) for palavra in palavras]
+        # Palavras fora do vocabulário não podem estar em comum com nenhuma vaga
+        return [vocabulario[palavra] for palavra in palavras if palavra in vocabulario]
+
+    def _encode(self, conjuntos: List[Iterable[str]], expandir: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Converte uma lista de conjuntos de palavras em (indptr, indices) no formato CSR."""
+        indptr = [0]
+        indices: List[int] = []
+        for palavras in conjuntos:
+            indices.extend(self._token_ids(palavras, expandir))
+            indptr.append(len(indices))
+        return np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64)
+
+    def _to_csr(self, indptr: np.ndarray, indices: np.ndarray) -> sparse.csr_matrix:
+        """Monta a matriz binária (texto x token) com o tamanho final do vocabulário."""
+        dados = np.ones(len(indices), dtype=np.float64)
+        return sparse.csr_matrix((dados, indices, indptr),
+                                 shape=(len(indptr) - 1, max(len(self.vocabulario), 1)))
+
+    def _token_lengths(self) -> np.ndarray:
+        comprimentos = np.zeros(max(len(self.vocabulario), 1), dtype=np.float64)
+        for palavra, token_id in self.vocabulario.items():
+            comprimentos[token_id] = len(palavra)
+        return comprimentos
+
+    def score_pairs(self, cv_sets: List[Iterable[str]], vaga_sets: List[Iterable[str]],
+                    pair_cv: np.ndarray, pair_vaga: np.ndarray,
+                    vaga_char_totals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula as features para pares (cv, vaga) dados por índices.
+
+        Args:
+            cv_sets: Conjuntos de palavras de cada CV distinto
+            vaga_sets: Conjuntos de palavras de cada vaga distinta
+            pair_cv: Índice em `cv_sets` de cada par
+            pair_vaga: Índice em `vaga_sets` de cada par
+            vaga_char_totals: Denominador do percentual para cada vaga distinta
+
+        Returns:
+            Tupla (palavras em comum, percentual de compatibilidade) por par
+        """
+        self.vocabulario = {}
+        vagas_codificadas = self._encode(vaga_sets, expandir=True)
+        cvs_codificados = self._encode(cv_sets, expandir=False)
+        matriz_vagas = self._to_csr(*vagas_codificadas)
+        matriz_cvs = self._to_csr(*cvs_codificados)
+        comprimentos = self._token_lengths()
+
+        contagens = np.zeros(len(pair_cv), dtype=np.int64)
+        caracteres = np.zeros(len(pair_cv), dtype=np.float64)
+        for inicio in range(0, len(pair_cv), self.chunk_size):
+            fim = inicio + self.chunk_size
+            comuns = matriz_cvs[pair_cv[inicio:fim]].multiply(matriz_vagas[pair_vaga[inicio:fim]]).tocsr()
+            comuns.eliminate_zeros()
+            contagens[inicio:fim] = np.diff(comuns.indptr)
+            caracteres[inicio:fim] = comuns @ comprimentos
+
+        totais = np.asarray(vaga_char_totals, dtype=np.float64)[pair_vaga]
+        percentual = np.divide(caracteres * 100, totais, out=np.zeros_like(caracteres), where=totais > 0)
+        return contagens, np.round(percentual, 2)
+
+    def score_frame(self, cv_texts: pd.Series, vaga_keys: pd.Series,
+                    vagas: Dict[Hashable, Tuple[Iterable[str], int]],
+                    cv_sets: Optional[List[Iterable[str]]] = None) -> pd.DataFrame:
+        """
+        Calcula as features de compatibilidade para todas as linhas de um DataFrame.
+
+        Args:
+            cv_texts: Série com o texto do CV de cada linha
+            vaga_keys: Série (mesmo índice) com o código da vaga de cada linha
+            vagas: Dicionário vaga -> (palavras da vaga, total de caracteres da vaga)
+            cv_sets: Conjuntos de palavras já tokenizados por linha (opcional, ex.: do TokenCache)
+
+        Returns:
+            DataFrame com 'palavras_em_comum' e 'percentual_compatibilidade'
+        """
+        if cv_sets is None:
+            # Cada CV distinto é tokenizado uma única vez
+            codigos_cv, textos_unicos = pd.factorize(cv_texts.fillna(''), use_na_sentinel=False)
+            cv_sets = [self.tokenize(texto) for texto in textos_unicos]
+        else:
+            # Linhas que compartilham o mesmo conjunto (mesmo CV) são codificadas uma única vez
+            posicoes: Dict[int, int] = {}
+            unicos = []
+            codigos_cv = np.empty(len(cv_sets), dtype=np.int64)
+            for i, palavras in enumerate(cv_sets):
+                posicao = posicoes.get(id(palavras))
+                if posicao is None:
+                    posicao = posicoes[id(palavras)] = len(unicos)
+                    unicos.append(palavras)
+                codigos_cv[i] = posicao
+            cv_sets = unicos
+
+        chaves_vaga = list(vagas.keys())
+        posicao_vaga = {chave: i for i, chave in enumerate(chaves_vaga)}
+        # Vagas sem texto apontam para um conjunto vazio extra no final
+        vaga_sets = [vagas[chave][0] for chave in chaves_vaga] + [frozenset()]
+        totais = np.array([vagas[chave][1] for chave in chaves_vaga] + [0], dtype=np.float64)
+        codigos_vaga = vaga_keys.map(posicao_vaga).fillna(len(chaves_vaga)).to_numpy(dtype=np.int64)
+
+        contagens, percentual = self.score_pairs(
+            cv_sets, vaga_sets, np.asarray(codigos_cv, dtype=np.int64), codigos_vaga, totais
+        )
+        return pd.DataFrame(
+            {'palavras_em_comum': contagens, 'percentual_compatibilidade': percentual},
+            index=cv_texts.index
+        )
@@ -0,0 +1,83 @@
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Versão do formato do arquivo de encoders
+ENCODERS_VERSION = "1"
+
+
+class CategoricalEncoders:
+    """
+    Label encoders persistidos, um vocabulário por coluna.
+
+    O vocabulário segue a ordem de primeira aparição no conjunto de ajuste, de
+    modo que os códigos são idênticos aos de `pd.factorize` sobre esse conjunto.
+    Depois de ajustados, os códigos não dependem mais da ordem ou do tamanho do
+    lote transformado: uma única linha recebe o mesmo código que receberia no
+    processamento completo. Valores nulos ou fora do vocabulário recebem -1
+    (o mesmo sentinela que o `pd.factorize` usa para nulos).
+    """
+
+    def __init__(self, vocabularies: Optional[Dict[str, List[Any]]] = None):
+        self.vocabularies: Dict[str, List[Any]] = {}
+        self._indices: Dict[str, pd.Index] = {}
+        self._lookups: Dict[str, Dict[Any, int]] = {}
+        for coluna, valores in (vocabularies or {}).items():
+            self._set_vocabulary(coluna, valores)
+
+    def _set_vocabulary(self, coluna: str, valores: Iterable[Any]):
+        self.vocabularies[coluna] = list(valores)
+        self._indices.pop(coluna, None)
+        self._lookups.pop(coluna, None)
+
+    def has(self, coluna: str) -> bool:
+        return coluna in self.vocabularies
+
+    def fit(self, df: pd.DataFrame, colunas: Iterable[str]) -> "CategoricalEncoders":
+        """
+        Ajusta (ou reajusta) o vocabulário das colunas a partir do DataFrame.
+
+        Args:
+            df: DataFrame de ajuste (tipicamente a base de treino)
+            colunas: Colunas a ajustar (colunas ausentes são ignoradas)
+        """
+        for coluna in colunas:
+            if coluna in df.columns:
+                self._set_vocabulary(coluna, pd.factorize(df[coluna])[1].tolist())
+        return self
+
+    def transform(self, valores: Iterable[Any], coluna: str) -> np.ndarray:
+        """
+        Codifica um lote de valores de uma coluna (busca vetorizada no vocabulário).
+
+        Returns:
+            Array de inteiros com o código de cada valor (-1 para nulos/desconhecidos)
+        """
+        indice = self._indices.get(coluna)
+        if indice is None:
+            indice = self._indices[coluna] = pd.Index(self.vocabularies[coluna])
+        return indice.get_indexer(pd.Index(valores)).astype(np.int64)
+
+    def transform_one(self, valor: Any, coluna: str) -> int:
+        """Codifica um único valor (busca em dicionário, sem criar arrays)."""
+        lookup = self._lookups.get(coluna)
+        if lookup is None:
+            lookup = self._lookups[coluna] = {v: i for i, v in enumerate(self.vocabularies[coluna])}
+        try:
+            return lookup.get(valor, -1)
+        except TypeError:
+            return -1
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        joblib.dump({'version': ENCODERS_VERSION, 'vocabularies': self.vocabularies}, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CategoricalEncoders":
+        dados = joblib.load(path)
+        if dados.get('version') != ENCODERS_VERSION:
+            raise ValueError(f"Versão de encoders incompatível em {path}: {dados.get('version')}")
+        return cls(dados['vocabularies'])
@@ -3,13 +3,29 @@ import numpy as np
 import re
 import os
 import sys
-from typing import Set, Optional, Dict, List
-import nltk
-from nltk.corpus import stopwords
+from typing import Optional, Dict, List
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from use_cases.pipeline import Pipeline
+from interface_adapters.token_cache import TokenCache
+from use_cases.compatibility_engine import CompatibilityEngine
+from use_cases.chunked_executor import ChunkedExecutor
+from use_cases.encoders import CategoricalEncoders
+from use_cases.text_normalization import DEFAULT_NORMALIZER
+from interface_adapters.token_cache import TOKENIZER_VERSION
+from interface_adapters.storage import StorageOptions
+from interface_adapters.data_store import file_hash
+from interface_adapters.feature_snapshot import FeatureSnapshot, snapshot_path
+
+# Versão das features por linha. Deve ser incrementada quando o cálculo dessas
+# features mudar, invalidando o estado salvo pelo modo incremental.
+FEATURE_STATE_VERSION = "1"
+
+# Opções de gravação do arquivo de features (lido inteiro pelo app e pelo treino)
+# e do estado do modo incremental
+FEATURE_STORAGE = StorageOptions()
+
 
 class CandidateFeatureEngineer:
     """
@@ -18,11 +34,36 @@ class CandidateFeatureEngineer:
     Esta classe processa dados de candidatos (applicants), prospects e vagas,
     criando features para modelos de machine learning de matching.
     """
+
+    # Colunas concatenadas para formar a descrição de uma vaga
+    COLUNAS_TEXTO_VAGA = [
+        'perfil_vaga.demais_observacoes', 
+        'informacoes_basicas.titulo_vaga',
+        'perfil_vaga.principais_atividades', 
+        'perfil_vaga.competencia_tecnicas_e_comportamentais'
+    ]
     
-    def __init__(self):
-        """Inicializa a classe com configurações padrão."""
-        self.stopwords_pt = self._load_stopwords()
+    def __init__(self, n_workers: int = 1, encoders_path: str = "app/model/encoders.pkl",
+                 storage: Optional[StorageOptions] = None):
+        """
+        Inicializa a classe com configurações padrão.
+
+        Args:
+            n_workers: Quantidade de processos usados nas etapas linha a linha
+                (compatibilidade e match de áreas). 1 executa no processo atual.
+            encoders_path: Arquivo dos encoders categóricos (salvo junto ao modelo)
+            storage: Opções de gravação dos parquets gerados (padrão: FEATURE_STORAGE)
+        """
+        self.normalizer = DEFAULT_NORMALIZER
+        self.stopwords_pt = self.normalizer.stopwords
         self.vagas_cache = {}
+        self.executor = ChunkedExecutor(n_workers)
+        self.encoders_path = encoders_path
+        self.storage = storage or FEATURE_STORAGE
+        self.encoders: Optional[CategoricalEncoders] = None
+        self._encoders_alterados = False
+        self.engine = CompatibilityEngine(self._clean_and_remove_stopwords)
+        self.token_cache = TokenCache.shared(self.engine.tokenize)
         self.mapa_niveis_idioma = {
             'Nenhum': 0,
             '': 0,
@@ -103,6 +144,14 @@ class CandidateFeatureEngineer:
             'Encaminhar Proposta': 'Andamento'
         }
         
+        # Features calculadas linha a linha (as mais caras), reaproveitadas no modo incremental
+        self.colunas_por_linha = [
+            'compatibilidade_vaga_cv_palavras',
+            'compatibilidade_vaga_cv_percentual',
+            'match_areas_contagem',
+            'match_areas_percentual'
+        ]
+
         self.colunas_modelo = [
             'id_vaga',
             'dict_prospect_codigo',
@@ -128,15 +177,6 @@ class CandidateFeatureEngineer:
             'status_geral_codificado'
         ]
     
-    def _load_stopwords(self) -> Set[str]:
-        """Carrega stopwords em português."""
-        try:
-            return set(stopwords.words('portuguese'))
-        except LookupError:
-            print("Baixando recurso 'stopwords' do NLTK...")
-            nltk.download('stopwords')
-            return set(stopwords.words('portuguese'))
-    
     def _clean_and_remove_stopwords(self, text: Optional[str]) -> str:
         """
         Limpa o texto, removendo pontuações e stopwords.
@@ -147,14 +187,7 @@ class CandidateFeatureEngineer:
         Returns:
             Texto limpo sem stopwords
         """
-        if not isinstance(text, str) or not text:
-            return ""
-        
-        text_cleaned = re.sub(r'[^\w\s]', '', text)
-        words = text_cleaned.lower().split()
-        filtered_words = [word for word in words if word not in self.stopwords_pt]
-        
-        return " ".join(filtered_words)
+        return self.normalizer.clean(text)
     
     def _get_vaga_text(self, df_vagas: pd.DataFrame, vaga_codigo: str) -> Optional[str]:
         """
@@ -171,47 +204,29 @@ class CandidateFeatureEngineer:
         if vaga_data.empty:
             return None
         
-        vagas_columns = [
-            'perfil_vaga.demais_observacoes', 
-            'informacoes_basicas.titulo_vaga',
-            'perfil_vaga.principais_atividades', 
-            'perfil_vaga.competencia_tecnicas_e_comportamentais'
-        ]
-        
-        vagas_columns_existentes = [col for col in vagas_columns if col in vaga_data.columns]
+        vagas_columns_existentes = [col for col in self.COLUNAS_TEXTO_VAGA if col in vaga_data.columns]
         descricao_vaga = ' '.join(vaga_data.iloc[0][vagas_columns_existentes].dropna().astype(str))
         
         return self._clean_and_remove_stopwords(descricao_vaga)
     
-    def _calcular_compatibilidade(self, cv_text: str, palavras_vaga: Set[str], 
-                                 caracteres_totais_vaga: int) -> pd.Series:
+    def _get_vagas_texts(self, df_vagas: pd.DataFrame) -> pd.Series:
         """
-        Calcula a compatibilidade entre CV e vaga.
+        Texto limpo de todas as vagas de uma vez (mesmo resultado de
+        `_get_vaga_text` para cada código), sem filtrar o DataFrame por vaga.
         
         Args:
-            cv_text: Texto do CV
-            palavras_vaga: Set de palavras da vaga
-            caracteres_totais_vaga: Total de caracteres da vaga
+            df_vagas: DataFrame com informações das vagas
             
         Returns:
-            Series com contagem de palavras em comum e percentual
-        """
-        cv_limpo = self._clean_and_remove_stopwords(cv_text)
-        if not cv_limpo:
-            return pd.Series([0, 0.0], index=['palavras_em_comum', 'percentual_compatibilidade'])
-
-        palavras_cv = set(cv_limpo.split())
-        palavras_comuns = palavras_cv.intersection(palavras_vaga)
-        
-        contagem_palavras_comuns = len(palavras_comuns)
-        caracteres_palavras_comuns = sum(len(palavra) for palavra in palavras_comuns)
-        
-        percentual = 0.0
-        if caracteres_totais_vaga > 0:
-            percentual = (caracteres_palavras_comuns / caracteres_totais_vaga) * 100
-            
-        return pd.Series([contagem_palavras_comuns, round(percentual, 2)], 
-                        index=['palavras_em_comum', 'percentual_compatibilidade'])
+            Série com o texto limpo, indexada pelo código da vaga
+        """
+        df_unico = df_vagas.drop_duplicates(subset='codigo').set_index('codigo')
+        colunas = [col for col in self.COLUNAS_TEXTO_VAGA if col in df_unico.columns]
+        # stack descarta os nulos e mantém a ordem das colunas, como o dropna por linha
+        partes = df_unico[colunas].astype(object).stack()
+        descricoes = partes.astype(str).groupby(level=0, sort=False).agg(' '.join)
+        descricoes = descricoes.reindex(df_unico.index, fill_value='')
+        return descricoes.map(self._clean_and_remove_stopwords)
     
     def _normalize_json_columns(self, df: pd.DataFrame, json_columns: List[str]) -> pd.DataFrame:
         """
@@ -285,6 +300,132 @@ class CandidateFeatureEngineer:
         return pd.Series([match_contagem, match_percentual], 
                         index=['match_areas_contagem', 'match_areas_percentual'])
     
+    def _linhas_pendentes(self, df: pd.DataFrame, colunas: List[str]) -> pd.Series:
+        """
+        Linhas em que as features ainda precisam ser calculadas: todas, se as
+        colunas não existem, ou apenas as que não foram reaproveitadas (NaN).
+        """
+        if not all(col in df.columns for col in colunas):
+            return pd.Series(True, index=df.index)
+        return df[colunas].isna().any(axis=1)
+
+    def _preencher_pendentes(self, df: pd.DataFrame, pendentes: pd.Series,
+                             valores: pd.DataFrame) -> pd.DataFrame:
+        """Grava as features calculadas nas linhas pendentes."""
+        if pendentes.all() and not any(col in df.columns for col in valores.columns):
+            return pd.concat([df, valores], axis=1)
+        df = df.copy()
+        for col in valores.columns:
+            if col not in df.columns:
+                df[col] = np.nan
+            df.loc[pendentes, col] = valores[col]
+        return df
+
+    def _row_input_hashes(self, df_merged: pd.DataFrame, df_prospects: pd.DataFrame,
+                          df_vagas: pd.DataFrame, df_applicants: pd.DataFrame) -> np.ndarray:
+        """
+        Hash das entradas de cada linha combinada, a partir dos hashes de
+        conteúdo de cada entidade: o prospect, a vaga e o aplicante.
+
+        Args:
+            df_merged: DataFrame unificado (uma linha por prospect)
+            df_prospects: DataFrame de prospects
+            df_vagas: DataFrame de vagas
+            df_applicants: DataFrame de candidatos
+
+        Returns:
+            Array uint64 com um hash por linha de df_merged
+        """
+        def hashes_por_codigo(df_entidade):
+            df_unico = df_entidade.drop_duplicates(subset='codigo')
+            hashes = pd.util.hash_pandas_object(df_unico, index=False).to_numpy()
+            return pd.Series(hashes, index=df_unico['codigo'].to_numpy())
+
+        hash_prospect = pd.util.hash_pandas_object(df_merged[list(df_prospects.columns)], index=False).to_numpy()
+        hash_vaga = df_merged['vaga_codigo'].map(hashes_por_codigo(df_vagas)).fillna(0).astype('uint64')
+        hash_applicant = df_merged['codigo'].map(hashes_por_codigo(df_applicants)).fillna(0).astype('uint64')
+
+        combinados = pd.DataFrame({
+            'versao': f"{FEATURE_STATE_VERSION}:{TOKENIZER_VERSION}",
+            'prospect': hash_prospect,
+            'vaga': hash_vaga.to_numpy(),
+            'applicant': hash_applicant.to_numpy(),
+        })
+        return pd.util.hash_pandas_object(combinados, index=False).to_numpy()
+
+    def _state_path(self, output_path: str) -> str:
+        return f"{os.path.splitext(output_path)[0]}_state.parquet"
+
+    def _reaproveitar_features(self, df: pd.DataFrame, state_path: str) -> pd.DataFrame:
+        """
+        Preenche as features por linha já calculadas em execuções anteriores
+        para as linhas cujo hash de entrada não mudou.
+        """
+        if not os.path.exists(state_path):
+            return df
+        df_state = pd.read_parquet(state_path).drop_duplicates(subset='hash_entrada')
+        return df.merge(df_state, on='hash_entrada', how='left')
+
+    def _salvar_estado_features(self, df: pd.DataFrame, state_path: str):
+        colunas = ['hash_entrada'] + self.colunas_por_linha
+        self.storage.write(df[colunas].drop_duplicates(subset='hash_entrada'), state_path)
+
+    def _get_encoders(self) -> CategoricalEncoders:
+        """Encoders persistidos (ou vazios, se ainda não foram ajustados)."""
+        if self.encoders is None:
+            if os.path.exists(self.encoders_path):
+                self.encoders = CategoricalEncoders.load(self.encoders_path)
+            else:
+                self.encoders = CategoricalEncoders()
+        return self.encoders
+
+    def _codificar(self, df: pd.DataFrame, coluna: str, ajustar: bool) -> np.ndarray:
+        """
+        Codifica uma coluna com o encoder persistido. O vocabulário só é
+        ajustado (neste DataFrame) quando `ajustar` é True, isto é, na base de
+        treino; fora dela os códigos do treino são reaproveitados e uma coluna
+        sem encoder é um erro, nunca um ajuste sobre os dados servidos.
+
+        Raises:
+            ValueError: Se `ajustar` é False e a coluna não tem encoder salvo
+        """
+        encoders = self._get_encoders()
+        if ajustar:
+            encoders.fit(df, [coluna])
+            self._encoders_alterados = True
+        elif not encoders.has(coluna):
+            raise ValueError(
+                f"Encoder da coluna '{coluna}' não encontrado em {self.encoders_path}. "
+                "Gere os encoders na base de treino antes: python app/use_cases/featureengineering.py "
+                "--encoders (ou o process_all com trainmodel=True)."
+            )
+        return encoders.transform(df[coluna], coluna)
+
+    def fit_encoders(self) -> CategoricalEncoders:
+        """
+        Ajusta e salva apenas os encoders categóricos, a partir da silver, sem
+        calcular as demais features (passo único para um checkout sem
+        `encoders.pkl`). Os vocabulários são os mesmos do process_all com
+        trainmodel=True: as etapas anteriores aos encodings não removem nem
+        reordenam linhas, e o status é ajustado sem os registros em andamento.
+
+        Returns:
+            Os encoders ajustados (já gravados em `encoders_path`)
+        """
+        df_applicants, df_prospects, df_vagas = self.load_data()
+        df_merged = self.merge_dataframes(df_prospects, df_vagas, df_applicants)
+        df_merged = self.create_categorical_encodings(df_merged, ajustar=True)
+        self.create_status_features(df_merged, trainmodel=True)
+        self.save_encoders()
+        return self.encoders
+
+    def save_encoders(self):
+        """Persiste os encoders se algum vocabulário foi ajustado nesta execução."""
+        if self.encoders is not None and self._encoders_alterados:
+            self.encoders.save(self.encoders_path)
+            self._encoders_alterados = False
+            print(f"Encoders salvos em: {self.encoders_path}")
+
     def load_data(self) -> tuple:
         """
         Carrega os dados dos arquivos JSON.
@@ -348,16 +489,54 @@ class CandidateFeatureEngineer:
         Returns:
             DataFrame com features de compatibilidade
         """
-        print("Pré-processando descrições das vagas...")
-        
+        colunas = ['compatibilidade_vaga_cv_palavras', 'compatibilidade_vaga_cv_percentual']
+        pendentes = self._linhas_pendentes(df, colunas)
+        if not pendentes.any():
+            return df
+        df_pendente = df[pendentes]
+
         # Garante que a coluna 'codigo' existe
         if 'codigo' not in df_vagas_original.columns:
             df_vagas_original.reset_index(inplace=True)
             df_vagas_original.rename(columns={'index': 'codigo'}, inplace=True)
+
+        print("Pré-processando descrições das vagas e calculando compatibilidade entre CV e Vaga...")
+        if self.executor.parallel:
+            # Cada bloco contém vagas inteiras e recebe apenas as linhas dessas vagas,
+            # de modo que o cache de textos das vagas fica local a cada worker
+            entrada = df_pendente[['id_vaga', 'codigo', 'cv_pt']]
+            posicoes = self.executor.split_positions(entrada, 'id_vaga')
+            blocos = [entrada.iloc[p] for p in posicoes]
+            tarefas = [
+                (bloco, df_vagas_original[df_vagas_original['codigo'].isin(bloco['id_vaga'].unique())])
+                for bloco in blocos
+            ]
+            resultados = self.executor.run(_compatibilidade_em_worker, tarefas)
+            for _, novas_entradas in resultados:
+                self.token_cache.add_entries(novas_entradas)
+            compatibilidade_df = self.executor.reassemble([parcial for parcial, _ in resultados], posicoes)
+        else:
+            compatibilidade_df = self._compatibilidade_bloco(df_pendente, df_vagas_original)
+        self.token_cache.save()
+        
+        return self._preencher_pendentes(df, pendentes, compatibilidade_df)
+    
+    def _compatibilidade_bloco(self, df_bloco: pd.DataFrame, df_vagas: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcula as features de compatibilidade de um bloco de linhas no processo atual.
+        
+        Args:
+            df_bloco: Linhas a calcular (colunas 'id_vaga', 'codigo' e 'cv_pt')
+            df_vagas: DataFrame das vagas (ao menos as vagas presentes no bloco)
+            
+        Returns:
+            DataFrame com as duas features de compatibilidade, no índice de df_bloco
+        """
+        vagas_bloco = df_bloco['id_vaga'].unique()
         
         # Cria cache das vagas
-        for vaga_id in df['id_vaga'].unique():
-            texto_vaga_limpo = self._get_vaga_text(df_vagas_original, vaga_id)
+        for vaga_id in vagas_bloco:
+            texto_vaga_limpo = self._get_vaga_text(df_vagas, vaga_id)
             if texto_vaga_limpo:
                 palavras_vaga = set(texto_vaga_limpo.split())
                 caracteres_totais_vaga = len(texto_vaga_limpo)
@@ -366,30 +545,28 @@ class CandidateFeatureEngineer:
                     'caracteres_totais_vaga': caracteres_totais_vaga
                 }
         
-        # Função para aplicar a cada linha
-        def calcular_compatibilidade_por_linha(row):
-            vaga_id = row['id_vaga']
-            cv_text = row['cv_pt']
-            
-            info_vaga = self.vagas_cache.get(vaga_id)
-            
-            if not info_vaga or not cv_text:
-                return pd.Series([0, 0.0], index=['compatibilidade_vaga_cv_palavras', 
-                                                 'compatibilidade_vaga_cv_percentual'])
-            
-            resultado = self._calcular_compatibilidade(
-                cv_text, 
-                info_vaga['palavras_vaga'], 
-                info_vaga['caracteres_totais_vaga']
-            )
-            resultado.index = ['compatibilidade_vaga_cv_palavras', 'compatibilidade_vaga_cv_percentual']
-            return resultado
-        
-        print("Calculando compatibilidade entre CV e Vaga...")
-        compatibilidade_df = df.apply(calcular_compatibilidade_por_linha, axis=1)
-        
-        return pd.concat([df, compatibilidade_df], axis=1)
+        vagas_info = {
+            vaga_id: (self.vagas_cache[vaga_id]['palavras_vaga'], self.vagas_cache[vaga_id]['caracteres_totais_vaga'])
+            for vaga_id in vagas_bloco if vaga_id in self.vagas_cache
+        }
+        # CVs inalterados desde a última execução vêm do cache persistente de tokens
+        cv_sets = self.token_cache.get_many(df_bloco['codigo'], df_bloco['cv_pt'])
+        compatibilidade_df = self.engine.score_frame(
+            df_bloco['cv_pt'], df_bloco['id_vaga'], vagas_info, cv_sets=cv_sets
+        )
+        compatibilidade_df = compatibilidade_df.astype(float)
+        compatibilidade_df.columns = ['compatibilidade_vaga_cv_palavras', 'compatibilidade_vaga_cv_percentual']
+        return compatibilidade_df
     
+    @staticmethod
+    def _nivel(serie: pd.Series, mapa: Dict[str, int]) -> pd.Series:
+        """
+        Nível numérico de cada valor segundo o mapa (0 se ausente). Em colunas
+        category o `map` devolve outra category, que não aceita `>=`; por isso
+        o resultado é convertido para float.
+        """
+        return serie.map(mapa).astype(float).fillna(0)
+
     def create_language_matches(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Cria features de match de idiomas (inglês e espanhol).
@@ -401,13 +578,13 @@ class CandidateFeatureEngineer:
             DataFrame com features de match de idiomas
         """
         # Match inglês
-        nivel_candidato_ingles = df['formacao_e_idiomas.nivel_ingles'].map(self.mapa_niveis_idioma).fillna(0)
-        nivel_vaga_ingles = df['perfil_vaga.nivel_ingles'].map(self.mapa_niveis_idioma).fillna(0)
+        nivel_candidato_ingles = self._nivel(df['formacao_e_idiomas.nivel_ingles'], self.mapa_niveis_idioma)
+        nivel_vaga_ingles = self._nivel(df['perfil_vaga.nivel_ingles'], self.mapa_niveis_idioma)
         df['match_ingles'] = (nivel_candidato_ingles >= nivel_vaga_ingles).astype(int)
         
         # Match espanhol
-        nivel_candidato_espanhol = df['formacao_e_idiomas.nivel_espanhol'].map(self.mapa_niveis_idioma).fillna(0)
-        nivel_vaga_espanhol = df['perfil_vaga.nivel_espanhol'].map(self.mapa_niveis_idioma).fillna(0)
+        nivel_candidato_espanhol = self._nivel(df['formacao_e_idiomas.nivel_espanhol'], self.mapa_niveis_idioma)
+        nivel_vaga_espanhol = self._nivel(df['perfil_vaga.nivel_espanhol'], self.mapa_niveis_idioma)
         df['match_espanhol'] = (nivel_candidato_espanhol >= nivel_vaga_espanhol).astype(int)
         
         return df
@@ -422,18 +599,19 @@ class CandidateFeatureEngineer:
         Returns:
             DataFrame com feature de match acadêmico
         """
-        nivel_candidato = df['formacao_e_idiomas.nivel_academico'].map(self.mapa_academico).fillna(0)
-        nivel_vaga = df['perfil_vaga.nivel_academico'].map(self.mapa_academico).fillna(0)
+        nivel_candidato = self._nivel(df['formacao_e_idiomas.nivel_academico'], self.mapa_academico)
+        nivel_vaga = self._nivel(df['perfil_vaga.nivel_academico'], self.mapa_academico)
         df['match_academico'] = (nivel_candidato >= nivel_vaga).astype(int)
         
         return df
     
-    def create_categorical_encodings(self, df: pd.DataFrame) -> pd.DataFrame:
+    def create_categorical_encodings(self, df: pd.DataFrame, ajustar: bool = False) -> pd.DataFrame:
         """
         Cria encodings categóricos para variáveis relevantes.
         
         Args:
             df: DataFrame principal
+            ajustar: Se True, reajusta os vocabulários neste DataFrame (base de treino)
             
         Returns:
             DataFrame com encodings categóricos
@@ -456,14 +634,15 @@ class CandidateFeatureEngineer:
         ]
         
         # Trata coluna de tipo contratação
-        df['informacoes_basicas.tipo_contratacao'] = df['informacoes_basicas.tipo_contratacao'].fillna('').astype(str)
+        # astype(object) antes do fillna: na silver a coluna é category, que não aceita '' como valor novo
+        df['informacoes_basicas.tipo_contratacao'] = df['informacoes_basicas.tipo_contratacao'].astype(object).fillna('').astype(str)
         df['informacoes_basicas.tipo_contratacao'] = df['informacoes_basicas.tipo_contratacao'].str.replace(', ', ',')
         df['informacoes_basicas.tipo_contratacao'] = df['informacoes_basicas.tipo_contratacao'].str.strip()
         
         # Aplica label encoding
         for col in colunas_para_encoding:
             if col in df.columns:
-                df[f'{col}_codificada'] = pd.factorize(df[col])[0]
+                df[f'{col}_codificada'] = self._codificar(df, col, ajustar)
         
         return df
     
@@ -493,9 +672,16 @@ class CandidateFeatureEngineer:
         # Junta as features
         df = pd.concat([df, df_areas_vaga, df_areas_candidato], axis=1)
         
-        # Calcula matches profissionais
-        match_features = df.apply(self._calcular_match_profissional, axis=1)
-        df = pd.concat([df, match_features], axis=1)
+        # Calcula matches profissionais (apenas linhas ainda sem valor)
+        colunas_match = ['match_areas_contagem', 'match_areas_percentual']
+        pendentes = self._linhas_pendentes(df, colunas_match)
+        if pendentes.any():
+            colunas_entrada = ['id_vaga', 'areas_atuacao_limpas', 'informacoes_profissionais.area_atuacao']
+            if self.executor.parallel:
+                match_features = self.executor.map_frame(_match_areas_em_worker, df.loc[pendentes, colunas_entrada], 'id_vaga')
+            else:
+                match_features = df[pendentes].apply(self._calcular_match_profissional, axis=1)
+            df = self._preencher_pendentes(df, pendentes, match_features)
         
         return df
     
@@ -505,6 +691,8 @@ class CandidateFeatureEngineer:
         
         Args:
             df: DataFrame principal
+            trainmodel: Se True, remove os registros em andamento e reajusta o
+                encoder do status (os registros em andamento ficam com -1 fora do treino)
             
         Returns:
             DataFrame filtrado com features de status
@@ -518,7 +706,7 @@ class CandidateFeatureEngineer:
             df = df[df['status_geral'] != 'Andamento']  
         
         # Label encoding do status
-        df['status_geral_codificado'] = pd.factorize(df['status_geral'])[0]
+        df['status_geral_codificado'] = self._codificar(df, 'status_geral', trainmodel)
         
         return df
     
@@ -550,19 +738,46 @@ class CandidateFeatureEngineer:
         
         return df_modelo
     
-    def process_all(self, output_path: str = "app/data/silver/df_ML_tunado.parquet", trainmodel: bool = False) -> pd.DataFrame:
+    def process_all(self, output_path: str = "app/data/silver/df_ML_tunado.parquet", trainmodel: bool = False,
+                    incremental: bool = False, n_workers: Optional[int] = None,
+                    snapshot: bool = True) -> pd.DataFrame:
         """
         Executa todo o pipeline de processamento.
         
         Args:
-            applicants_path: Caminho para arquivo de candidatos
-            prospects_path: Caminho para arquivo de prospects
-            vagas_path: Caminho para arquivo de vagas
             output_path: Caminho para salvar o resultado
+            trainmodel: Se True, remove os registros em andamento e ajusta e
+                salva os encoders categóricos (base de treino). Se False, usa
+                os encoders salvos no treino
+            incremental: Se True, reaproveita as features por linha (compatibilidade
+                e match de áreas) de execuções anteriores para as linhas cujo
+                prospect, vaga e aplicante não mudaram, recalculando apenas as demais
+            n_workers: Quantidade de processos para as etapas linha a linha
+                (padrão: o valor informado no construtor)
+            snapshot: Se True, grava também o snapshot memory-mapped da matriz
+                de features (`<output_path sem extensão>_snapshot/`), usado
+                pelo GetFeaturesCase
             
         Returns:
             DataFrame final processado
-        """
+
+        Raises:
+            FileNotFoundError: Se `trainmodel` é False e os encoders do treino não existem
+        """
+        if not trainmodel and self.encoders is None and not os.path.exists(self.encoders_path):
+            # Falha antes das etapas pesadas: sem treino não há códigos a reaproveitar
+            raise FileNotFoundError(
+                f"Encoders não encontrados em {self.encoders_path}. Gere os encoders na base de treino "
+                "antes: python app/use_cases/featureengineering.py --encoders (ou o process_all com trainmodel=True)."
+            )
+        if n_workers is not None:
+            self.executor = ChunkedExecutor(n_workers)
+        # Um único pool de processos atende todas as etapas linha a linha da execução
+        with self.executor:
+            return self._executar(output_path, trainmodel, incremental, snapshot)
+
+    def _executar(self, output_path: str, trainmodel: bool, incremental: bool, snapshot: bool) -> pd.DataFrame:
+        """Etapas do process_all (ver `process_all`)."""
         print("Carregando dados...")
         df_applicants, df_prospects, df_vagas = self.load_data()     
         
@@ -570,6 +785,14 @@ class CandidateFeatureEngineer:
         df_merged = self.merge_dataframes(
             df_prospects, df_vagas, df_applicants
         )
+
+        state_path = self._state_path(output_path)
+        df_merged['hash_entrada'] = self._row_input_hashes(df_merged, df_prospects, df_vagas, df_applicants)
+        if incremental:
+            df_merged = self._reaproveitar_features(df_merged, state_path)
+            linhas_reaproveitadas = int((~self._linhas_pendentes(df_merged, self.colunas_por_linha)).sum())
+            print(f"Modo incremental: {linhas_reaproveitadas} linhas reaproveitadas, "
+                  f"{len(df_merged) - linhas_reaproveitadas} linhas a recalcular.")
         
         print("Criando features de compatibilidade...")
         df_merged = self.create_compatibility_features(df_merged, df_vagas)
@@ -581,19 +804,24 @@ class CandidateFeatureEngineer:
         df_merged = self.create_academic_match(df_merged)
         
         print("Criando encodings categóricos...")
-        df_merged = self.create_categorical_encodings(df_merged)
+        df_merged = self.create_categorical_encodings(df_merged, ajustar=trainmodel)
         
         print("Criando features de áreas...")
         df_merged = self.create_area_features(df_merged)
+
+        self._salvar_estado_features(df_merged, state_path)
         
         print("Criando features de status...")
         df_merged = self.create_status_features(df_merged, trainmodel=trainmodel)
+        self.save_encoders()
         
         print("Preparando dados para o modelo...")
         df_final = self.prepare_model_data(df_merged)
         
         print(f"Salvando resultado em {output_path}...")
-        df_final.to_parquet(output_path, index=False, compression='gzip')
+        self.storage.write(df_final, output_path)
+        if snapshot:
+            FeatureSnapshot.build(snapshot_path(output_path), df_final, source=file_hash(output_path))
         
         print(f"Processamento concluído!")
         print(f"DataFrame final contém {df_final.shape[0]} linhas e {df_final.shape[1]} colunas.")
@@ -601,14 +829,48 @@ class CandidateFeatureEngineer:
         return df_final
 
 
+_engenheiro_do_worker: Optional[CandidateFeatureEngineer] = None
+
+
+def _engenheiro_worker() -> CandidateFeatureEngineer:
+    """Instância do processo worker (criada uma vez por processo do pool)."""
+    global _engenheiro_do_worker
+    if _engenheiro_do_worker is None:
+        _engenheiro_do_worker = CandidateFeatureEngineer()
+        # Os CVs tokenizados no worker voltam ao processo principal a cada tarefa
+        _engenheiro_do_worker.token_cache.track_new_entries()
+    return _engenheiro_do_worker
+
+
+def _compatibilidade_em_worker(df_bloco: pd.DataFrame, df_vagas: pd.DataFrame):
+    """
+    Tarefa do pool: calcula a compatibilidade de um bloco e devolve também os CVs
+    tokenizados no worker, que são gravados no cache pelo processo principal.
+    """
+    engenheiro = _engenheiro_worker()
+    resultado = engenheiro._compatibilidade_bloco(df_bloco, df_vagas)
+    return resultado, engenheiro.token_cache.pop_new_entries()
+
+
+def _match_areas_em_worker(df_bloco: pd.DataFrame) -> pd.DataFrame:
+    """Tarefa do pool: calcula o match de áreas de um bloco."""
+    return df_bloco.apply(_engenheiro_worker()._calcular_match_profissional, axis=1)
+
+
 if __name__ == "__main__":
-    # Inicializa o processador
-    processor = CandidateFeatureEngineer()
+    # Inicializa o processador (um worker por núcleo nas etapas linha a linha)
+    processor = CandidateFeatureEngineer(n_workers=os.cpu_count() or 1)
+
+    if "--encoders" in sys.argv[1:]:
+        # Só os encoders categóricos da base de treino (ex.: checkout sem app/model/encoders.pkl)
+        processor.fit_encoders()
+        sys.exit(0)
     
     # Executa o pipeline completo
     df_final = processor.process_all(
         output_path="app/data/silver/df_features_train.parquet"
         ,trainmodel=True
+        ,snapshot=False
     )
     
     print("Features criadas:")
@@ -4,6 +4,10 @@ import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from interface_adapters.data_store import DataStore, file_hash
+from interface_adapters.feature_snapshot import FeatureSnapshot, snapshot_path
+from interface_adapters.feature_store import FeatureStore
+
 
 class GetFeaturesCase:
     def __init__(self, data_path="app/data/silver"):
@@ -11,17 +15,41 @@ class GetFeaturesCase:
         Inicializa o caso de uso com o caminho para os dados.
         """
         self.data_path = data_path
+        self.features_path = os.path.join(data_path, 'df_features.parquet')
+        self.store = DataStore.instance()
+
+    def _feature_store(self) -> FeatureStore:
+        """
+        Retorna o FeatureStore do processo, reconstruído apenas quando o
+        arquivo de features muda no disco.
+        """
+        return self.store.get(self.features_path, FeatureStore.from_parquet)
+
+    def snapshot(self):
+        """
+        Snapshot memory-mapped das features, se existir e corresponder ao
+        parquet atual (senão None e as consultas usam o FeatureStore).
+
+        Quem pontua deve usar o snapshot direto — `vaga_rows` / `applicant_rows`
+        e `predict_snapshot` do predictor ou do ScoringService —, sem montar
+        DataFrames de features.
+        """
+        caminho = snapshot_path(self.features_path)
+        meta = os.path.join(caminho, '_meta.json')
+        if not os.path.exists(meta):
+            return None
+        snapshot = self.store.get(meta, lambda _: FeatureSnapshot(caminho), name='feature_snapshot')
+        atual = self.store.get(self.features_path, file_hash, name='file_hash')
+        return snapshot if snapshot.meta.get('source') == atual else None
 
     def get_features_vaga(self, vaga_codigo: str) -> pd.DataFrame:
-        df_features = pd.read_parquet(os.path.join(self.data_path, 'df_features.parquet'))        
-        df_features["id_vaga"] = df_features["id_vaga"].astype(str).str.replace(",", "")
-        df = df_features[df_features["id_vaga"] == vaga_codigo]
-         
-        return df  
-    
+        snapshot = self.snapshot()
+        if snapshot is not None:
+            return snapshot.get_vaga(vaga_codigo)
+        return self._feature_store().get_vaga(vaga_codigo)
+
     def get_features_applicants(self, applicant_codigo: str) -> pd.DataFrame:
-        df_features = pd.read_parquet(os.path.join(self.data_path, 'df_features.parquet'))        
-        df_features["codigo"] = df_features["codigo"].astype(str).str.replace(",", "")
-        df = df_features[df_features["codigo"] == applicant_codigo]
-         
-        return df
\ No newline at end of file
+        snapshot = self.snapshot()
+        if snapshot is not None:
+            return snapshot.get_applicant(applicant_codigo)
+        return self._feature_store().get_applicant(applicant_codigo)
@@ -5,6 +5,7 @@ import sys
 # Adiciona o diretório pai ao path para permitir importações relativas
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from interface_adapters.data_store import normalize_key
 from interface_adapters.repositories import Repositories
 
 class GetProspectsUseCase:
@@ -14,6 +15,17 @@ class GetProspectsUseCase:
         """
         self.repositories = Repositories(data_path)
 
+    @staticmethod
+    def _codigos_como_chave(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Converte os códigos (int64 na silver) para a forma textual das chaves
+        usadas nas features e rankings, permitindo o merge com elas.
+        """
+        for coluna in ('vaga_codigo', 'codigo'):
+            if coluna in df.columns:
+                df[coluna] = df[coluna].map(normalize_key)
+        return df
+
     def get_prospects_vaga(self, vaga_codigo: str) -> pd.DataFrame:
         """
         Retorna um DataFrame do Pandas com os prospects para uma vaga específica,
@@ -25,22 +37,14 @@ class GetProspectsUseCase:
         Returns:
             Um DataFrame do Pandas com os prospects filtrados.
         """
-        # Carrega os DataFrames de vagas e prospects
-        df_vagas = self.repositories.load_vagas()
-        df_prospects = self.repositories.load_prospects()
-
-        # Filtra para encontrar a vaga selecionada pelo código
-        # Usar .get(0) com um default ou verificar se o dataframe não está vazio é mais seguro
-        vaga_selecionada_series = df_vagas[df_vagas["codigo"] == vaga_codigo]
+        # Busca a vaga selecionada pelo código no índice em memória
+        vaga_selecionada_series = self.repositories.get_vaga(vaga_codigo, columns=['codigo'])
         if vaga_selecionada_series.empty:
             # Retorna um DataFrame vazio se a vaga não for encontrada
             return pd.DataFrame()
             
         vaga_selecionada = vaga_selecionada_series.iloc[0]
 
-        # Filtra os prospects que aplicaram para a vaga selecionada
-        df_prospects_vaga = df_prospects[df_prospects["vaga_codigo"] == vaga_selecionada["codigo"]].copy()
-
         # Define a lista de colunas que devem ser retornadas
         df_prospects_columns = [
             'vaga_codigo',
@@ -50,6 +54,9 @@ class GetProspectsUseCase:
             'situacao_candidado'
         ]
 
+        # Busca os prospects que aplicaram para a vaga selecionada, lendo apenas as colunas necessárias
+        df_prospects_vaga = self.repositories.get_prospects_by_vaga(vaga_selecionada["codigo"], columns=df_prospects_columns)
+
         # Garante que todas as colunas existem no DataFrame antes de filtrar,
         # para evitar KeyErrors.
         cols_existentes = [col for col in df_prospects_columns if col in df_prospects_vaga.columns]
@@ -58,7 +65,7 @@ class GetProspectsUseCase:
         df_prospects_vaga_final = df_prospects_vaga[cols_existentes]
 
         # Retorna o DataFrame filtrado e com as colunas corretas
-        return df_prospects_vaga_final
+        return self._codigos_como_chave(df_prospects_vaga_final)
     
 
     def get_prospects_applicants(self, codigo_applicant: str) -> pd.DataFrame:
@@ -72,22 +79,14 @@ class GetProspectsUseCase:
         Returns:
             Um DataFrame do Pandas com os prospects filtrados.
         """
-        # Carrega os DataFrames de vagas e prospects
-        df_applicants = self.repositories.load_applicants()
-        df_prospects = self.repositories.load_prospects()
-
-        # Filtra para encontrar a vaga selecionada pelo código
-        # Usar .get(0) com um default ou verificar se o dataframe não está vazio é mais seguro
-        applicant_selecionado_series_series = df_applicants[df_applicants["codigo"] == codigo_applicant]
+        # Busca o aplicante selecionado pelo código no índice em memória
+        applicant_selecionado_series_series = self.repositories.get_applicant(codigo_applicant, columns=['codigo'])
         if applicant_selecionado_series_series.empty:
             # Retorna um DataFrame vazio se a vaga não for encontrada
             return pd.DataFrame()
             
         applicant_selecionado = applicant_selecionado_series_series.iloc[0]
 
-        # Filtra os prospects que aplicaram para a vaga selecionada
-        df_prospects_applicant = df_prospects[df_prospects["codigo"] == applicant_selecionado["codigo"]].copy()
-
         # Define a lista de colunas que devem ser retornadas
         df_prospects_columns = [
             'vaga_codigo',
@@ -98,6 +97,9 @@ class GetProspectsUseCase:
             'situacao_candidado'
         ]
 
+        # Busca as candidaturas do aplicante selecionado, lendo apenas as colunas necessárias
+        df_prospects_applicant = self.repositories.get_prospects_by_applicant(applicant_selecionado["codigo"], columns=df_prospects_columns)
+
         # Garante que todas as colunas existem no DataFrame antes de filtrar,
         # para evitar KeyErrors.
         cols_existentes = [col for col in df_prospects_columns if col in df_prospects_applicant.columns]
@@ -106,5 +108,5 @@ class GetProspectsUseCase:
         df_prospects_applicant_final = df_prospects_applicant[cols_existentes]
 
         # Retorna o DataFrame filtrado e com as colunas corretas
-        return df_prospects_applicant_final
+        return self._codigos_como_chave(df_prospects_applicant_final)
 
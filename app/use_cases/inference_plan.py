@@ -0,0 +1,245 @@
+import hashlib
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+def _sigmoid(x):
+    # Forma estável para valores negativos grandes
+    return np.exp(-np.logaddexp(0, -x))
+
+
+def _tanh(x):
+    return np.tanh(x, out=x)
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    'relu': _relu,
+    'sigmoid': _sigmoid,
+    'tanh': _tanh,
+    'linear': _linear,
+}
+
+# Derivada de cada ativação escrita em função da própria saída
+DERIVATIVES = {
+    'relu': lambda saida: (saida > 0).astype(saida.dtype),
+    'sigmoid': lambda saida: saida * (1 - saida),
+    'tanh': lambda saida: 1 - saida ** 2,
+    'linear': lambda saida: np.ones_like(saida),
+}
+
+# Limite de pontos (linhas x baselines x passos) avaliados de uma vez nas atribuições
+ATTRIBUTION_CHUNK_POINTS = 200_000
+
+
+class InferencePlan:
+    """
+    Plano de inferência compilado uma única vez, na carga do modelo.
+
+    Guarda o mapeamento coluna -> posição das features e os pesos das camadas
+    Dense com o StandardScaler incorporado à primeira camada:
+
+        ((x - media) / escala) @ W + b  ==  x @ (W / escala[:, None]) + (b - (media / escala) @ W)
+
+    Assim a entrada (DataFrame ou array) vai direto para a matriz de features e
+    dela para as probabilidades, sem cópias do DataFrame, sem laços de colunas
+    faltantes e sem a etapa separada do scaler.
+    """
+
+    def __init__(self, feature_columns: Sequence[str], weights: List[np.ndarray], biases: List[np.ndarray],
+                 activations: List[str], scaler_mean: np.ndarray, scaler_scale: np.ndarray):
+        """
+        Args:
+            feature_columns: Colunas de entrada na ordem do treino
+            weights: Matriz de pesos de cada camada Dense (entrada x saída)
+            biases: Bias de cada camada Dense
+            activations: Nome da ativação de cada camada
+            scaler_mean: Média do StandardScaler por feature
+            scaler_scale: Escala (desvio padrão) do StandardScaler por feature
+        """
+        desconhecidas = set(activations) - set(ACTIVATIONS)
+        if desconhecidas:
+            raise ValueError(f"Ativações não suportadas: {sorted(desconhecidas)}")
+
+        self.feature_columns = list(feature_columns)
+        self.column_index: Dict[str, int] = {col: i for i, col in enumerate(self.feature_columns)}
+
+        media = np.asarray(scaler_mean, dtype=np.float64)
+        escala = np.asarray(scaler_scale, dtype=np.float64)
+        primeira = np.asarray(weights[0], dtype=np.float64)
+
+        self.weights = [primeira / escala[:, None]] + [np.asarray(w, dtype=np.float64) for w in weights[1:]]
+        self.biases = [np.asarray(biases[0], dtype=np.float64) - (media / escala) @ primeira] + \
+                      [np.asarray(b, dtype=np.float64) for b in biases[1:]]
+        self.activation_names = list(activations)
+        self.activations = [ACTIVATIONS[nome] for nome in activations]
+        self.version = self._version(weights, biases, activations, media, escala)
+
+    def _version(self, weights, biases, activations, media, escala) -> str:
+        """Hash dos parâmetros do modelo: identifica a versão independentemente do runtime."""
+        h = hashlib.blake2b(digest_size=8)
+        h.update("\x00".join(self.feature_columns + list(activations)).encode("utf-8"))
+        for array in list(weights) + list(biases) + [media, escala]:
+            h.update(np.ascontiguousarray(array, dtype=np.float32).tobytes())
+        return h.hexdigest()
+
+    @classmethod
+    def from_keras(cls, model, scaler, feature_columns: Sequence[str]) -> "InferencePlan":
+        """Monta o plano a partir de um modelo Keras sequencial e do StandardScaler ajustado."""
+        pesos, bias, ativacoes = [], [], []
+        for camada in model.layers:
+            parametros = camada.get_weights()
+            if not parametros:
+                # Dropout (e camadas sem parâmetros) não atuam na inferência
+                continue
+            pesos.append(parametros[0])
+            bias.append(parametros[1])
+            ativacoes.append(camada.get_config()['activation'])
+
+        n_features = len(feature_columns)
+        media = getattr(scaler, 'mean_', None)
+        escala = getattr(scaler, 'scale_', None)
+        return cls(
+            feature_columns, pesos, bias, ativacoes,
+            np.zeros(n_features) if media is None else media,
+            np.ones(n_features) if escala is None else escala
+        )
+
+    def matrix(self, data: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        Matriz de features (linhas x features do treino) a partir da entrada.
+
+        DataFrames são lidos coluna a coluna direto para uma única matriz
+        pré-alocada (colunas ausentes ficam 0 e colunas extras são ignoradas).
+        Arrays são considerados já na ordem de `feature_columns`; arrays float32
+        (ex.: do snapshot de features mapeado em memória) são usados sem cópia.
+        """
+        if isinstance(data, pd.DataFrame):
+            X = np.zeros((len(data), len(self.feature_columns)), dtype=np.float64)
+            for coluna in data.columns:
+                posicao = self.column_index.get(coluna)
+                if posicao is not None:
+                    X[:, posicao] = data[coluna].to_numpy(dtype=np.float64)
+            return X
+
+        X = np.asarray(data)
+        if X.dtype != np.float32:
+            X = X.astype(np.float64, copy=False)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.feature_columns):
+            raise ValueError(f"Esperadas {len(self.feature_columns)} features, recebidas {X.shape[1]}")
+        return X
+
+    def forward(self, X: np.ndarray) -> np.ndarray:
+        """Saída da rede (probabilidade da classe 1) para uma matriz de features brutas."""
+        saida = X
+        for pesos, bias, ativacao in zip(self.weights, self.biases, self.activations):
+            saida = ativacao(saida @ pesos + bias)
+        return saida.ravel()
+
+    def predict_match(self, data: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """Probabilidade de match (1 - saída da rede, como no MatchPredictor)."""
+        return 1 - self.forward(self.matrix(data))
+
+    def gradients(self, X: np.ndarray) -> np.ndarray:
+        """Gradiente da saída da rede em relação a cada feature bruta (linhas x features)."""
+        saidas = [X]
+        for pesos, bias, ativacao in zip(self.weights, self.biases, self.activations):
+            saidas.append(ativacao(saidas[-1] @ pesos + bias))
+
+        gradiente = np.ones((len(X), 1), dtype=np.float64)
+        for camada in range(len(self.weights) - 1, -1, -1):
+            gradiente = gradiente * DERIVATIVES[self.activation_names[camada]](saidas[camada + 1])
+            gradiente = gradiente @ self.weights[camada].T
+        return gradiente
+
+    def integrated_gradients(self, X: np.ndarray, baselines: np.ndarray, steps: int = 16) -> np.ndarray:
+        """
+        Atribuição de cada feature à saída da rede por gradientes integrados,
+        em média sobre as baselines (expected gradients, a mesma ideia do
+        GradientExplainer do SHAP, mas com a integral calculada por pontos
+        médios em vez de amostragem aleatória).
+
+        A soma das atribuições de uma linha é `forward(x) - média(forward(baselines))`
+        (a menos do erro da integração numérica).
+
+        Args:
+            X: Matriz de features brutas (linhas x features)
+            baselines: Linhas de referência, também em features brutas
+            steps: Pontos da integral entre cada baseline e a linha
+
+        Returns:
+            Matriz de atribuições (linhas x features)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        baselines = np.atleast_2d(np.asarray(baselines, dtype=np.float64))
+        alphas = (np.arange(steps) + 0.5) / steps
+        n_baselines, n_features = baselines.shape
+        linhas_por_bloco = max(1, ATTRIBUTION_CHUNK_POINTS // (n_baselines * steps))
+
+        atribuicoes = np.empty_like(X)
+        for inicio in range(0, len(X), linhas_por_bloco):
+            bloco = X[inicio:inicio + linhas_por_bloco]
+            diferenca = bloco[:, None, :] - baselines[None, :, :]
+            pontos = baselines[None, :, None, :] + alphas[None, None, :, None] * diferenca[:, :, None, :]
+            gradientes = self.gradients(pontos.reshape(-1, n_features))
+            gradiente_medio = gradientes.reshape(len(bloco), n_baselines, steps, n_features).mean(axis=2)
+            atribuicoes[inicio:inicio + len(bloco)] = (diferenca * gradiente_medio).mean(axis=1)
+        return atribuicoes
+
+    def deeplift(self, X: np.ndarray, baselines: np.ndarray) -> np.ndarray:
+        """
+        Atribuição de cada feature pela regra Rescale do DeepLIFT, em média
+        sobre as baselines (a mesma construção do DeepExplainer do SHAP).
+
+        Cada ativação é substituída pela razão Δsaída / Δentrada entre a linha
+        e a baseline, e essas razões são propagadas para trás como um gradiente:
+        um único forward/backward por par (linha, baseline), com
+        `soma das atribuições == forward(x) - média(forward(baselines))` exata.
+
+        Args:
+            X: Matriz de features brutas (linhas x features)
+            baselines: Linhas de referência, também em features brutas
+
+        Returns:
+            Matriz de atribuições (linhas x features)
+        """
+        X = np.asarray(X, dtype=np.float64)
+        baselines = np.atleast_2d(np.asarray(baselines, dtype=np.float64))
+        n_baselines, n_features = baselines.shape
+        linhas_por_bloco = max(1, ATTRIBUTION_CHUNK_POINTS // n_baselines)
+
+        atribuicoes = np.empty_like(X)
+        for inicio in range(0, len(X), linhas_por_bloco):
+            bloco = X[inicio:inicio + linhas_por_bloco]
+            entrada_x = np.repeat(bloco, n_baselines, axis=0)
+            entrada_b = np.tile(baselines, (len(bloco), 1))
+
+            multiplicadores = []
+            saida_x, saida_b = entrada_x, entrada_b
+            for pesos, bias, ativacao, nome in zip(self.weights, self.biases, self.activations, self.activation_names):
+                z_x, z_b = saida_x @ pesos + bias, saida_b @ pesos + bias
+                saida_x, saida_b = ativacao(z_x.copy()), ativacao(z_b.copy())
+                delta_z = z_x - z_b
+                # Sem variação na entrada da ativação usa a derivada no ponto
+                estavel = np.abs(delta_z) > 1e-7
+                multiplicador = DERIVATIVES[nome](saida_x)
+                np.divide(saida_x - saida_b, delta_z, out=multiplicador, where=estavel)
+                multiplicadores.append(multiplicador)
+
+            gradiente = np.ones((len(entrada_x), 1), dtype=np.float64)
+            for camada in range(len(self.weights) - 1, -1, -1):
+                gradiente = (gradiente * multiplicadores[camada]) @ self.weights[camada].T
+            contribuicoes = (entrada_x - entrada_b) * gradiente
+            atribuicoes[inicio:inicio + len(bloco)] = contribuicoes.reshape(len(bloco), n_baselines, n_features).mean(axis=1)
+        return atribuicoes
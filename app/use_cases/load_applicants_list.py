@@ -14,6 +14,6 @@ class LoadApplicantsListUseCase:
         return self.repositories.load_applicants()
 
     def load_applicants_list(self):
-        df_applicants = self.load_applicants()
+        df_applicants = self.repositories.load_applicants(columns=["codigo", "infos_basicas.nome"])
         df_applicants["nome"] = df_applicants["codigo"].astype(str) + " - " + df_applicants["infos_basicas.nome"]
         return df_applicants[["nome", "codigo"]]
@@ -14,6 +14,6 @@ class LoadVagasListUseCase:
         return self.repositories.load_vagas()
 
     def load_vagas_list(self):
-        df_vagas = self.load_vagas()
-        df_vagas["titulo"] = df_vagas["codigo"].astype(str) + " - " + df_vagas["informacoes_basicas.titulo_vaga"]
+        df_vagas = self.repositories.load_vagas(columns=["codigo", "informacoes_basicas.titulo_vaga"])
+        df_vagas["titulo"] = df_vagas["codigo"].astype(str) + " - " + df_vagas["informacoes_basicas.titulo_vaga"].astype(str)
         return df_vagas[["titulo", "codigo"]]
@@ -2,25 +2,36 @@ import pandas as pd
 import numpy as np
 import pickle
 import joblib
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score, classification_report
-from imblearn.over_sampling import SMOTE
-from sklearn.preprocessing import StandardScaler
-import tensorflow as tf
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import Dense, Dropout
-from tensorflow.keras.callbacks import EarlyStopping
-import shap
 import os
+import sys
+import threading
 
+# TensorFlow, SHAP, scikit-learn e imbalanced-learn são importados apenas nos
+# métodos que os usam (treino, carga do .h5, exportação e SHAP): importar este
+# módulo — e as páginas que dependem dele — não carrega essas bibliotecas.
 
-class MatchPredictor:
-    def __init__(self):
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.storage import DEFAULT_STORAGE
+from use_cases.inference_plan import ACTIVATIONS, InferencePlan
+from use_cases.numpy_predictor import NUMPY_EXPORT_VERSION, PlanExplanations
+
+
+class MatchPredictor(PlanExplanations):
+    def __init__(self, explanation_cache_path="app/data/cache"):
         self.model = None
         self.scaler = None
         self.feature_columns = None
+        self.plan = None  # InferencePlan (scaler incorporado à primeira camada)
         self.background_data = {}  # Dados gerados durante treinamento/inferência
         self.is_trained = False
+        # Explainer SHAP e caches de explicações (ver PlanExplanations): um por modelo carregado
+        self.explanation_cache_path = explanation_cache_path
+        self._explainer = None
+        self._reset_explanation_caches()
+        # O predictor é compartilhado entre sessões (ModelRegistry): as estatísticas
+        # de importância são atualizadas por várias threads
+        self._importance_lock = threading.Lock()
     
     def _initialize_background_data(self):
         """Inicializa estrutura do background_data"""
@@ -102,6 +113,15 @@ class MatchPredictor:
             self.background_data['prediction_history'].pop(0)
     
     def train_model(self, df_path):
+        import shap
+        from imblearn.over_sampling import SMOTE
+        from sklearn.metrics import accuracy_score, classification_report
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        from tensorflow.keras.callbacks import EarlyStopping
+        from tensorflow.keras.layers import Dense, Dropout
+        from tensorflow.keras.models import Sequential
+
         self._initialize_background_data()
         
         df_final_total = pd.read_parquet(df_path)
@@ -174,6 +194,8 @@ class MatchPredictor:
         print("Relatório de Classificação:")
         print(classification_report(y_test, y_pred))
         
+        self.plan = InferencePlan.from_keras(self.model, self.scaler, self.feature_columns)
+        self._reset_explanations()
         self.is_trained = True
         return accuracy
     
@@ -198,6 +220,8 @@ class MatchPredictor:
 
     def load_model(self, model_path="app/model/match_model.h5", scaler_path="app/model/scaler.pkl", 
                    features_path="app/model/features.pkl", background_path="app/model/background_data.pkl"):
+        from tensorflow.keras.models import load_model
+
         self.model = load_model(model_path)
         self.scaler = joblib.load(scaler_path)
         self.feature_columns = joblib.load(features_path)
@@ -209,13 +233,139 @@ class MatchPredictor:
             print("⚠️ Arquivo de background data não encontrado. Inicializando estrutura vazia.")
             self._initialize_background_data()
         
+        self.plan = InferencePlan.from_keras(self.model, self.scaler, self.feature_columns)
+        self._reset_explanations()
         self.is_trained = True
         print("Modelo carregado com sucesso!")
 
+    @property
+    def model_version(self):
+        """Versão do modelo carregado (hash dos pesos, do scaler e das features)."""
+        return self.plan.version if self.plan is not None else None
+
+    def export_numpy(self, path="app/model/match_model.npz"):
+        """
+        Exporta o modelo para o runtime em NumPy (`NumpyMatchPredictor`).
+
+        Grava, em um único arquivo .npz, os pesos e bias de cada camada Dense, as
+        ativações, a média e a escala do StandardScaler, a lista de features e a
+        amostra de background (em features brutas, para as explicações). As
+        camadas Dropout são descartadas, pois não atuam na inferência.
+        """
+        from tensorflow.keras.layers import Dense, Dropout
+
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ou carregado!")
+
+        arrays = {}
+        ativacoes = []
+        for camada in self.model.layers:
+            if isinstance(camada, Dropout):
+                continue
+            if not isinstance(camada, Dense):
+                raise ValueError(f"Camada não suportada na exportação: {camada.__class__.__name__}")
+            ativacao = camada.get_config()['activation']
+            if ativacao not in ACTIVATIONS:
+                raise ValueError(f"Ativação não suportada na exportação: {ativacao}")
+            pesos, bias = camada.get_weights()
+            arrays[f'W{len(ativacoes)}'] = pesos
+            arrays[f'b{len(ativacoes)}'] = bias
+            ativacoes.append(ativacao)
+
+        n_features = len(self.feature_columns)
+        media = getattr(self.scaler, 'mean_', None)
+        escala = getattr(self.scaler, 'scale_', None)
+        try:
+            arrays['background_sample'] = self._background_sample()
+        except ValueError:
+            print("⚠️ Amostra de background não encontrada: o modelo exportado não gera explicações.")
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            format_version=np.array(NUMPY_EXPORT_VERSION),
+            activations=np.array(ativacoes),
+            feature_columns=np.array(self.feature_columns),
+            scaler_mean=np.zeros(n_features) if media is None else np.asarray(media, dtype=np.float64),
+            scaler_scale=np.ones(n_features) if escala is None else np.asarray(escala, dtype=np.float64),
+            **arrays
+        )
+        print(f"Modelo exportado para NumPy em: {path}")
+
+    def _reset_explanations(self):
+        """Descarta o explainer e os caches do modelo anterior (chamado ao treinar/carregar)."""
+        self._explainer = None
+        self._reset_explanation_caches()
+
+    def _get_explainer(self):
+        """GradientExplainer do modelo carregado, construído na primeira explicação."""
+        if self._explainer is None:
+            import shap
+
+            shap_background_sample = self.background_data.get('shap_background_sample')
+            if shap_background_sample is None:
+                raise ValueError("Amostra de background para SHAP não encontrada. O modelo foi treinado corretamente?")
+            self._explainer = shap.GradientExplainer(self.model, shap_background_sample)
+        return self._explainer
+
+    def _scale(self, X):
+        media = getattr(self.scaler, 'mean_', None)
+        escala = getattr(self.scaler, 'scale_', None)
+        X = X if media is None else X - media
+        return X if escala is None else X / escala
+
+    def _update_feature_importance(self, shap_values):
+        """
+        Acumula |SHAP| de todas as linhas já explicadas e atualiza a importância
+        global (média) no background_data, em vez de refazê-la a cada lote.
+        """
+        contribuicao = np.abs(shap_values).sum(axis=0)
+        with self._importance_lock:
+            acumulado = self.background_data.get('feature_importance_stats')
+            if not acumulado or len(acumulado['soma']) != len(self.feature_columns):
+                acumulado = {'soma': np.zeros(len(self.feature_columns)), 'n': 0}
+            acumulado = {'soma': acumulado['soma'] + contribuicao, 'n': acumulado['n'] + len(shap_values)}
+            self.background_data['feature_importance_stats'] = acumulado
+            media = pd.Series(acumulado['soma'] / acumulado['n'], index=self.feature_columns)
+            self.background_data['feature_importance'] = media.sort_values(ascending=False).to_dict()
+
+    def shap_values(self, df_candidates, X=None):
+        """
+        Valores SHAP (linhas x features) de um lote de candidatos, explicados
+        juntos em uma única chamada ao explainer.
+
+        É a referência das explicações em NumPy (ver `benchmark_explanations`);
+        a página de ranking e o pré-cálculo do RankingTableJob usam
+        `explain_batch_numpy` / `attributions`, que têm cache.
+
+        Parâmetros:
+        -----------
+        df_candidates : pd.DataFrame
+            Linhas de features.
+        X : np.ndarray, opcional
+            Matriz de features já montada para `df_candidates`.
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ou carregado!")
+        if X is None:
+            X = self.plan.matrix(df_candidates)
+        if not len(X):
+            return np.zeros(X.shape, dtype=np.float64)
+
+        valores = self._get_explainer().shap_values(self._scale(X))
+        if isinstance(valores, list):
+            valores = valores[0]
+        valores = np.asarray(valores, dtype=np.float64).reshape(len(X), -1)
+        self._update_feature_importance(valores)
+        return valores
+
     def explain_batch_with_shap(self, df_candidates, top_n=3):
         """
         Gera explicações SHAP para um lote de candidatos usando GradientExplainer.
 
+        O explainer é construído uma vez por modelo carregado e o lote inteiro
+        é explicado de uma vez (ver `shap_values`).
+
         Parâmetros:
         -----------
         df_candidates : pd.DataFrame
@@ -233,72 +383,29 @@ class MatchPredictor:
         """
         if not self.is_trained:
             raise ValueError("Modelo não foi treinado ou carregado!")
-        
-        shap_background_sample = self.background_data.get('shap_background_sample')
-        if shap_background_sample is None:
+        X = self.plan.matrix(df_candidates)
+        valores = self.shap_values(df_candidates, X)
+        return self._explanation_frame(df_candidates, X, valores, top_n)
+
+    def _background_sample(self):
+        """Amostra de background do SHAP em features brutas (a amostra salva está escalonada)."""
+        amostra = self.background_data.get('shap_background_sample')
+        if amostra is None:
             raise ValueError("Amostra de background para SHAP não encontrada. O modelo foi treinado corretamente?")
-
-        df_input = df_candidates.copy()
-        for col in self.feature_columns:
-            if col not in df_input.columns:
-                df_input[col] = 0
-        df_input = df_input[self.feature_columns]
-
-        X_scaled = self.scaler.transform(df_input)
-
-        explainer = shap.GradientExplainer(self.model, shap_background_sample)
-        shap_values = explainer.shap_values(X_scaled)
-
-        if isinstance(shap_values, list):
-            shap_values = shap_values[0]
-
-        explanations = []
-        for idx in range(len(df_input)):
-            shap_row = shap_values[idx].flatten()
-            shap_series = pd.Series(shap_row, index=self.feature_columns)
-            
-            top_positive = shap_series[shap_series > 0].sort_values(ascending=False).head(top_n)
-            
-            top_negative = shap_series[shap_series < 0].sort_values(ascending=True).head(top_n)
-
-            combined_series = pd.concat([top_positive, top_negative])
-
-            for feature, shap_val in combined_series.items():
-                explanations.append({
-                    'codigo': df_candidates.iloc[idx].get('codigo', f'instancia_{idx}'),
-                    'feature': feature,
-                    'shap_value': shap_val,
-                    'valor_original': df_input.loc[df_input.index[idx], feature]
-                })
-
-        df_explanations = pd.DataFrame(explanations)
-        
-        squeezed_shap_values = np.squeeze(shap_values)
-
-        if squeezed_shap_values.ndim == 1:
-            data_for_df = squeezed_shap_values.reshape(1, -1)
-        else:
-            data_for_df = squeezed_shap_values
-
-        self.background_data['feature_importance'] = pd.DataFrame(
-            data_for_df, columns=self.feature_columns
-        ).abs().mean().sort_values(ascending=False).to_dict()
-
-        return df_explanations
+        amostra = np.asarray(amostra, dtype=np.float64)
+        media = getattr(self.scaler, 'mean_', None)
+        escala = getattr(self.scaler, 'scale_', None)
+        amostra = amostra if escala is None else amostra * escala
+        return amostra if media is None else amostra + media
 
     def predict_match(self, input_data):
         if not self.is_trained: raise ValueError("Modelo não foi treinado ou carregado!")
-        if isinstance(input_data, dict): df_input = pd.DataFrame([input_data])
-        elif isinstance(input_data, pd.DataFrame): df_input = input_data.copy()
-        else: raise ValueError("input_data deve ser um dict ou DataFrame")
-        for col in self.feature_columns:
-            if col not in df_input.columns: df_input[col] = 0
-        df_input = df_input[self.feature_columns]
-        X_scaled = self.scaler.transform(df_input)
-        probabilidades = self.model.predict(X_scaled)
-        prob_match = 1 - probabilidades.flatten()
+        if isinstance(input_data, dict): input_data = pd.DataFrame([input_data])
+        elif not isinstance(input_data, (pd.DataFrame, np.ndarray)): raise ValueError("input_data deve ser um dict, DataFrame ou array")
+        X = self.plan.matrix(input_data)
+        prob_match = 1 - self.plan.forward(X)
         result = prob_match[0] if len(prob_match) == 1 else prob_match
-        self._update_prediction_history(df_input, result, result)
+        self._update_prediction_history(X, result, result)
         return result
 
     def create_ranking(self, df_candidates, parameters=False):
@@ -313,17 +420,23 @@ class MatchPredictor:
 
     def predict_batch(self, input_data):
         if not self.is_trained: raise ValueError("Modelo não foi treinado ou carregado!")
-        if isinstance(input_data, pd.DataFrame): df_input = input_data.copy()
-        else: raise ValueError("input_data deve ser um DataFrame")
-        for col in self.feature_columns:
-            if col not in df_input.columns: df_input[col] = 0
-        df_input = df_input[self.feature_columns]
-        X_scaled = self.scaler.transform(df_input)
-        probabilidades = self.model.predict(X_scaled)
-        prob_match = 1 - probabilidades.flatten()
-        self._update_prediction_history(df_input, prob_match.tolist(), np.mean(prob_match))
+        if not isinstance(input_data, (pd.DataFrame, np.ndarray)): raise ValueError("input_data deve ser um DataFrame ou array")
+        X = self.plan.matrix(input_data)
+        prob_match = 1 - self.plan.forward(X)
+        self._update_prediction_history(X, prob_match.tolist(), np.mean(prob_match))
         return prob_match
         
+    def predict_snapshot(self, snapshot, rows=None):
+        """
+        Probabilidades de match direto do snapshot memory-mapped de features
+        (ver interface_adapters/feature_snapshot), sem passar por DataFrame.
+
+        Args:
+            snapshot: FeatureSnapshot aberto
+            rows: Fatia ou posições das linhas (padrão: todas), ex.: `snapshot.vaga_rows(codigo)`
+        """
+        return self.predict_batch(snapshot.feature_matrix(self.feature_columns, rows))
+
     def get_background_data(self, section=None):
         if section: return self.background_data.get(section, {})
         return self.background_data
@@ -353,6 +466,82 @@ class MatchPredictor:
         return insights
 
 
+def benchmark_explanations(predictor, df_candidates, n_rows=200, top_n=3):
+    """
+    Compara latência e fidelidade do backend NumPy (DeepLIFT e gradientes
+    integrados) com o caminho SHAP (GradientExplainer) para as mesmas linhas.
+
+    Fidelidade por linha: correlação entre os vetores de atribuição e
+    fração das top-n features (por |valor|) em comum.
+    """
+    import time
+
+    # Sem codigo/id_vaga: mede o cálculo real, sem passar pelo cache de explicações
+    df = df_candidates.drop(columns=['codigo', 'id_vaga'], errors='ignore').head(n_rows)
+    X = predictor.plan.matrix(df)
+
+    inicio = time.perf_counter()
+    referencia = predictor.shap_values(df, X)
+    predictor._explanation_frame(df, X, referencia, top_n)
+    tempos = {'shap': time.perf_counter() - inicio}
+
+    configuracoes = [(metodo, baseline) for metodo in ('deeplift', 'ig') for baseline in ('sample', 'mean')]
+    resultado = {'shap': {'ms': tempos['shap'] * 1000}}
+    for metodo, baseline in configuracoes:
+        baselines = predictor._numpy_baselines(baseline)
+        inicio = time.perf_counter()
+        if metodo == 'deeplift':
+            valores = predictor.plan.deeplift(X, baselines)
+        else:
+            valores = predictor.plan.integrated_gradients(X, baselines)
+        predictor._explanation_frame(df, X, valores, top_n)
+        tempo = time.perf_counter() - inicio
+
+        correlacoes = [np.corrcoef(a, b)[0, 1] for a, b in zip(referencia, valores)
+                       if a.std() > 0 and b.std() > 0]
+        top_ref = np.argsort(-np.abs(referencia), axis=1)[:, :top_n]
+        top_np = np.argsort(-np.abs(valores), axis=1)[:, :top_n]
+        resultado[f"{metodo}/{baseline}"] = {
+            'ms': tempo * 1000,
+            'correlacao_media': float(np.mean(correlacoes)) if correlacoes else float('nan'),
+            'top_n_em_comum': float(np.mean([len(set(a) & set(b)) / top_n for a, b in zip(top_ref, top_np)])),
+        }
+
+    print(f"Explicação de {len(df)} linhas:")
+    print(f"  SHAP (GradientExplainer): {resultado['shap']['ms']:.1f} ms")
+    for chave, metricas in resultado.items():
+        if chave == 'shap':
+            continue
+        print(f"  NumPy {chave}: {metricas['ms']:.1f} ms | "
+              f"correlação média {metricas['correlacao_media']:.3f} | "
+              f"top-{top_n} em comum {metricas['top_n_em_comum']:.0%}")
+    return resultado
+
+def export_numpy_model(model_dir="app/model", path=None):
+    """
+    Exporta os artefatos Keras salvos em `model_dir` (modelo, scaler, features
+    e background data) para o .npz lido pelo `NumpyMatchPredictor`.
+
+    O treino (este módulo como script) já exporta ao final; para um modelo
+    treinado antes disso, ou após substituir os artefatos manualmente, rode:
+
+        python app/use_cases/numpy_predictor.py --export
+
+    Returns:
+        Caminho do arquivo gerado
+    """
+    path = path or os.path.join(model_dir, "match_model.npz")
+    predictor = MatchPredictor()
+    predictor.load_model(
+        os.path.join(model_dir, "match_model.h5"),
+        os.path.join(model_dir, "scaler.pkl"),
+        os.path.join(model_dir, "features.pkl"),
+        os.path.join(model_dir, "background_data.pkl"),
+    )
+    predictor.export_numpy(path)
+    return path
+
+
 if __name__ == "__main__":
     # --- Configuração de Caminhos ---
     DATA_PATH = "app/data/silver/df_features_train.parquet"
@@ -375,7 +564,7 @@ if __name__ == "__main__":
         data['id_vaga'] = np.random.randint(1000, 2000, num_samples)
         data['codigo'] = [f'cand_{i}' for i in range(num_samples)]
         df_dummy = pd.DataFrame(data)
-        df_dummy.to_parquet(DATA_PATH)
+        DEFAULT_STORAGE.write(df_dummy, DATA_PATH)
         print("Arquivo de dados de exemplo criado.")
 
     # --- Etapa 1: Treinamento e Salvamento do Modelo ---
@@ -385,6 +574,7 @@ if __name__ == "__main__":
     print(f"\n✅ Treinamento concluído! Acurácia no conjunto de teste: {accuracy:.4f}")
     print("\n💾 Salvando o modelo e artefatos...")
     predictor_train.save_model(MODEL_PATH, SCALER_PATH, FEATURES_PATH, BACKGROUND_PATH)
+    predictor_train.export_numpy(os.path.join(MODEL_DIR, "match_model.npz"))
 
     print("\n" + "="*50 + "\n")
 
@@ -423,3 +613,7 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"❌ Ocorreu um erro ao gerar as explicações SHAP: {e}")
 
+    # --- Etapa 4: Backend NumPy (gradientes integrados) x SHAP ---
+    print("\n⏱️ Comparando os backends de explicação...")
+    benchmark_explanations(predictor_load, df_all_candidates)
+
@@ -0,0 +1,114 @@
+import os
+import sys
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from use_cases.match_predictor import MatchPredictor
+from use_cases.numpy_predictor import NumpyMatchPredictor
+from use_cases.scoring_service import ScoringService
+
+
+class ModelRegistry:
+    """
+    Registro do modelo compartilhado pelo processo inteiro.
+
+    Os artefatos são carregados uma única vez e a mesma instância do predictor
+    é usada por todas as sessões e reruns do Streamlit. O runtime NumPy
+    (`NumpyMatchPredictor`, lido de match_model.npz) é o padrão, sem importar
+    TensorFlow; o `MatchPredictor` (Keras) só é carregado quando o .npz não
+    existe ou é mais antigo que os artefatos Keras — e nesse caso o .npz é
+    exportado, para que as próximas cargas já usem o runtime NumPy.
+
+    A cada acesso apenas os mtimes dos arquivos são conferidos: se algum
+    artefato mudar no disco o modelo é recarregado e substituído de forma
+    atômica (quem já tem a instância antiga continua usando-a até terminar).
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, model_dir: str = "app/model"):
+        self.paths: Dict[str, str] = {
+            'model_path': os.path.join(model_dir, "match_model.h5"),
+            'scaler_path': os.path.join(model_dir, "scaler.pkl"),
+            'features_path': os.path.join(model_dir, "features.pkl"),
+            'background_path': os.path.join(model_dir, "background_data.pkl"),
+        }
+        self.numpy_path = os.path.join(model_dir, "match_model.npz")
+        self._lock = threading.Lock()
+        self._assinatura: Optional[Tuple] = None
+        self._predictor: Optional[Union[NumpyMatchPredictor, MatchPredictor]] = None
+        self._service: Optional[ScoringService] = None
+
+    @classmethod
+    def instance(cls) -> "ModelRegistry":
+        """Retorna a instância única (singleton) do processo."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def _assinatura_atual(self) -> Tuple:
+        """mtime de cada artefato, incluindo o .npz (None para arquivos ausentes)."""
+        return tuple(
+            os.path.getmtime(caminho) if os.path.exists(caminho) else None
+            for caminho in list(self.paths.values()) + [self.numpy_path]
+        )
+
+    def _numpy_atualizado(self) -> bool:
+        """Indica se o .npz existe e foi exportado depois dos artefatos Keras."""
+        if not os.path.exists(self.numpy_path):
+            return False
+        exportado_em = os.path.getmtime(self.numpy_path)
+        return all(
+            exportado_em >= os.path.getmtime(caminho)
+            for caminho in self.paths.values() if os.path.exists(caminho)
+        )
+
+    def _carregar(self) -> Union[NumpyMatchPredictor, MatchPredictor]:
+        if self._numpy_atualizado():
+            predictor = NumpyMatchPredictor()
+            predictor.load_model(self.numpy_path)
+            return predictor
+
+        predictor = MatchPredictor()
+        predictor.load_model(**self.paths)
+        try:
+            predictor.export_numpy(self.numpy_path)
+        except Exception as erro:
+            print(f"⚠️ Não foi possível exportar o modelo para NumPy: {erro}")
+        return predictor
+
+    def _atualizar(self):
+        assinatura = self._assinatura_atual()
+        if assinatura == self._assinatura and self._predictor is not None:
+            return
+        with self._lock:
+            assinatura = self._assinatura_atual()
+            if assinatura == self._assinatura and self._predictor is not None:
+                return
+            predictor = self._carregar()
+            # A exportação do .npz muda a assinatura: usa a de depois da carga
+            assinatura = self._assinatura_atual()
+            servico_antigo = self._service
+            self._predictor = predictor
+            self._service = ScoringService(predictor).start()
+            self._assinatura = assinatura
+            if servico_antigo is not None:
+                # Quem ainda tem o serviço antigo (ex.: uma página no meio de um
+                # rerun) passa a ser atendido pelo novo, sem reiniciar o antigo
+                servico_antigo.stop(successor=self._service)
+            print("Modelo (re)carregado no registro.")
+
+    def get_predictor(self) -> Union[NumpyMatchPredictor, MatchPredictor]:
+        """Predictor atual, recarregado apenas se os artefatos mudaram."""
+        self._atualizar()
+        return self._predictor
+
+    def get_scoring_service(self) -> ScoringService:
+        """Serviço de micro-lotes ligado ao predictor atual."""
+        self._atualizar()
+        return self._service
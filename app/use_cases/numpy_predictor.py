@@ -0,0 +1,276 @@
+import abc
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.explanation_cache import ExplanationCache, row_hashes
+from use_cases.inference_plan import InferencePlan
+
+# Versão do formato do .npz gerado por MatchPredictor.export_numpy
+NUMPY_EXPORT_VERSION = "1"
+
+# Configuração das explicações exibidas pela página de ranking e pré-calculadas
+# pelo RankingTableJob (--explain): DeepLIFT sobre a amostra de background
+EXPLAIN_METHOD = 'deeplift'
+EXPLAIN_BASELINE = 'sample'
+EXPLAIN_STEPS = 16
+
+
+class PlanExplanations(abc.ABC):
+    """
+    Explicações calculadas em NumPy sobre o `InferencePlan` (DeepLIFT ou
+    gradientes integrados), sem TensorFlow nem SHAP, com cache por par
+    (codigo, id_vaga). Compartilhadas pelo `MatchPredictor` e pelo
+    `NumpyMatchPredictor`, que fornecem `plan`, `model_version`,
+    `explanation_cache_path` e implementam `_background_sample`.
+    """
+
+    def _reset_explanation_caches(self):
+        """Descarta os caches de explicação do modelo anterior (chamado ao treinar/carregar)."""
+        self._explanation_caches = {}
+
+    def _explanation_cache(self, method: str, baseline: str, steps: int) -> ExplanationCache:
+        """Cache da configuração de explicação informada, para a versão atual do modelo."""
+        nome = f"{method}-{baseline}" + (f"-{steps}" if method == 'ig' else "")
+        if nome not in self._explanation_caches:
+            self._explanation_caches[nome] = ExplanationCache(
+                self.model_version, self.explanation_cache_path, method=nome
+            )
+        return self._explanation_caches[nome]
+
+    @property
+    def explanation_cache(self) -> ExplanationCache:
+        """Cache da configuração padrão (a lida pela página e gravada pelo RankingTableJob)."""
+        return self._explanation_cache(EXPLAIN_METHOD, EXPLAIN_BASELINE, EXPLAIN_STEPS)
+
+    @abc.abstractmethod
+    def _background_sample(self) -> np.ndarray:
+        """Amostra de background em features brutas (linhas x features)."""
+
+    def _numpy_baselines(self, baseline):
+        """Baselines das atribuições: a amostra de background inteira ou a média dela."""
+        amostra = self._background_sample()
+        if baseline == 'mean':
+            return amostra.mean(axis=0, keepdims=True)
+        if baseline != 'sample':
+            raise ValueError("baseline deve ser 'sample' ou 'mean'")
+        return amostra
+
+    def attributions(self, df_candidates, X=None, method=EXPLAIN_METHOD, baseline=EXPLAIN_BASELINE,
+                     steps=EXPLAIN_STEPS):
+        """
+        Atribuições (linhas x features) da saída da rede para um lote de candidatos.
+
+        Os pares (codigo, id_vaga) já explicados com as mesmas features e a
+        mesma configuração vêm do cache; os demais são calculados juntos e
+        guardados no cache.
+
+        Parâmetros:
+        -----------
+        df_candidates : pd.DataFrame
+            Linhas de features (com 'codigo' e 'id_vaga' para usar o cache).
+        X : np.ndarray, opcional
+            Matriz de features já montada para `df_candidates`.
+        method, baseline, steps :
+            Ver `explain_batch_numpy`.
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ou carregado!")
+        if method not in ('deeplift', 'ig'):
+            raise ValueError("method deve ser 'deeplift' ou 'ig'")
+        if X is None:
+            X = self.plan.matrix(df_candidates)
+
+        cache = self._explanation_cache(method, baseline, steps)
+        valores = np.zeros(X.shape, dtype=np.float64)
+        pendentes = np.arange(len(X))
+        usar_cache = {'codigo', 'id_vaga'} <= set(df_candidates.columns)
+        if usar_cache:
+            chaves = [ExplanationCache.key(c, v) for c, v in zip(df_candidates['codigo'], df_candidates['id_vaga'])]
+            hashes = row_hashes(X)
+            em_cache = cache.get_many(chaves, hashes)
+            for i, linha in enumerate(em_cache):
+                if linha is not None:
+                    valores[i] = linha
+            pendentes = np.array([i for i, linha in enumerate(em_cache) if linha is None], dtype=np.int64)
+
+        if len(pendentes):
+            baselines = self._numpy_baselines(baseline)
+            if method == 'deeplift':
+                calculados = self.plan.deeplift(X[pendentes], baselines)
+            else:
+                calculados = self.plan.integrated_gradients(X[pendentes], baselines, steps)
+            valores[pendentes] = calculados
+            if usar_cache:
+                cache.put_many([chaves[i] for i in pendentes], [hashes[i] for i in pendentes], calculados)
+        return valores
+
+    def explain_batch_numpy(self, df_candidates, top_n=3, method=EXPLAIN_METHOD, baseline=EXPLAIN_BASELINE,
+                            steps=EXPLAIN_STEPS):
+        """
+        Explicações calculadas em NumPy sobre o `InferencePlan`, sem TensorFlow
+        nem SHAP, para lotes de centenas de linhas em milissegundos.
+
+        Explica a mesma saída que o `explain_batch_with_shap` (a saída da rede),
+        usando como baselines a amostra de background do SHAP, e devolve o
+        mesmo DataFrame (codigo, feature, shap_value, valor_original). Os pares
+        pré-calculados pelo RankingTableJob (--explain) vêm do cache.
+
+        Parâmetros:
+        -----------
+        df_candidates : pd.DataFrame
+            DataFrame com os dados dos candidatos a serem explicados.
+        top_n : int
+            Número de features positivas e negativas retornadas por candidato.
+        method : str
+            'deeplift' (regra Rescale, um passo por baseline) ou 'ig'
+            (gradientes integrados com `steps` pontos por baseline).
+        baseline : str
+            'sample' usa todas as linhas da amostra de background (mais fiel ao
+            SHAP); 'mean' usa só a média delas (mais rápido).
+        steps : int
+            Pontos da integral no método 'ig'.
+        """
+        if not self.is_trained:
+            raise ValueError("Modelo não foi treinado ou carregado!")
+        X = self.plan.matrix(df_candidates)
+        valores = self.attributions(df_candidates, X, method, baseline, steps)
+        return self._explanation_frame(df_candidates, X, valores, top_n)
+
+    def _explanation_frame(self, df_candidates, X, valores, top_n):
+        """Top-n contribuições positivas e negativas de cada linha, no formato longo."""
+        # Top positivos (decrescente) seguidos dos top negativos (crescente) de cada linha
+        positivos = np.argsort(-valores, axis=1, kind='stable')[:, :top_n]
+        negativos = np.argsort(valores, axis=1, kind='stable')[:, :top_n]
+        features = np.hstack([positivos, negativos])
+        shap_sel = np.take_along_axis(valores, features, axis=1)
+        manter = np.hstack([shap_sel[:, :positivos.shape[1]] > 0, shap_sel[:, positivos.shape[1]:] < 0])
+
+        linhas = np.repeat(np.arange(len(X)), features.shape[1]).reshape(features.shape)[manter]
+        features = features[manter]
+        if 'codigo' in df_candidates.columns:
+            codigos = df_candidates['codigo'].to_numpy()
+        else:
+            codigos = np.array([f'instancia_{idx}' for idx in range(len(X))], dtype=object)
+
+        return pd.DataFrame({
+            'codigo': codigos[linhas],
+            'feature': np.asarray(self.feature_columns, dtype=object)[features],
+            'shap_value': shap_sel[manter],
+            'valor_original': X[linhas, features],
+        })
+
+
+class NumpyMatchPredictor(PlanExplanations):
+    """
+    Runtime de inferência do modelo de match em NumPy puro.
+
+    Lê o arquivo gerado por `MatchPredictor.export_numpy` (pesos das camadas
+    Dense, ativações, parâmetros do StandardScaler e lista de features) em um
+    `InferencePlan` e executa o forward pass como uma sequência de produtos
+    matriciais, sem importar TensorFlow, scikit-learn ou SHAP. Expõe a mesma
+    API de predição do `MatchPredictor` (`predict_batch`, `predict_match` e
+    `create_ranking`) e as explicações em NumPy (`explain_batch_numpy`).
+
+    O .npz é gerado ao final do treino; para exportar os artefatos Keras já
+    salvos em app/model, rode `python app/use_cases/numpy_predictor.py --export`.
+    """
+
+    def __init__(self, explanation_cache_path="app/data/cache"):
+        self.plan = None
+        self.feature_columns = None
+        self.background_sample = None  # Amostra de background em features brutas
+        self.is_trained = False
+        self.explanation_cache_path = explanation_cache_path
+        self._reset_explanation_caches()
+
+    def load_model(self, path="app/model/match_model.npz"):
+        with np.load(path, allow_pickle=False) as dados:
+            versao = str(dados['format_version'])
+            if versao != NUMPY_EXPORT_VERSION:
+                raise ValueError(f"Versão de exportação incompatível em {path}: {versao}")
+            ativacoes = [str(nome) for nome in dados['activations']]
+            self.plan = InferencePlan(
+                dados['feature_columns'].tolist(),
+                [dados[f'W{i}'] for i in range(len(ativacoes))],
+                [dados[f'b{i}'] for i in range(len(ativacoes))],
+                ativacoes,
+                dados['scaler_mean'],
+                dados['scaler_scale']
+            )
+            # Opcional: arquivos exportados sem a amostra não geram explicações
+            self.background_sample = dados['background_sample'] if 'background_sample' in dados.files else None
+        self.feature_columns = self.plan.feature_columns
+        self._reset_explanation_caches()
+        self.is_trained = True
+        print("Modelo NumPy carregado com sucesso!")
+
+    @property
+    def model_version(self):
+        """Versão do modelo carregado (hash dos pesos, do scaler e das features)."""
+        return self.plan.version if self.plan is not None else None
+
+    def _background_sample(self):
+        if self.background_sample is None:
+            raise ValueError("Amostra de background não encontrada no modelo exportado. Exporte-o novamente.")
+        return np.asarray(self.background_sample, dtype=np.float64)
+
+    def predict_batch(self, input_data):
+        if not self.is_trained: raise ValueError("Modelo não foi treinado ou carregado!")
+        if not isinstance(input_data, (pd.DataFrame, np.ndarray)): raise ValueError("input_data deve ser um DataFrame ou array")
+        return self.plan.predict_match(input_data)
+
+    def predict_snapshot(self, snapshot, rows=None):
+        """Probabilidades de match direto do snapshot memory-mapped de features (ver MatchPredictor)."""
+        return self.predict_batch(snapshot.feature_matrix(self.feature_columns, rows))
+
+    def predict_match(self, input_data):
+        if not self.is_trained: raise ValueError("Modelo não foi treinado ou carregado!")
+        if isinstance(input_data, dict): df_input = pd.DataFrame([input_data])
+        elif isinstance(input_data, pd.DataFrame): df_input = input_data
+        else: raise ValueError("input_data deve ser um dict ou DataFrame")
+        prob_match = self.plan.predict_match(df_input)
+        return prob_match[0] if len(prob_match) == 1 else prob_match
+
+    def create_ranking(self, df_candidates, parameters=False):
+        probs = self.predict_batch(df_candidates)
+        df_ranking = df_candidates.copy()
+        df_ranking['probabilidade_match'] = probs
+        df_ranking = df_ranking.sort_values('probabilidade_match', ascending=False)
+        if parameters: return df_ranking
+        else:
+            colunas_para_exibir = ['codigo', 'id_vaga', 'probabilidade_match']
+            return df_ranking[colunas_para_exibir]
+
+
+if __name__ == "__main__":
+    import time
+
+    # Exporta o modelo Keras salvo (requer TensorFlow) quando pedido ou quando o .npz não existe
+    caminho_modelo = "app/model/match_model.npz"
+    if '--export' in sys.argv or not os.path.exists(caminho_modelo):
+        from use_cases.match_predictor import export_numpy_model
+        export_numpy_model(path=caminho_modelo)
+
+    inicio = time.perf_counter()
+    predictor = NumpyMatchPredictor()
+    predictor.load_model(caminho_modelo)
+    print(f"Carga do modelo: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    df_features = pd.read_parquet("app/data/silver/df_features.parquet")
+    inicio = time.perf_counter()
+    probs = predictor.predict_batch(df_features)
+    print(f"Predição de {len(probs)} linhas: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    # Mesmo lote lido do snapshot memory-mapped, quando existir
+    from interface_adapters.feature_snapshot import FeatureSnapshot, snapshot_path
+    caminho_snapshot = snapshot_path("app/data/silver/df_features.parquet")
+    if FeatureSnapshot.read_meta(caminho_snapshot) is not None:
+        inicio = time.perf_counter()
+        snapshot = FeatureSnapshot(caminho_snapshot)
+        probs_snapshot = predictor.predict_snapshot(snapshot)
+        print(f"Predição de {len(probs_snapshot)} linhas pelo snapshot (incluindo abertura): "
+              f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
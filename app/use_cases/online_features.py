@@ -0,0 +1,127 @@
+import joblib
+import pandas as pd
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.data_store import DataStore, normalize_key
+from interface_adapters.repositories import Repositories
+from use_cases.featureengineering import CandidateFeatureEngineer
+from use_cases.pipeline import COLUNAS_VAGAS_FEATURES, COLUNAS_APPLICANTS_FEATURES
+
+
+class OnlineFeatureBuilder:
+    """
+    Gera as features do modelo para um par (aplicante, vaga) ou um lote pequeno
+    de pares, sem reprocessar a base inteira.
+
+    Usa as mesmas transformações do `CandidateFeatureEngineer`, mas apenas sobre
+    as linhas pedidas: vagas e aplicantes vêm das consultas indexadas do
+    DataStore, os CVs do cache persistente de tokens, os textos das vagas de um
+    cache em memória (invalidado quando a tabela de vagas muda) e os códigos
+    categóricos dos encoders salvos no treino. O resultado tem exatamente as
+    colunas que o `MatchPredictor` espera (`features.pkl`), mais `id_vaga` e
+    `codigo`.
+    """
+
+    def __init__(self, data_path="app/data/silver", features_path="app/model/features.pkl",
+                 encoders_path="app/model/encoders.pkl", engineer: Optional[CandidateFeatureEngineer] = None):
+        """
+        Args:
+            data_path: Diretório da camada silver
+            features_path: Lista de features do modelo (salva no treino)
+            encoders_path: Encoders categóricos ajustados na base de treino. Não
+                são versionados com o modelo: em um checkout novo, gere-os uma
+                vez com `python app/use_cases/featureengineering.py --encoders`
+                (`CandidateFeatureEngineer.fit_encoders`)
+            engineer: Instância do CandidateFeatureEngineer a reaproveitar (opcional)
+
+        Raises:
+            FileNotFoundError: Se os encoders ainda não foram gerados
+        """
+        if not os.path.exists(encoders_path):
+            raise FileNotFoundError(
+                f"Encoders não encontrados em {encoders_path}. Gere-os a partir da base de treino "
+                "(silver) com: python app/use_cases/featureengineering.py --encoders"
+            )
+        self.data_path = data_path
+        self.features_path = features_path
+        self.repositories = Repositories(data_path)
+        self.store = DataStore.instance()
+        self.engineer = engineer or CandidateFeatureEngineer(encoders_path=encoders_path)
+
+    def feature_columns(self) -> List[str]:
+        """Colunas de entrada do modelo, relidas apenas quando o arquivo muda."""
+        return self.store.get(self.features_path, joblib.load, name='feature_columns')
+
+    def _vagas_cache(self) -> Dict[str, Optional[Tuple[frozenset, int]]]:
+        """Palavras e total de caracteres por vaga, descartados quando vagas.parquet muda."""
+        return self.store.get(os.path.join(self.data_path, 'vagas.parquet'), lambda _: {}, name='vagas_token_sets')
+
+    def _buscar(self, codigos: List[str], vagas: List[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        df_vagas = self.repositories.load_vagas(COLUNAS_VAGAS_FEATURES, [('codigo', 'in', vagas)])
+        df_applicants = self.repositories.load_applicants(COLUNAS_APPLICANTS_FEATURES, [('codigo', 'in', codigos)])
+        df_vagas['codigo'] = df_vagas['codigo'].map(normalize_key)
+        df_applicants['codigo'] = df_applicants['codigo'].map(normalize_key)
+
+        vagas_ausentes = sorted(set(vagas) - set(df_vagas['codigo']))
+        applicants_ausentes = sorted(set(codigos) - set(df_applicants['codigo']))
+        if vagas_ausentes or applicants_ausentes:
+            raise ValueError(
+                f"Registros não encontrados na camada silver: vagas={vagas_ausentes}, aplicantes={applicants_ausentes}"
+            )
+        return df_vagas, df_applicants
+
+    def _compatibilidade(self, df: pd.DataFrame, df_vagas: pd.DataFrame) -> pd.DataFrame:
+        engineer = self.engineer
+        cache = self._vagas_cache()
+        for vaga_id in df['id_vaga'].unique():
+            if vaga_id not in cache:
+                texto_vaga_limpo = engineer._get_vaga_text(df_vagas, vaga_id)
+                cache[vaga_id] = (frozenset(texto_vaga_limpo.split()), len(texto_vaga_limpo)) if texto_vaga_limpo else None
+
+        vagas_info = {vaga_id: cache[vaga_id] for vaga_id in df['id_vaga'].unique() if cache[vaga_id]}
+        cv_sets = engineer.token_cache.get_many(df['codigo'], df['cv_pt'])
+        compatibilidade_df = engineer.engine.score_frame(df['cv_pt'], df['id_vaga'], vagas_info, cv_sets=cv_sets)
+        compatibilidade_df = compatibilidade_df.astype(float)
+        compatibilidade_df.columns = ['compatibilidade_vaga_cv_palavras', 'compatibilidade_vaga_cv_percentual']
+        return compatibilidade_df
+
+    def build(self, pairs: Iterable[Tuple]) -> pd.DataFrame:
+        """
+        Gera as features de uma lista de pares.
+
+        Args:
+            pairs: Pares (codigo do aplicante, codigo da vaga)
+
+        Returns:
+            DataFrame com `id_vaga`, `codigo` e as colunas do modelo, uma linha por par
+        """
+        df_pares = pd.DataFrame(
+            [(normalize_key(vaga), normalize_key(codigo)) for codigo, vaga in pairs],
+            columns=['vaga_codigo', 'codigo']
+        )
+        colunas_saida = ['id_vaga', 'codigo'] + self.feature_columns()
+        if df_pares.empty:
+            return pd.DataFrame(columns=colunas_saida)
+
+        df_vagas, df_applicants = self._buscar(
+            df_pares['codigo'].unique().tolist(), df_pares['vaga_codigo'].unique().tolist()
+        )
+
+        engineer = self.engineer
+        df = engineer.merge_dataframes(df_pares, df_vagas, df_applicants)
+        df = pd.concat([df, self._compatibilidade(df, df_vagas)], axis=1)
+        df = engineer.create_language_matches(df)
+        df = engineer.create_academic_match(df)
+        df = engineer.create_categorical_encodings(df)
+        df = engineer.create_area_features(df)
+
+        # Colunas de áreas ausentes neste lote (e demais features) valem 0, como no lote completo
+        return df.reindex(columns=colunas_saida).fillna(0)
+
+    def build_one(self, codigo, id_vaga) -> pd.DataFrame:
+        """Gera as features de um único par (aplicante, vaga)."""
+        return self.build([(codigo, id_vaga)])
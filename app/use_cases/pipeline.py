@@ -1,72 +1,198 @@
 import json
+import numpy as np
 import pandas as pd
+import os
+import sys
 from pathlib import Path
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.data_store import compare_hashes, hash_by_key
+from interface_adapters.json_stream import iter_json_object, write_records_streaming
+from interface_adapters.silver_schema import apply_silver_schema
+from interface_adapters.storage import DEFAULT_STORAGE, StorageOptions
+
+
+# Número de linhas por row group nos arquivos da camada silver. Com as tabelas
+# ordenadas pela chave de consulta, as estatísticas (min/max) de cada row group
+# permitem ao leitor parquet descartar os grupos que não contêm a chave filtrada.
+SILVER_ROW_GROUP_SIZE = 5000
+SILVER_STORAGE = StorageOptions(row_group_size=SILVER_ROW_GROUP_SIZE)
+
+SILVER_PATH = 'app/data/silver'
+# Hashes por chave do último snapshot silver, usados pela carga incremental.
+SILVER_STATE_PATH = 'app/data/silver/_state'
+SILVER_MANIFEST_PATH = 'app/data/silver/_manifest.json'
+
+# Registros achatados e gravados por row group na ingestão bronze em streaming.
+BRONZE_BATCH_SIZE = 5000
+
+# Colunas da camada silver usadas na geração de features (lote e online).
+COLUNAS_VAGAS_FEATURES = ['codigo',
+                          'informacoes_basicas.titulo_vaga',
+                          'informacoes_basicas.origem_vaga',
+                          'informacoes_basicas.tipo_contratacao',
+                          'informacoes_basicas.prazo_contratacao',
+                          'informacoes_basicas.prioridade_vaga',
+                          'perfil_vaga.demais_observacoes',
+                          'perfil_vaga.principais_atividades',
+                          'perfil_vaga.competencia_tecnicas_e_comportamentais',
+                          'perfil_vaga.estado',
+                          'perfil_vaga.nivel profissional',
+                          'perfil_vaga.nivel_academico',
+                          'perfil_vaga.nivel_ingles',
+                          'perfil_vaga.nivel_espanhol',
+                          'perfil_vaga.viagens_requeridas',
+                          'perfil_vaga.areas_atuacao'
+                          ]
+COLUNAS_APPLICANTS_FEATURES = ['codigo',
+                               'infos_basicas.codigo_profissional',
+                               'informacoes_profissionais.area_atuacao',
+                               'formacao_e_idiomas.nivel_academico',
+                               'formacao_e_idiomas.nivel_ingles',
+                               'formacao_e_idiomas.nivel_espanhol',
+                               'cv_pt'
+                               ]
+COLUNAS_PROSPECTS_FEATURES = ['vaga_codigo',
+                              'codigo',
+                              'modalidade',
+                              'titulo',
+                              'situacao_candidado'
+                              ]
+
 
 class Pipeline:
     
-    def bronze():
+    def _registros_por_codigo(itens):
+        """Gera um registro por código (vagas e applicants) a partir de pares (codigo, info)."""
+        for codigo, info in itens:
+            if not isinstance(info, dict):
+                info = {}
+            rec = {"codigo": codigo}
+            rec.update(info)
+            yield rec
+
+    def _registros_prospects(itens):
+        """Gera um registro por prospect a partir de pares (vaga_codigo, vaga_info)."""
+        for vaga_codigo, vaga_info in itens:
+            # Copia todas as características da vaga (exceto prospects)
+            vaga_base = {"vaga_codigo": vaga_codigo}
+            for k, v in vaga_info.items():
+                if k != "prospects":
+                    vaga_base[k] = v
+            prospects = vaga_info.get("prospects", [])
+            if prospects:
+                for prospect in prospects:
+                    rec = vaga_base.copy()
+                    if isinstance(prospect, dict):
+                        rec.update(prospect)
+                    else:
+                        rec["applicant"] = prospect
+                    yield rec
+            else:
+                # Caso não haja prospects, ainda assim registra a vaga
+                yield vaga_base
+
+    def bronze(streaming=False, batch_size=BRONZE_BATCH_SIZE):
+        """
+        Converte os JSONs exportados em parquet achatado na camada bronze.
+
+        Args:
+            streaming: Se True, lê cada JSON incrementalmente (um código por vez) e
+                grava o parquet em row groups de `batch_size` registros, com memória
+                constante independente do tamanho do arquivo. O parquet gerado tem
+                as mesmas colunas, ordem e tipos do modo padrão.
+            batch_size: Quantidade de registros por lote no modo streaming
+        """
         vagas_path = Path("app/data/bronze/vagas.json")
         applicants_path = Path("app/data/bronze/applicants.json")
+        prospects_path = Path("app/data/bronze/prospects.json")
 
-        def json_to_flat_df(json_path):
-            with open(json_path, encoding="utf-8") as f:
-                data = json.load(f)
-            records = []
-            for codigo, info in data.items():
-                if not isinstance(info, dict):
-                    info = {}
-                rec = {"codigo": codigo}
-                rec.update(info)
-                records.append(rec)
-            return pd.json_normalize(records)
-
-        df_vagas = json_to_flat_df(vagas_path)
-        df_applicants = json_to_flat_df(applicants_path)
-
-        df_vagas.to_parquet("app/data/bronze/vagas.parquet", index=False)
-        df_applicants.to_parquet("app/data/bronze/applicants.parquet", index=False)
+        arquivos = [
+            (vagas_path, Pipeline._registros_por_codigo, "app/data/bronze/vagas.parquet"),
+            (applicants_path, Pipeline._registros_por_codigo, "app/data/bronze/applicants.parquet"),
+            (prospects_path, Pipeline._registros_prospects, "app/data/bronze/prospects.parquet"),
+        ]
+
+        for json_path, gerar_registros, parquet_path in arquivos:
+            if streaming:
+                total = write_records_streaming(
+                    lambda: gerar_registros(iter_json_object(json_path)),
+                    parquet_path,
+                    batch_size=batch_size,
+                    **DEFAULT_STORAGE.writer_options()
+                )
+                print(f"{parquet_path} gerado em modo streaming ({total} linhas).")
+            else:
+                with open(json_path, encoding="utf-8") as f:
+                    data = json.load(f)
+                df = pd.json_normalize(list(gerar_registros(data.items())))
+                DEFAULT_STORAGE.write(df, parquet_path)
 
         print("Arquivos Parquet gerados com sucesso!")
 
-        prospects_path = Path("app/data/bronze/prospects.json")
 
-        def prospects_json_to_flat_df(json_path):
-            with open(json_path, encoding="utf-8") as f:
-                data = json.load(f)
-            records = []
-            for vaga_codigo, vaga_info in data.items():
-                # Copia todas as características da vaga (exceto prospects)
-                vaga_base = {"vaga_codigo": vaga_codigo}
-                for k, v in vaga_info.items():
-                    if k != "prospects":
-                        vaga_base[k] = v
-                prospects = vaga_info.get("prospects", [])
-                if prospects:
-                    for prospect in prospects:
-                        rec = vaga_base.copy()
-                        if isinstance(prospect, dict):
-                            rec.update(prospect)
-                        else:
-                            rec["applicant"] = prospect
-                        records.append(rec)
-                else:
-                    # Caso não haja prospects, ainda assim registra a vaga
-                    records.append(vaga_base)
-            return pd.json_normalize(records)
-
-        # Processa o prospects.json
-        df_prospects = prospects_json_to_flat_df(prospects_path)
-        df_prospects.to_parquet("app/data/bronze/prospects.parquet", index=False)
-
-        print("Arquivo Parquet de prospects gerado com sucesso!")
-
-
-    def silver():
+    def _gravar_silver(df, nome, chaves):
+        """
+        Grava uma tabela silver com o schema declarado (ids int64, datas e
+        categorias), ordenada pela chave de consulta.
+        """
+        df = apply_silver_schema(df, nome).sort_values(chaves, kind='stable')
+        SILVER_STORAGE.write(df, f'{SILVER_PATH}/{nome}.parquet')
+        return df
+
+    def _salvar_estado_silver(hashes):
+        os.makedirs(SILVER_STATE_PATH, exist_ok=True)
+        for nome, serie in hashes.items():
+            DEFAULT_STORAGE.write(pd.DataFrame({'chave': serie.index, 'hash': serie.to_numpy()}),
+                                  f'{SILVER_STATE_PATH}/{nome}.parquet')
+
+    def _carregar_estado_silver():
+        hashes = {}
+        for nome in ('vagas', 'applicants', 'prospects'):
+            caminho = f'{SILVER_STATE_PATH}/{nome}.parquet'
+            if not os.path.exists(caminho) or not os.path.exists(f'{SILVER_PATH}/{nome}.parquet'):
+                return None
+            df = pd.read_parquet(caminho)
+            hashes[nome] = pd.Series(df['hash'].to_numpy(), index=df['chave'].astype(str).to_numpy())
+        return hashes
+
+    def _gravar_manifesto(manifesto):
+        manifesto['executado_em'] = pd.Timestamp.now().isoformat()
+        with open(SILVER_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+    def silver(incremental=False):
+        """
+        Gera a camada silver a partir da bronze.
+
+        Args:
+            incremental: Se True e existir um snapshot anterior, detecta por chave e
+                hash de conteúdo as vagas, applicants e prospects novos, alterados ou
+                removidos e refaz apenas os cruzamentos afetados, reaproveitando as
+                demais linhas do snapshot. Tabelas sem alterações não são regravadas.
+                Em ambos os modos é gravado um manifesto em `_manifest.json`.
+        """
         df_vagas = pd.read_parquet('app/data/bronze/vagas.parquet')
         df_applicants = pd.read_parquet('app/data/bronze/applicants.parquet')
         df_prospects = pd.read_parquet('app/data/bronze/prospects.parquet')
 
+        hashes = {
+            'vagas': hash_by_key(df_vagas, 'codigo'),
+            'applicants': hash_by_key(df_applicants, 'codigo'),
+            'prospects': hash_by_key(df_prospects, 'vaga_codigo'),
+        }
+
+        if incremental:
+            estado_anterior = Pipeline._carregar_estado_silver()
+            if estado_anterior is not None:
+                manifesto = Pipeline._silver_incremental(df_vagas, df_applicants, df_prospects,
+                                                         hashes, estado_anterior)
+                Pipeline._salvar_estado_silver(hashes)
+                Pipeline._gravar_manifesto(manifesto)
+                return manifesto
+            print("Snapshot silver anterior não encontrado: executando carga completa.")
+
 
         #prospects
 
@@ -87,7 +213,8 @@ class Pipeline:
 
         prospects_cols = [col for col in df_prospects.columns]
         df_prospects_filtrado = df_prospects_full[prospects_cols]
-        df_prospects_filtrado.to_parquet('app/data/silver/prospects.parquet', index=False, compression='gzip')
+        # Os cruzamentos abaixo usam a versão da bronze (códigos como texto, como nas demais tabelas)
+        df_prospects_silver = Pipeline._gravar_silver(df_prospects_filtrado, 'prospects', ['vaga_codigo', 'codigo'])
 
         # vagas
 
@@ -102,7 +229,7 @@ class Pipeline:
         df_vagas_cols = [col for col in df_vagas.columns]
         df_vagas_filtrado = df_vagas_filtrado[df_vagas_cols]
         df_vagas_filtrado = df_vagas_filtrado.drop_duplicates()
-        df_vagas_filtrado.to_parquet('app/data/silver/vagas.parquet', index=False, compression='gzip')
+        df_vagas_filtrado = Pipeline._gravar_silver(df_vagas_filtrado, 'vagas', 'codigo')
 
 
 
@@ -119,55 +246,122 @@ class Pipeline:
         df_applicants_cols = [col for col in df_applicants.columns]
         df_applicants_filtrado = df_applicants_filtrado[df_applicants_cols]
         df_applicants_filtrado = df_applicants_filtrado.drop_duplicates()
-        df_applicants_filtrado.to_parquet('app/data/silver/applicants.parquet', index=False, compression='gzip')
+        df_applicants_filtrado = Pipeline._gravar_silver(df_applicants_filtrado, 'applicants', 'codigo')
+
+        manifesto = {
+            'modo': 'completo',
+            'linhas': {
+                'prospects': len(df_prospects_silver),
+                'vagas': len(df_vagas_filtrado),
+                'applicants': len(df_applicants_filtrado),
+            },
+            'tabelas_regravadas': ['prospects', 'vagas', 'applicants'],
+        }
+        Pipeline._salvar_estado_silver(hashes)
+        Pipeline._gravar_manifesto(manifesto)
+        return manifesto
+
+    def _silver_incremental(df_vagas, df_applicants, df_prospects, hashes, estado_anterior):
+        """
+        Atualiza a camada silver reaproveitando o snapshot anterior.
+
+        Os cruzamentos da carga completa equivalem a filtros de existência
+        (prospects cuja vaga e cujo aplicante existem; vagas e applicants com ao
+        menos um prospect), então só precisam ser refeitos para os grupos de
+        prospects (por vaga) afetados pelas mudanças.
+        """
+        vagas_novas, vagas_alteradas, vagas_removidas = compare_hashes(
+            hashes['vagas'], estado_anterior['vagas'])
+        applicants_novos, applicants_alterados, applicants_removidos = compare_hashes(
+            hashes['applicants'], estado_anterior['applicants'])
+        grupos_novos, grupos_alterados, grupos_removidos = compare_hashes(
+            hashes['prospects'], estado_anterior['prospects'])
+
+        prospects_vaga = df_prospects['vaga_codigo'].astype(str)
+        prospects_codigo = df_prospects['codigo'].astype(str)
+
+        # Grupos de prospects (por vaga) cujo resultado do cruzamento pode ter mudado
+        applicants_existencia = applicants_novos | applicants_removidos
+        grupos_afetados = (grupos_novos | grupos_alterados | grupos_removidos
+                           | vagas_novas | vagas_removidas
+                           | set(prospects_vaga[prospects_codigo.isin(applicants_existencia)]))
+
+        tabelas_regravadas = []
+
+        # prospects
+        df_prospects_anterior = pd.read_parquet(f'{SILVER_PATH}/prospects.parquet')
+        if grupos_afetados:
+            mantidos = df_prospects_anterior[~df_prospects_anterior['vaga_codigo'].astype(str).isin(grupos_afetados)]
+            recalculados = df_prospects[
+                prospects_vaga.isin(grupos_afetados)
+                & prospects_vaga.isin(hashes['vagas'].index)
+                & prospects_codigo.isin(hashes['applicants'].index)
+            ]
+            df_prospects_silver = pd.concat([mantidos, recalculados[df_prospects.columns]], ignore_index=True)
+            df_prospects_silver = Pipeline._gravar_silver(df_prospects_silver, 'prospects', ['vaga_codigo', 'codigo'])
+            tabelas_regravadas.append('prospects')
+        else:
+            df_prospects_silver = df_prospects_anterior
+
+        # vagas e applicants: mantêm as linhas inalteradas ainda referenciadas por
+        # algum prospect e trazem da bronze as novas/alteradas
+        def atualizar(nome, df_bronze, referenciados, alterados, removidos):
+            df_anterior = pd.read_parquet(f'{SILVER_PATH}/{nome}.parquet')
+            codigos_anteriores = df_anterior['codigo'].astype(str)
+            codigos_bronze = df_bronze['codigo'].astype(str)
+
+            mantidos_mask = codigos_anteriores.isin(referenciados) & ~codigos_anteriores.isin(alterados | removidos)
+            entrantes_mask = codigos_bronze.isin(referenciados) & (
+                codigos_bronze.isin(alterados) | ~codigos_bronze.isin(codigos_anteriores)
+            )
+            if mantidos_mask.all() and not entrantes_mask.any():
+                return df_anterior, 0
+
+            df_silver = pd.concat([df_anterior[mantidos_mask], df_bronze[entrantes_mask]], ignore_index=True)
+            df_silver = Pipeline._gravar_silver(df_silver.drop_duplicates(), nome, 'codigo')
+            tabelas_regravadas.append(nome)
+            return df_silver, int(entrantes_mask.sum())
+
+        df_vagas_silver, vagas_reprocessadas = atualizar(
+            'vagas', df_vagas, set(df_prospects_silver['vaga_codigo'].astype(str)),
+            vagas_alteradas, vagas_removidas)
+        df_applicants_silver, applicants_reprocessados = atualizar(
+            'applicants', df_applicants, set(df_prospects_silver['codigo'].astype(str)),
+            applicants_alterados, applicants_removidos)
+
+        print(f"Silver incremental: {len(grupos_afetados)} grupos de prospects reprocessados, "
+              f"{vagas_reprocessadas} vagas e {applicants_reprocessados} applicants atualizados.")
+
+        return {
+            'modo': 'incremental',
+            'alteracoes': {
+                'vagas': {'novas': len(vagas_novas), 'alteradas': len(vagas_alteradas),
+                          'removidas': len(vagas_removidas)},
+                'applicants': {'novos': len(applicants_novos), 'alterados': len(applicants_alterados),
+                               'removidos': len(applicants_removidos)},
+                'prospects': {'grupos_novos': len(grupos_novos), 'grupos_alterados': len(grupos_alterados),
+                              'grupos_removidos': len(grupos_removidos)},
+            },
+            'grupos_prospects_reprocessados': len(grupos_afetados),
+            'linhas_reprocessadas': {'vagas': vagas_reprocessadas, 'applicants': applicants_reprocessados},
+            'linhas': {
+                'prospects': len(df_prospects_silver),
+                'vagas': len(df_vagas_silver),
+                'applicants': len(df_applicants_silver),
+            },
+            'tabelas_regravadas': tabelas_regravadas,
+        }
 
 
     def silver_feature():
-        df_vagas = pd.read_parquet('app/data/silver/vagas.parquet')               
-        cols_vagas = ['codigo',
-                        'informacoes_basicas.titulo_vaga',
-                        'informacoes_basicas.origem_vaga',
-                        'informacoes_basicas.tipo_contratacao',
-                        'informacoes_basicas.prazo_contratacao',
-                        'informacoes_basicas.prioridade_vaga',
-                        'perfil_vaga.demais_observacoes',
-                        'perfil_vaga.principais_atividades',
-                        'perfil_vaga.competencia_tecnicas_e_comportamentais',                  
-                        'perfil_vaga.estado',
-                        'perfil_vaga.nivel profissional',
-                        'perfil_vaga.nivel_academico',
-                        'perfil_vaga.nivel_ingles',
-                        'perfil_vaga.nivel_espanhol',
-                        'perfil_vaga.viagens_requeridas',
-                        'perfil_vaga.areas_atuacao'
-                        ]
-        df_vagas = df_vagas[cols_vagas]
-
-
-        df_applicants = pd.read_parquet('app/data/silver/applicants.parquet')
-        cols_applicants = ['codigo',
-                            'infos_basicas.codigo_profissional',
-                            'informacoes_profissionais.area_atuacao',
-                            'formacao_e_idiomas.nivel_academico',
-                            'formacao_e_idiomas.nivel_ingles',
-                            'formacao_e_idiomas.nivel_espanhol',
-                            'cv_pt'
-                            ]
-        
-        df_applicants = df_applicants[cols_applicants]
-
-
-        df_prospects = pd.read_parquet('app/data/silver/prospects.parquet')
-
-        cols_prospects = ['vaga_codigo',
-                        'codigo',
-                        'modalidade',
-                        'titulo',
-                        'situacao_candidado'
-                        ]
-        
-        df_prospects = df_prospects[cols_prospects]
-
+        # O schema é reaplicado para que arquivos gravados antes dele (tudo texto)
+        # cheguem com os mesmos tipos; nos arquivos atuais a conversão não faz nada
+        df_vagas = apply_silver_schema(
+            pd.read_parquet('app/data/silver/vagas.parquet', columns=COLUNAS_VAGAS_FEATURES), 'vagas')
+        df_applicants = apply_silver_schema(
+            pd.read_parquet('app/data/silver/applicants.parquet', columns=COLUNAS_APPLICANTS_FEATURES), 'applicants')
+        df_prospects = apply_silver_schema(
+            pd.read_parquet('app/data/silver/prospects.parquet', columns=COLUNAS_PROSPECTS_FEATURES), 'prospects')
 
         return df_applicants, df_prospects, df_vagas
     
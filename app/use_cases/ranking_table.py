@@ -0,0 +1,228 @@
+import json
+import os
+import sys
+from typing import Optional
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.data_store import DataStore, compare_hashes, file_hash, hash_by_key, normalize_key
+from interface_adapters.storage import DEFAULT_STORAGE, StorageOptions
+
+GOLD_PATH = 'app/data/gold'
+RANKING_TOP_K = 10
+# Linhas por row group nas tabelas de ranking (ordenadas pela chave de consulta)
+GOLD_ROW_GROUP_SIZE = 5000
+GOLD_STORAGE = StorageOptions(row_group_size=GOLD_ROW_GROUP_SIZE)
+# Linhas explicadas por lote no pré-cálculo das explicações do top-K
+EXPLAIN_BATCH_SIZE = 2048
+
+COLUNAS_RANKING = ['codigo', 'id_vaga', 'probabilidade_match']
+
+
+class RankingTableJob:
+    """
+    Job em lote que pontua todos os prospects de todas as vagas e materializa
+    os rankings na camada gold.
+
+    Gera, em `gold_path`:
+        - ranking_vagas.parquet / ranking_vagas_top.parquet: ranking completo e
+          top-K por vaga, ordenados por vaga e probabilidade decrescente
+        - ranking_applicants.parquet / ranking_applicants_top.parquet: o mesmo
+          por aplicante
+        - _manifest.json: versão do modelo, hash do arquivo de features e top-K
+        - _state.parquet: hash das features de cada vaga
+
+    Em execuções seguintes apenas as vagas cujas features mudaram são
+    pontuadas novamente; uma mudança na versão do modelo ou no top-K
+    recalcula tudo.
+
+    Com `explain_top_k=True` as explicações dos pares no top-K de cada
+    ranking (por vaga e por aplicante) também são calculadas, com a mesma
+    configuração da página (`explain_batch_numpy`: DeepLIFT em NumPy), e
+    gravadas no cache de explicações do predictor, de onde a página as lê.
+    """
+
+    def __init__(self, predictor=None, features_path: str = "app/data/silver/df_features.parquet",
+                 gold_path: str = GOLD_PATH, top_k: int = RANKING_TOP_K, explain_top_k: bool = False,
+                 storage: Optional[StorageOptions] = None):
+        """
+        Args:
+            predictor: Predictor carregado (padrão: o do ModelRegistry)
+            features_path: Arquivo de features pontuado pelo job
+            gold_path: Diretório de saída
+            top_k: Quantidade de posições materializadas nas tabelas top-K
+            explain_top_k: Se True, pré-calcula as explicações do top-K
+            storage: Opções de gravação das tabelas de ranking (padrão: GOLD_STORAGE)
+        """
+        if predictor is None:
+            from use_cases.model_registry import ModelRegistry
+            predictor = ModelRegistry.instance().get_predictor()
+        self.predictor = predictor
+        self.features_path = features_path
+        self.gold_path = gold_path
+        self.top_k = top_k
+        self.explain_top_k = explain_top_k
+        self.storage = storage or GOLD_STORAGE
+
+    def _caminho(self, nome: str) -> str:
+        return os.path.join(self.gold_path, nome)
+
+    def _ler_manifesto(self) -> Optional[dict]:
+        caminho = self._caminho('_manifest.json')
+        if not os.path.exists(caminho):
+            return None
+        with open(caminho, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _gravar_ranking(self, df: pd.DataFrame, chave: str, nome: str) -> pd.DataFrame:
+        """Ordena por chave e probabilidade, numera as posições e grava completo e top-K."""
+        df = df.sort_values([chave, 'probabilidade_match', 'codigo' if chave == 'id_vaga' else 'id_vaga'],
+                            ascending=[True, False, True], kind='stable').reset_index(drop=True)
+        df['posicao'] = df.groupby(chave, sort=False).cumcount() + 1
+        self.storage.write(df, self._caminho(f'{nome}.parquet'))
+        self.storage.write(df[df['posicao'] <= self.top_k], self._caminho(f'{nome}_top.parquet'))
+        return df
+
+    def _explicar_top_k(self, df_features: pd.DataFrame, rankings) -> int:
+        """Calcula (ou encontra no cache) as explicações dos pares no top-K dos rankings."""
+        if not hasattr(self.predictor, 'attributions'):
+            raise ValueError("O predictor informado não gera explicações.")
+        pares = pd.concat(
+            [df[df['posicao'] <= self.top_k][['codigo', 'id_vaga']] for df in rankings]
+        ).drop_duplicates()
+        df_top = df_features.merge(pares, on=['codigo', 'id_vaga'], how='inner')
+        print(f"Explicando {len(df_top)} pares do top-{self.top_k}...")
+        for inicio in range(0, len(df_top), EXPLAIN_BATCH_SIZE):
+            self.predictor.attributions(df_top.iloc[inicio:inicio + EXPLAIN_BATCH_SIZE])
+        self.predictor.explanation_cache.save()
+        return int(len(df_top))
+
+    def run(self, force: bool = False) -> dict:
+        """
+        Executa o job.
+
+        Args:
+            force: Se True, ignora o estado anterior e pontua todas as vagas
+
+        Returns:
+            Manifesto da execução
+        """
+        os.makedirs(self.gold_path, exist_ok=True)
+        df_features = pd.read_parquet(self.features_path)
+        df_features['id_vaga'] = df_features['id_vaga'].map(normalize_key)
+        df_features['codigo'] = df_features['codigo'].map(normalize_key)
+        hashes = hash_by_key(df_features, 'id_vaga')
+
+        manifesto = self._ler_manifesto()
+        caminho_estado = self._caminho('_state.parquet')
+        caminho_ranking = self._caminho('ranking_vagas.parquet')
+        reaproveitar = (
+            not force and manifesto is not None
+            and manifesto.get('model_version') == self.predictor.model_version
+            and manifesto.get('top_k') == self.top_k
+            and os.path.exists(caminho_estado) and os.path.exists(caminho_ranking)
+        )
+
+        if reaproveitar:
+            estado = pd.read_parquet(caminho_estado)
+            anteriores = pd.Series(estado['hash'].to_numpy(), index=estado['chave'].to_numpy())
+            novas, alteradas, removidas = compare_hashes(hashes, anteriores)
+            recalcular = novas | alteradas
+            df_mantido = pd.read_parquet(caminho_ranking, columns=COLUNAS_RANKING)
+            df_mantido = df_mantido[~df_mantido['id_vaga'].isin(alteradas | removidas)]
+            print(f"Ranking incremental: {len(recalcular)} vagas a pontuar, {len(removidas)} removidas.")
+        else:
+            recalcular = set(hashes.index)
+            df_mantido = None
+            print(f"Ranking completo: {len(recalcular)} vagas a pontuar.")
+
+        df_pontuar = df_features[df_features['id_vaga'].isin(recalcular)]
+        partes = [] if df_mantido is None else [df_mantido]
+        if len(df_pontuar):
+            partes.append(self.predictor.create_ranking(df_pontuar)[COLUNAS_RANKING])
+        df_ranking = pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=COLUNAS_RANKING)
+        df_ranking['probabilidade_match'] = df_ranking['probabilidade_match'].astype(float)
+
+        rankings = [
+            self._gravar_ranking(df_ranking, 'id_vaga', 'ranking_vagas'),
+            self._gravar_ranking(df_ranking, 'codigo', 'ranking_applicants'),
+        ]
+        DEFAULT_STORAGE.write(pd.DataFrame({'chave': hashes.index, 'hash': hashes.to_numpy()}), caminho_estado)
+
+        manifesto = {
+            'model_version': self.predictor.model_version,
+            'features_hash': file_hash(self.features_path),
+            'top_k': self.top_k,
+            'linhas': int(len(df_ranking)),
+            'vagas': int(df_ranking['id_vaga'].nunique()),
+            'vagas_pontuadas': len(recalcular),
+            'gerado_em': pd.Timestamp.now().isoformat(),
+        }
+        if self.explain_top_k:
+            manifesto['explicacoes'] = self._explicar_top_k(df_features, rankings)
+        with open(self._caminho('_manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+        print(f"Rankings gravados em {self.gold_path} ({manifesto['linhas']} linhas).")
+        return manifesto
+
+
+class RankingTable:
+    """
+    Leitura dos rankings materializados pelo `RankingTableJob`.
+
+    As consultas por vaga ou aplicante são buscas nos índices do DataStore
+    (sem pontuar nada); as tabelas são relidas apenas quando mudam no disco.
+    """
+
+    def __init__(self, gold_path: str = GOLD_PATH):
+        self.gold_path = gold_path
+        self.store = DataStore.instance()
+
+    def _caminho(self, nome: str) -> str:
+        return os.path.join(self.gold_path, nome)
+
+    def manifest(self) -> Optional[dict]:
+        caminho = self._caminho('_manifest.json')
+        if not os.path.exists(caminho):
+            return None
+
+        def ler(path):
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+
+        return self.store.get(caminho, ler, name='ranking_manifest')
+
+    def is_fresh(self, model_version: Optional[str],
+                 features_path: str = "app/data/silver/df_features.parquet") -> bool:
+        """
+        Indica se os rankings foram gerados com a versão de modelo informada e
+        com o conteúdo atual do arquivo de features. O hash do arquivo é
+        calculado uma vez e mantido no DataStore até o arquivo mudar.
+        """
+        manifesto = self.manifest()
+        if manifesto is None or model_version is None or not os.path.exists(features_path):
+            return False
+        return (
+            manifesto.get('model_version') == model_version
+            and manifesto.get('features_hash') == self.store.get(features_path, file_hash, name='file_hash')
+        )
+
+    def _consultar(self, nome: str, chave: str, valor, top_k: bool) -> pd.DataFrame:
+        caminho = self._caminho(f"{nome}{'_top' if top_k else ''}.parquet")
+        tabela = self.store.get_table(caminho, [chave])
+        return tabela.select(COLUNAS_RANKING + ['posicao'], [(chave, '==', valor)])
+
+    def get_vaga(self, id_vaga, top_k: bool = False) -> pd.DataFrame:
+        """Ranking dos candidatos de uma vaga (probabilidade decrescente)."""
+        return self._consultar('ranking_vagas', 'id_vaga', id_vaga, top_k)
+
+    def get_applicant(self, codigo, top_k: bool = False) -> pd.DataFrame:
+        """Ranking das vagas de um aplicante (probabilidade decrescente)."""
+        return self._consultar('ranking_applicants', 'codigo', codigo, top_k)
+
+
+if __name__ == "__main__":
+    RankingTableJob(explain_top_k='--explain' in sys.argv).run()
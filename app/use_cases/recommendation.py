@@ -0,0 +1,94 @@
+import pandas as pd
+import os
+import sys
+from typing import List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from interface_adapters.data_store import normalize_key
+from interface_adapters.repositories import Repositories
+from use_cases.candidate_generation import CandidateGenerator
+from use_cases.online_features import OnlineFeatureBuilder
+
+
+class RecommendationUseCase:
+    """
+    Recomendação fora das candidaturas existentes: pontua aplicantes do banco
+    contra uma vaga (ou vagas contra um aplicante) mesmo sem candidatura.
+
+    Funciona em dois estágios: a geração de candidatos (índice invertido de
+    palavras e áreas) reduz todos os pares possíveis a uma lista curta e só
+    essa lista passa pelo `OnlineFeatureBuilder` e pelo modelo.
+    """
+
+    def __init__(self, predictor=None, generator: Optional[CandidateGenerator] = None,
+                 feature_builder: Optional[OnlineFeatureBuilder] = None,
+                 data_path="app/data/silver", shortlist_size: int = 200):
+        """
+        Args:
+            predictor: Predictor (ou ScoringService) com `create_ranking` (padrão: o do ModelRegistry)
+            generator: Geração de candidatos
+            feature_builder: Gerador de features online
+            data_path: Diretório da camada silver
+            shortlist_size: Quantidade de pares pontuados pelo modelo por consulta
+        """
+        if predictor is None:
+            from use_cases.model_registry import ModelRegistry
+            predictor = ModelRegistry.instance().get_scoring_service()
+        self.predictor = predictor
+        self.feature_builder = feature_builder or OnlineFeatureBuilder(data_path)
+        self.generator = generator or CandidateGenerator(data_path, engineer=self.feature_builder.engineer)
+        self.repositories = Repositories(data_path)
+        self.shortlist_size = shortlist_size
+
+    def _pontuar(self, pares: List[Tuple[str, str]], relevancia: dict, chave: str,
+                 aplicados: set, top_n: int) -> pd.DataFrame:
+        colunas = ['codigo', 'id_vaga', 'probabilidade_match', 'relevancia', 'ja_aplicou']
+        if not pares:
+            return pd.DataFrame(columns=colunas)
+        df_features = self.feature_builder.build(pares)
+        df_ranking = self.predictor.create_ranking(df_features)
+        df_ranking['relevancia'] = df_ranking[chave].map(relevancia)
+        df_ranking['ja_aplicou'] = df_ranking[chave].isin(aplicados)
+        df_ranking = df_ranking.sort_values(['probabilidade_match', 'relevancia'], ascending=False, kind='stable')
+        return df_ranking[colunas].head(top_n).reset_index(drop=True)
+
+    def recommend_for_vaga(self, id_vaga, top_n: int = 20, include_applied: bool = False) -> pd.DataFrame:
+        """
+        Aplicantes recomendados para uma vaga.
+
+        Args:
+            id_vaga: Código da vaga
+            top_n: Quantidade de recomendações
+            include_applied: Se False, ignora quem já se candidatou à vaga
+
+        Returns:
+            DataFrame com codigo, id_vaga, probabilidade_match, relevancia e ja_aplicou
+        """
+        id_vaga = normalize_key(id_vaga)
+        aplicados = set(self.repositories.get_prospects_by_vaga(id_vaga, ['codigo'])['codigo'].map(normalize_key))
+        candidatos = self.generator.candidates_for_vaga(
+            id_vaga, self.shortlist_size, excluir=None if include_applied else aplicados
+        )
+        pares = [(codigo, id_vaga) for codigo, _ in candidatos]
+        return self._pontuar(pares, dict(candidatos), 'codigo', aplicados, top_n)
+
+    def recommend_for_applicant(self, codigo, top_n: int = 20, include_applied: bool = False) -> pd.DataFrame:
+        """
+        Vagas recomendadas para um aplicante.
+
+        Args:
+            codigo: Código do aplicante
+            top_n: Quantidade de recomendações
+            include_applied: Se False, ignora as vagas às quais já se candidatou
+
+        Returns:
+            DataFrame com codigo, id_vaga, probabilidade_match, relevancia e ja_aplicou
+        """
+        codigo = normalize_key(codigo)
+        aplicadas = set(self.repositories.get_prospects_by_applicant(codigo, ['vaga_codigo'])['vaga_codigo'].map(normalize_key))
+        vagas = self.generator.vagas_for_applicant(
+            codigo, self.shortlist_size, excluir=None if include_applied else aplicadas
+        )
+        pares = [(codigo, id_vaga) for id_vaga, _ in vagas]
+        return self._pontuar(pares, dict(vagas), 'id_vaga', aplicadas, top_n)
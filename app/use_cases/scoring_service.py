@@ -0,0 +1,213 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Tempo máximo (s) que `predict_batch` espera pelo resultado por padrão
+DEFAULT_TIMEOUT = 30.0
+
+
+class ScoringService:
+    """
+    Serviço de pontuação em micro-lotes na frente de um predictor.
+
+    Pedidos concorrentes (ex.: sessões do Streamlit em threads diferentes) são
+    colocados em uma fila; uma thread de trabalho junta os pedidos que chegam
+    dentro da janela de latência (`max_delay_ms`) ou até `max_batch_rows`
+    linhas, executa uma única predição para o lote inteiro e devolve a cada
+    pedido a sua fatia do resultado.
+
+    Funciona com qualquer predictor que tenha `plan` (InferencePlan) e um
+    `predict_batch` que aceite a matriz de features — `MatchPredictor` e
+    `NumpyMatchPredictor`.
+
+    Um serviço parado não é reiniciado: os pedidos feitos a ele depois de
+    `stop` vão para o serviço sucessor informado (ex.: o novo serviço do
+    ModelRegistry após um recarregamento) ou falham com RuntimeError.
+    """
+
+    def __init__(self, predictor, max_batch_rows: int = 4096, max_delay_ms: float = 5.0,
+                 metrics_window: int = 1000):
+        """
+        Args:
+            predictor: Predictor já carregado
+            max_batch_rows: Quantidade máxima de linhas por micro-lote
+            max_delay_ms: Tempo máximo que o primeiro pedido espera por outros
+            metrics_window: Quantidade de lotes (e de pedidos) recentes considerados nas métricas
+        """
+        self.predictor = predictor
+        self.max_batch_rows = max_batch_rows
+        self.max_delay = max_delay_ms / 1000
+        self._fila: "queue.Queue[Tuple[np.ndarray, Future, float]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        # `_parado` e a fila só mudam juntos sob `_lock`: depois que o loop vê o
+        # serviço parado e a fila vazia, nenhum pedido entra mais na fila
+        self._parado = False
+        self._sucessor: Optional["ScoringService"] = None
+        self._lock = threading.Lock()
+        self._lotes = deque(maxlen=metrics_window)
+        self._atrasos = deque(maxlen=metrics_window)
+        self._totais = {'requests': 0, 'rows': 0, 'batches': 0, 'errors': 0}
+
+    def start(self) -> "ScoringService":
+        """Inicia a thread de trabalho (uma única vez; um serviço parado não é reiniciado)."""
+        with self._lock:
+            if self._thread is None and not self._parado:
+                self._thread = threading.Thread(target=self._loop, name="scoring-service", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None, successor: Optional["ScoringService"] = None):
+        """
+        Para o serviço depois de atender os pedidos já enfileirados.
+
+        Args:
+            timeout: Tempo máximo de espera pela thread de trabalho
+            successor: Serviço que passa a atender os pedidos feitos a este depois de parado
+        """
+        with self._lock:
+            self._parado = True
+            self._sucessor = successor
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def submit(self, input_data) -> Future:
+        """
+        Enfileira a pontuação de um DataFrame (ou matriz de features).
+
+        A matriz de features é montada na thread de quem chama; a thread do
+        serviço apenas empilha as matrizes e executa a predição.
+
+        Returns:
+            Future com o array de probabilidades de match, uma por linha
+        """
+        if self._parado:
+            return self._encaminhar(input_data)
+        if self._thread is None:
+            self.start()
+        futuro: Future = Future()
+        X = self.predictor.plan.matrix(input_data)
+        if len(X) == 0:
+            futuro.set_result(np.empty(0))
+            return futuro
+        with self._lock:
+            if not self._parado:
+                self._fila.put((X, futuro, time.perf_counter()))
+                return futuro
+        # Parado enquanto a matriz era montada
+        return self._encaminhar(input_data)
+
+    def _encaminhar(self, input_data) -> Future:
+        if self._sucessor is None:
+            raise RuntimeError("O serviço de pontuação foi parado.")
+        return self._sucessor.submit(input_data)
+
+    def predict_batch(self, input_data, timeout: Optional[float] = DEFAULT_TIMEOUT) -> np.ndarray:
+        """Pontua e espera o resultado (concurrent.futures.TimeoutError após `timeout` segundos)."""
+        return self.submit(input_data).result(timeout)
+
+    def predict_snapshot(self, snapshot, rows=None, timeout: Optional[float] = DEFAULT_TIMEOUT) -> np.ndarray:
+        """
+        Pontua linhas do snapshot memory-mapped de features (ver
+        `MatchPredictor.predict_snapshot`): com `rows` fatia, a matriz enviada
+        ao lote é uma visão do arquivo mapeado, sem DataFrame nem cópia.
+        """
+        return self.predict_batch(snapshot.feature_matrix(self.predictor.feature_columns, rows), timeout)
+
+    def create_ranking(self, df_candidates, parameters=False):
+        probs = self.predict_batch(df_candidates)
+        df_ranking = df_candidates.copy()
+        df_ranking['probabilidade_match'] = probs
+        df_ranking = df_ranking.sort_values('probabilidade_match', ascending=False)
+        if parameters: return df_ranking
+        else:
+            colunas_para_exibir = ['codigo', 'id_vaga', 'probabilidade_match']
+            return df_ranking[colunas_para_exibir]
+
+    def _coletar_lote(self, primeiro) -> List[Tuple[np.ndarray, Future, float]]:
+        """Junta pedidos até a janela de latência expirar ou o lote encher."""
+        lote = [primeiro]
+        linhas = len(primeiro[0])
+        prazo = primeiro[2] + self.max_delay
+        while linhas < self.max_batch_rows:
+            restante = prazo - time.perf_counter()
+            try:
+                pedido = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+            except queue.Empty:
+                break
+            lote.append(pedido)
+            linhas += len(pedido[0])
+        return lote
+
+    def _loop(self):
+        # Ao parar, os pedidos já enfileirados ainda são atendidos
+        while True:
+            try:
+                primeiro = self._fila.get(timeout=0.1)
+            except queue.Empty:
+                with self._lock:
+                    if self._parado and self._fila.empty():
+                        return
+                continue
+            lote = self._coletar_lote(primeiro)
+            inicio = time.perf_counter()
+            matrizes = [X for X, _, _ in lote]
+            try:
+                probs = self.predictor.predict_batch(np.vstack(matrizes) if len(matrizes) > 1 else matrizes[0])
+            except Exception as erro:
+                for _, futuro, _ in lote:
+                    futuro.set_exception(erro)
+                self._registrar(lote, inicio, erro=True)
+                continue
+
+            fim = 0
+            for X, futuro, _ in lote:
+                futuro.set_result(probs[fim:fim + len(X)])
+                fim += len(X)
+            self._registrar(lote, inicio)
+
+    def _registrar(self, lote, inicio: float, erro: bool = False):
+        atrasos = [inicio - enfileirado for _, _, enfileirado in lote]
+        with self._lock:
+            self._lotes.append((len(lote), sum(len(X) for X, _, _ in lote)))
+            self._atrasos.extend(atrasos)
+            self._totais['requests'] += len(lote)
+            self._totais['rows'] += sum(len(X) for X, _, _ in lote)
+            self._totais['batches'] += 1
+            self._totais['errors'] += int(erro)
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Métricas do serviço: totais desde o início e, para os lotes recentes,
+        tamanho dos lotes (pedidos e linhas) e, para os pedidos recentes,
+        atraso de cada pedido na fila (ms).
+        """
+        with self._lock:
+            lotes = np.array(self._lotes, dtype=np.float64).reshape(-1, 2)
+            atrasos = np.array(self._atrasos, dtype=np.float64)
+            metricas = dict(self._totais)
+        metricas['queue_size'] = self._fila.qsize()
+        if len(lotes):
+            metricas.update({
+                'batch_requests_mean': float(lotes[:, 0].mean()),
+                'batch_requests_max': int(lotes[:, 0].max()),
+                'batch_rows_mean': float(lotes[:, 1].mean()),
+                'batch_rows_max': int(lotes[:, 1].max()),
+            })
+        if len(atrasos):
+            metricas.update({
+                'queue_delay_ms_mean': float(atrasos.mean() * 1000),
+                'queue_delay_ms_p95': float(np.percentile(atrasos, 95) * 1000),
+                'queue_delay_ms_max': float(atrasos.max() * 1000),
+            })
+        return metricas
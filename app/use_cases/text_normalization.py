@@ -0,0 +1,95 @@
+import unicodedata
+from typing import FrozenSet, List, Optional
+
+# Lista de stopwords em português do NLTK (corpus "stopwords", arquivo
+# "portuguese"), embutida para que a tokenização não dependa do NLTK nem de
+# download em tempo de execução.
+STOPWORDS_PT: FrozenSet[str] = frozenset("""
+a à ao aos aquela aquelas aquele aqueles aquilo as às até com como da das de
+dela delas dele deles depois do dos e é ela elas ele eles em entre era eram
+éramos essa essas esse esses esta está estamos estão estar estas estava
+estavam estávamos este esteja estejam estejamos estes esteve estive estivemos
+estiver estivera estiveram estivéramos estiverem estivermos estivesse
+estivessem estivéssemos estou eu foi fomos for fora foram fôramos forem
+formos fosse fossem fôssemos fui há haja hajam hajamos hão havemos haver hei
+houve houvemos houver houvera houverá houveram houvéramos houverão houverei
+houverem houveremos houveria houveriam houveríamos houvermos houvesse
+houvessem houvéssemos isso isto já lhe lhes mais mas me mesmo meu meus minha
+minhas muito na não nas nem no nos nós nossa nossas nosso nossos num numa o os
+ou para pela pelas pelo pelos por qual quando que quem são se seja sejam
+sejamos sem ser será serão serei seremos seria seriam seríamos seu seus só
+somos sou sua suas também te tem tém temos tenha tenham tenhamos tenho terá
+terão terei teremos teria teriam teríamos teu teus teve tinha tinham tínhamos
+tive tivemos tiver tivera tiveram tivéramos tiverem tivermos tivesse
+tivessem tivéssemos tu tua tuas um uma você vocês vos
+""".split())
+
+
+class _PunctuationTable(dict):
+    """
+    Tabela de `str.translate` que remove todo caractere que não é de palavra
+    nem espaço — o mesmo que `re.sub(r'[^\\w\\s]', '', texto)`.
+
+    A faixa ASCII/Latin-1 é preenchida na criação; os demais caracteres são
+    classificados no primeiro uso (`__missing__`) e memorizados.
+    """
+
+    def __init__(self):
+        super().__init__()
+        for codigo in range(256):
+            self[codigo]
+
+    def __missing__(self, codigo: int) -> Optional[int]:
+        caractere = chr(codigo)
+        valor = codigo if (caractere.isalnum() or caractere == '_' or caractere.isspace()) else None
+        self[codigo] = valor
+        return valor
+
+
+PUNCTUATION_TABLE = _PunctuationTable()
+
+
+def strip_accents(text: str) -> str:
+    """Remove acentos e cedilha (decomposição NFKD sem as marcas combinantes)."""
+    decomposto = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+
+class TextNormalizer:
+    """
+    Limpeza de texto compartilhada pela compatibilidade CV x vaga, pelas
+    features e pelo índice invertido: remove pontuação, converte para
+    minúsculas e remove stopwords em português, sem NLTK e sem expressões
+    regulares.
+
+    Com `remove_accents=True` os acentos também são removidos (de texto e
+    stopwords), de forma que "programação" e "programacao" virem o mesmo
+    token. Fica desligado por padrão porque muda os tokens usados no treino.
+    """
+
+    def __init__(self, remove_accents: bool = False, stopwords: FrozenSet[str] = STOPWORDS_PT):
+        """
+        Args:
+            remove_accents: Se True, remove acentos antes de separar as palavras
+            stopwords: Palavras descartadas (em minúsculas)
+        """
+        self.remove_accents = remove_accents
+        self.stopwords = frozenset(strip_accents(p) for p in stopwords) if remove_accents else frozenset(stopwords)
+
+    def words(self, text: Optional[str]) -> List[str]:
+        """Palavras limpas do texto, na ordem original (com repetições)."""
+        if not isinstance(text, str) or not text:
+            return []
+        if self.remove_accents:
+            text = strip_accents(text)
+        texto = text.translate(PUNCTUATION_TABLE).lower()
+        stopwords = self.stopwords
+        return [palavra for palavra in texto.split() if palavra not in stopwords]
+
+    def clean(self, text: Optional[str]) -> str:
+        """Texto limpo: palavras sem pontuação e sem stopwords, separadas por espaço."""
+        return " ".join(self.words(text))
+
+
+# Instância padrão (sem remoção de acentos), usada pelos casos de uso
+DEFAULT_NORMALIZER = TextNormalizer()
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos do app importam uns aos outros a partir de app/ (ex.: `from use_cases...`)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+from interface_adapters.data_store import DataStore
+
+
+@pytest.fixture(autouse=True)
+def data_store_limpo():
+    """Cada teste começa com o cache de tabelas do processo vazio."""
+    DataStore._instance = None
+    yield
+    DataStore._instance = None
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Diretório de trabalho com a estrutura app/data usada pelos caminhos relativos do projeto."""
+    for camada in ('bronze', 'silver', 'gold'):
+        (tmp_path / 'app' / 'data' / camada).mkdir(parents=True)
+    (tmp_path / 'app' / 'model').mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
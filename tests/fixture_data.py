@@ -0,0 +1,149 @@
+"""Tabelas pequenas no formato dos JSONs exportados, usadas como fixture pelos testes."""
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def vaga(titulo, estado='São Paulo', ingles='Avançado', areas='TI - Sistemas e Ferramentas-',
+         atividades='Desenvolvimento de sistemas em Python e SQL', data='04-05-2021', **extra):
+    """Registro de vaga no formato do JSON exportado."""
+    registro = {
+        'informacoes_basicas': {
+            'data_requicisao': data,
+            'limite_esperado_para_contratacao': '00-00-0000',
+            'titulo_vaga': titulo,
+            'vaga_sap': 'Não',
+            'tipo_contratacao': 'CLT Full',
+            'prazo_contratacao': 'Indeterminado',
+            'prioridade_vaga': '',
+            'origem_vaga': 'Nova Posição',
+        },
+        'perfil_vaga': {
+            'pais': 'Brasil',
+            'estado': estado,
+            'nivel profissional': 'Sênior',
+            'nivel_academico': 'Ensino Superior Completo',
+            'nivel_ingles': ingles,
+            'nivel_espanhol': 'Nenhum',
+            'areas_atuacao': areas,
+            'principais_atividades': atividades,
+            'competencia_tecnicas_e_comportamentais': 'Experiência com bancos de dados',
+            'demais_observacoes': '',
+            'viagens_requeridas': '',
+        },
+    }
+    for secao, campos in extra.items():
+        registro.setdefault(secao, {}).update(campos)
+    return registro
+
+
+def applicant(codigo, nome, cv='Analista de sistemas com experiência em Python', ingles='Avançado',
+              areas='TI - Sistemas e Ferramentas', criado='10-11-2021 11:10:00'):
+    """Registro de aplicante no formato do JSON exportado."""
+    return {
+        'infos_basicas': {
+            'codigo_profissional': codigo,
+            'nome': nome,
+            'data_criacao': criado,
+            'sabendo_de_nos': 'Site',
+        },
+        'informacoes_pessoais': {'sexo': 'Feminino', 'data_nascimento': '01-01-1990'},
+        'informacoes_profissionais': {'area_atuacao': areas, 'nivel_profissional': 'Sênior'},
+        'formacao_e_idiomas': {
+            'nivel_academico': 'Ensino Superior Completo',
+            'nivel_ingles': ingles,
+            'nivel_espanhol': 'Básico',
+        },
+        'cv_pt': cv,
+    }
+
+
+def prospect(codigo, nome, situacao='Encaminhado ao Requisitante', data='25-03-2021'):
+    """Candidatura (item da lista `prospects` de uma vaga) no formato do JSON exportado."""
+    return {
+        'nome': nome,
+        'codigo': codigo,
+        'situacao_candidado': situacao,
+        'data_candidatura': data,
+        'ultima_atualizacao': data,
+        'comentario': '',
+        'recrutador': 'Ana Lívia Moreira',
+    }
+
+
+def bronze_inicial():
+    """Exportação pequena: 4 vagas, 6 aplicantes e suas candidaturas (uma vaga sem candidatos)."""
+    vagas = {
+        '4530': vaga('Consultor Control M'),
+        '4531': vaga('Desenvolvedor Java', estado='Rio de Janeiro', ingles='Intermediário'),
+        '4532': vaga('Analista SAP', ingles='Fluente', areas='Gestão e Alocação de Recursos de TI-'),
+        '4533': vaga('Vaga sem candidatos'),
+    }
+    applicants = {
+        '100': applicant('100', 'Ana'),
+        '101': applicant('101', 'Bruno', cv='Desenvolvedor Java e Spring', ingles='Básico'),
+        '102': applicant('102', 'Carla', cv='Consultora SAP FI', areas='Gestão e Alocação de Recursos de TI'),
+        '103': applicant('103', 'Diego'),
+        '104': applicant('104', 'Elisa', cv='Analista de testes'),
+        '105': applicant('105', 'Fábio', cv='Sem candidaturas'),
+    }
+    prospects = {
+        '4530': {'titulo': 'Consultor Control M', 'modalidade': '',
+                 'prospects': [prospect('100', 'Ana'), prospect('103', 'Diego', 'Contratado pela Decision')]},
+        '4531': {'titulo': 'Desenvolvedor Java', 'modalidade': '',
+                 'prospects': [prospect('101', 'Bruno'), prospect('104', 'Elisa', 'Não Aprovado pelo Cliente')]},
+        '4532': {'titulo': 'Analista SAP', 'modalidade': 'PJ/Autônomo',
+                 'prospects': [prospect('102', 'Carla', 'Prospect'), prospect('100', 'Ana', 'Desistiu')]},
+        '4533': {'titulo': 'Vaga sem candidatos', 'modalidade': '', 'prospects': []},
+        # Candidatura de aplicante que não existe na exportação de aplicantes
+        '4534': {'titulo': 'Vaga fora da exportação', 'modalidade': '', 'prospects': [prospect('999', 'Zé')]},
+    }
+    return vagas, applicants, prospects
+
+
+def escrever_bronze(vagas, applicants, prospects):
+    """Grava os JSONs exportados em app/data/bronze (diretório de trabalho atual)."""
+    for nome, dados in (('vagas', vagas), ('applicants', applicants), ('prospects', prospects)):
+        with open(f'app/data/bronze/{nome}.json', 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False)
+
+
+# Linhas fora de ordem de vaga e de aplicante, com o mesmo aplicante em várias
+# vagas e vagas cuja ordem textual difere da numérica ('10' < '9')
+CHAVES = [
+    ('4,530', '25,632'), ('9', '31'), ('10', '7'), ('4,530', '7'), ('9', '25,632'),
+    ('12,001', '31'), ('10', '25,632'), ('4,530', '31'), ('9', '7'), ('10', '1,000'),
+]
+
+
+def features(formato='texto'):
+    """DataFrame no formato de df_features.parquet, com chaves no formato pedido."""
+    id_vaga = [v for v, _ in CHAVES]
+    codigo = [c for _, c in CHAVES]
+    if formato == 'inteiro':
+        id_vaga = [int(v.replace(',', '')) for v in id_vaga]
+        codigo = [int(c.replace(',', '')) for c in codigo]
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'id_vaga': id_vaga,
+        'dict_prospect_codigo': np.arange(len(CHAVES)),
+        'compatibilidade_vaga_cv_percentual': rng.random(len(CHAVES)),
+        'match_ingles': rng.integers(0, 2, len(CHAVES)),
+        'codigo': codigo,
+    })
+
+
+def filtro_antigo(df_features, coluna, valor):
+    """Consulta anterior ao FeatureStore: normaliza a coluna da tabela inteira e filtra."""
+    df_features = df_features.copy()
+    df_features[coluna] = df_features[coluna].astype(str).str.replace(",", "")
+    return df_features[df_features[coluna] == valor]
+
+
+def normalizar(df):
+    """Índice posicional e chaves como texto sem vírgulas, para comparar consultas."""
+    df = df.reset_index(drop=True)
+    for coluna in ('id_vaga', 'codigo'):
+        df[coluna] = df[coluna].astype(str).str.replace(",", "").astype(object)
+    return df
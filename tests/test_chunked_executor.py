@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fixture_data import bronze_inicial, escrever_bronze
+from use_cases.chunked_executor import ChunkedExecutor
+from use_cases.featureengineering import CandidateFeatureEngineer
+from use_cases.pipeline import Pipeline
+
+
+def dobrar(bloco: pd.DataFrame, fator: int = 2) -> pd.DataFrame:
+    """Tarefa de teste: uma linha de resultado por linha do bloco, no índice do bloco."""
+    return pd.DataFrame({'valor': bloco['valor'] * fator, 'pid': os.getpid()}, index=bloco.index)
+
+
+def pid_do_worker(_):
+    return os.getpid()
+
+
+def frame_com_indice_repetido():
+    # Índice repetido e fora de ordem, como o de um concat sem ignore_index
+    chaves = ['b', 'a', 'c', 'a', 'b', 'd', 'a', 'c', 'e', 'b']
+    return pd.DataFrame({'id_vaga': chaves, 'valor': np.arange(len(chaves))},
+                        index=[3, 3, 0, 1, 0, 2, 2, 1, 3, 0])
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_map_frame_remonta_por_posicao_com_indice_repetido(n_workers):
+    df = frame_com_indice_repetido()
+
+    with ChunkedExecutor(n_workers, chunks_per_worker=2) as executor:
+        resultado = executor.map_frame(dobrar, df, 'id_vaga', 3)
+
+    assert len(resultado) == len(df)
+    assert resultado.index.tolist() == df.index.tolist()
+    assert resultado['valor'].tolist() == (df['valor'] * 3).tolist()
+
+
+def test_split_positions_nao_divide_chaves():
+    df = frame_com_indice_repetido()
+    executor = ChunkedExecutor(2, chunks_per_worker=2)
+
+    posicoes = executor.split_positions(df, 'id_vaga')
+
+    assert sorted(np.concatenate(posicoes).tolist()) == list(range(len(df)))
+    chaves_por_bloco = [set(df['id_vaga'].iloc[p]) for p in posicoes]
+    for i, chaves in enumerate(chaves_por_bloco):
+        for outras in chaves_por_bloco[i + 1:]:
+            assert not chaves & outras
+    assert [p.tolist() for p in executor.split_positions(df, 'id_vaga')] == [p.tolist() for p in posicoes]
+    pd.testing.assert_frame_equal(executor.split(df, 'id_vaga')[0], df.iloc[posicoes[0]])
+    assert executor.split_positions(df.iloc[:0], 'id_vaga') == []
+
+
+def test_pool_reaproveitado_ate_fechar():
+    executor = ChunkedExecutor(2)
+    with executor:
+        primeiros = set(executor.run(pid_do_worker, [(i,) for i in range(8)]))
+        pool = executor._pool
+        segundos = set(executor.run(pid_do_worker, [(i,) for i in range(8)]))
+
+        assert executor._pool is pool
+        assert os.getpid() not in primeiros | segundos
+        assert len(primeiros | segundos) <= 2
+    assert executor._pool is None
+
+
+def test_process_all_paralelo_igual_ao_serial(workdir):
+    escrever_bronze(*bronze_inicial())
+    Pipeline.bronze()
+    Pipeline.silver()
+    CandidateFeatureEngineer().process_all('app/data/silver/df_features_train.parquet',
+                                           trainmodel=True, snapshot=False)
+
+    serial = CandidateFeatureEngineer().process_all('app/data/silver/serial.parquet', snapshot=False)
+    engenheiro = CandidateFeatureEngineer(n_workers=2)
+    paralelo = engenheiro.process_all('app/data/silver/paralelo.parquet', snapshot=False)
+
+    pd.testing.assert_frame_equal(paralelo, serial)
+    assert engenheiro.executor._pool is None
@@ -0,0 +1,80 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from use_cases.encoders import CategoricalEncoders
+
+COLUNAS = ['nivel', 'codigo', 'data']
+
+
+def base_de_ajuste():
+    return pd.DataFrame({
+        'nivel': pd.Categorical(['Sênior', 'Pleno', None, 'Júnior', 'Pleno', 'Sênior'],
+                                categories=['Júnior', 'Pleno', 'Sênior', 'Especialista']),
+        'codigo': [30, 10, 20, 10, np.nan, 30],
+        'data': pd.to_datetime(['2021-05-04', None, '2021-01-02', '2021-05-04', '2020-12-31', None]),
+        'texto': ['b', 'a', 'b', 'c', 'a', 'a'],
+    })
+
+
+@pytest.mark.parametrize('coluna', COLUNAS + ['texto'])
+def test_codigos_iguais_ao_factorize_na_base_de_ajuste(coluna):
+    df = base_de_ajuste()
+    encoders = CategoricalEncoders().fit(df, COLUNAS + ['texto'])
+
+    esperado = pd.factorize(df[coluna])[0]
+
+    np.testing.assert_array_equal(encoders.transform(df[coluna], coluna), esperado)
+    assert [encoders.transform_one(valor, coluna) for valor in df[coluna]] == esperado.tolist()
+
+
+def test_codigos_nao_dependem_do_lote():
+    df = base_de_ajuste()
+    encoders = CategoricalEncoders().fit(df, ['texto'])
+
+    # Ordem invertida e uma linha só recebem os códigos da base de ajuste
+    assert encoders.transform(['c', 'a', 'b'], 'texto').tolist() == [2, 1, 0]
+    assert encoders.transform(['a'], 'texto').tolist() == [1]
+
+
+def test_desconhecidos_e_nulos_viram_menos_um():
+    encoders = CategoricalEncoders().fit(base_de_ajuste(), COLUNAS + ['texto'])
+
+    assert encoders.transform(['a', 'z', None, np.nan], 'texto').tolist() == [1, -1, -1, -1]
+    assert encoders.transform(pd.Categorical(['Especialista', 'Pleno', None]), 'nivel').tolist() == [-1, 1, -1]
+    assert encoders.transform([10.0, 99.0, np.nan], 'codigo').tolist() == [1, -1, -1]
+    assert encoders.transform(pd.to_datetime(['2021-01-02', '1999-01-01', None]), 'data').tolist() == [1, -1, -1]
+    assert [encoders.transform_one(valor, 'texto') for valor in ('z', None, np.nan, ['lista'])] == [-1] * 4
+
+
+def test_fit_ignora_colunas_ausentes_e_reajusta():
+    encoders = CategoricalEncoders().fit(base_de_ajuste(), ['texto', 'inexistente'])
+    assert encoders.has('texto') and not encoders.has('inexistente')
+
+    encoders.transform(['a'], 'texto')
+    encoders.fit(pd.DataFrame({'texto': ['c', 'a']}), ['texto'])
+
+    assert encoders.transform(['a', 'b', 'c'], 'texto').tolist() == [1, -1, 0]
+    assert encoders.transform_one('c', 'texto') == 0
+
+
+def test_save_load(tmp_path):
+    df = base_de_ajuste()
+    encoders = CategoricalEncoders().fit(df, COLUNAS + ['texto'])
+    caminho = str(tmp_path / 'model' / 'encoders.pkl')
+
+    encoders.save(caminho)
+    carregados = CategoricalEncoders.load(caminho)
+
+    assert carregados.vocabularies.keys() == encoders.vocabularies.keys()
+    for coluna in COLUNAS + ['texto']:
+        np.testing.assert_array_equal(carregados.transform(df[coluna], coluna), pd.factorize(df[coluna])[0])
+
+
+def test_load_recusa_outra_versao(tmp_path):
+    caminho = str(tmp_path / 'encoders.pkl')
+    joblib.dump({'version': '0', 'vocabularies': {}}, caminho)
+
+    with pytest.raises(ValueError, match="Versão de encoders incompatível"):
+        CategoricalEncoders.load(caminho)
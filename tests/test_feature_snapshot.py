@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fixture_data import features, filtro_antigo, normalizar
+from interface_adapters.data_store import file_hash
+from interface_adapters.feature_snapshot import FeatureSnapshot, snapshot_path
+from use_cases.get_features import GetFeaturesCase
+
+
+def comparar(obtido, df_features, coluna, valor, snapshot):
+    """Compara com o filtro antigo, nas colunas do snapshot e com as features em float32."""
+    df = normalizar(filtro_antigo(df_features, coluna, valor))
+    esperado = df[['id_vaga', 'codigo'] + snapshot.columns].astype({nome: np.float32 for nome in snapshot.columns})
+    assert (obtido[snapshot.columns].dtypes == np.float32).all()
+    # Chaves em texto: object ou str conforme a versão do pandas
+    pd.testing.assert_frame_equal(normalizar(obtido), esperado, check_dtype=False)
+
+
+@pytest.fixture(params=['texto', 'inteiro'])
+def snapshot_e_features(request, tmp_path):
+    df = features(request.param)
+    return FeatureSnapshot.build(str(tmp_path / 'df_features_snapshot'), df), df
+
+
+@pytest.mark.parametrize('vaga', ['4530', '9', '10', '12001', '999'])
+def test_get_vaga_igual_ao_filtro_antigo(snapshot_e_features, vaga):
+    snapshot, df = snapshot_e_features
+
+    comparar(snapshot.get_vaga(vaga), df, 'id_vaga', vaga, snapshot)
+
+
+@pytest.mark.parametrize('codigo', ['25632', '31', '7', '1000', '999'])
+def test_get_applicant_igual_ao_filtro_antigo(snapshot_e_features, codigo):
+    snapshot, df = snapshot_e_features
+
+    comparar(snapshot.get_applicant(codigo), df, 'codigo', codigo, snapshot)
+
+
+@pytest.mark.parametrize('vaga, applicant', [('4,530', '25,632'), (4530, 25632), (4530.0, 25632.0)])
+def test_chaves_formatadas(snapshot_e_features, vaga, applicant):
+    snapshot, _ = snapshot_e_features
+
+    assert snapshot.get_vaga(vaga)['codigo'].tolist() == ['25632', '7', '31']
+    assert snapshot.get_applicant(applicant)['id_vaga'].tolist() == ['4530', '9', '10']
+
+
+def test_reabre_o_snapshot_gravado(snapshot_e_features):
+    snapshot, df = snapshot_e_features
+
+    reaberto = FeatureSnapshot(snapshot.path)
+
+    assert isinstance(reaberto.matrix, np.memmap)
+    assert len(reaberto) == len(df)
+    pd.testing.assert_frame_equal(reaberto.get_applicant('7'), snapshot.get_applicant('7'))
+
+
+def test_get_features_case_ignora_snapshot_desatualizado(tmp_path):
+    caminho = str(tmp_path / 'df_features.parquet')
+    df = features()
+    df.to_parquet(caminho, index=False)
+    FeatureSnapshot.build(snapshot_path(caminho), df, source=file_hash(caminho))
+    case = GetFeaturesCase(str(tmp_path))
+
+    snapshot = case.snapshot()
+    assert snapshot is not None
+    assert case.get_features_vaga('4530')['codigo'].tolist() == ['25632', '7', '31']
+
+    # Parquet regravado sem regerar o snapshot: as consultas voltam ao FeatureStore
+    df[df['id_vaga'] != '4,530'].to_parquet(caminho, index=False)
+    assert case.snapshot() is None
+    assert case.get_features_vaga('4530').empty
+    assert case.get_features_applicants('7')['id_vaga'].tolist() == ['10', '9']
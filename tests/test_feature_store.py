@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from fixture_data import features, filtro_antigo, normalizar
+from interface_adapters.feature_store import FeatureStore
+from use_cases.get_features import GetFeaturesCase
+
+
+@pytest.mark.parametrize('formato', ['texto', 'inteiro'])
+@pytest.mark.parametrize('vaga', ['4530', '9', '10', '12001', '999'])
+def test_get_vaga_igual_ao_filtro_antigo(formato, vaga):
+    df = features(formato)
+
+    obtido = FeatureStore(df).get_vaga(vaga)
+
+    pd.testing.assert_frame_equal(normalizar(obtido), normalizar(filtro_antigo(df, 'id_vaga', vaga)))
+
+
+@pytest.mark.parametrize('formato', ['texto', 'inteiro'])
+@pytest.mark.parametrize('codigo', ['25632', '31', '7', '1000', '999'])
+def test_get_applicant_igual_ao_filtro_antigo(formato, codigo):
+    df = features(formato)
+
+    obtido = FeatureStore(df).get_applicant(codigo)
+
+    pd.testing.assert_frame_equal(normalizar(obtido), normalizar(filtro_antigo(df, 'codigo', codigo)))
+
+
+@pytest.mark.parametrize('chave', ['4,530', '4530', 4530, 4530.0, ' 4530 '])
+def test_get_vaga_aceita_chaves_formatadas(chave):
+    store = FeatureStore(features())
+
+    obtido = store.get_vaga(chave)
+
+    assert obtido['codigo'].tolist() == ['25632', '7', '31']
+    assert obtido['dict_prospect_codigo'].tolist() == [0, 3, 7]
+
+
+@pytest.mark.parametrize('chave', ['25,632', '25632', 25632, 25632.0])
+def test_get_applicant_aceita_chaves_formatadas(chave):
+    store = FeatureStore(features('inteiro'))
+
+    obtido = store.get_applicant(chave)
+
+    assert obtido['id_vaga'].tolist() == ['4530', '9', '10']
+    assert obtido['dict_prospect_codigo'].tolist() == [0, 4, 6]
+
+
+def test_get_features_case_le_o_parquet_e_recarrega_quando_muda(tmp_path):
+    caminho = tmp_path / 'df_features.parquet'
+    df = features()
+    df.to_parquet(caminho, index=False)
+    case = GetFeaturesCase(str(tmp_path))
+
+    assert case.snapshot() is None
+    assert case.get_features_vaga('4530')['codigo'].tolist() == ['25632', '7', '31']
+    assert case.get_features_applicants('1,000')['id_vaga'].tolist() == ['10']
+
+    df[df['id_vaga'] != '4,530'].to_parquet(caminho, index=False)
+    assert case.get_features_vaga('4530').empty
+    assert case.get_features_vaga('9')['codigo'].tolist() == ['31', '25632', '7']
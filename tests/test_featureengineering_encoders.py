@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from fixture_data import bronze_inicial, escrever_bronze
+from use_cases.encoders import CategoricalEncoders
+from use_cases.featureengineering import CandidateFeatureEngineer
+from use_cases.online_features import OnlineFeatureBuilder
+from use_cases.pipeline import Pipeline
+
+ENCODERS = 'app/model/encoders.pkl'
+TREINO = 'app/data/silver/df_features_train.parquet'
+SAIDA = 'app/data/silver/df_features.parquet'
+
+
+@pytest.fixture
+def silver(workdir):
+    escrever_bronze(*bronze_inicial())
+    Pipeline.bronze()
+    Pipeline.silver()
+
+
+def test_sem_encoders_do_treino_falha_sem_ajustar(silver):
+    with pytest.raises(FileNotFoundError, match="trainmodel=True"):
+        CandidateFeatureEngineer().process_all(SAIDA, snapshot=False)
+
+    assert not os.path.exists(ENCODERS)
+    assert not os.path.exists(SAIDA)
+
+
+def test_somente_o_treino_ajusta_e_salva_os_encoders(silver):
+    CandidateFeatureEngineer().process_all(TREINO, trainmodel=True, snapshot=False)
+    encoders = CategoricalEncoders.load(ENCODERS)
+    assert encoders.has('status_geral')
+    assert encoders.has('perfil_vaga.nivel_ingles')
+    modificado = os.stat(ENCODERS).st_mtime_ns
+
+    df = CandidateFeatureEngineer().process_all(SAIDA, snapshot=False)
+
+    assert os.stat(ENCODERS).st_mtime_ns == modificado
+    assert CategoricalEncoders.load(ENCODERS).vocabularies == encoders.vocabularies
+    # Os registros em andamento ficam fora do treino e recebem -1, sem entrar no vocabulário
+    assert 'Andamento' not in encoders.vocabularies['status_geral']
+    # (Ana na 4530, Bruno na 4531 e Carla na 4532)
+    assert (df['status_geral_codificado'] == -1).sum() == 3
+    treino = pd.read_parquet(TREINO)
+    assert set(treino['status_geral_codificado']) == set(range(len(encoders.vocabularies['status_geral'])))
+
+
+def test_coluna_sem_encoder_fora_do_treino_e_erro(silver):
+    CandidateFeatureEngineer().process_all(TREINO, trainmodel=True, snapshot=False)
+    encoders = CategoricalEncoders.load(ENCODERS)
+    del encoders.vocabularies['status_geral']
+    encoders.save(ENCODERS)
+
+    with pytest.raises(ValueError, match="status_geral"):
+        CandidateFeatureEngineer().process_all(SAIDA, snapshot=False)
+
+    assert not CategoricalEncoders.load(ENCODERS).has('status_geral')
+
+
+def test_fit_encoders_igual_ao_treino(silver):
+    CandidateFeatureEngineer().process_all(TREINO, trainmodel=True, snapshot=False)
+    do_treino = CategoricalEncoders.load(ENCODERS).vocabularies
+    os.remove(ENCODERS)
+
+    ajustados = CandidateFeatureEngineer().fit_encoders()
+
+    assert ajustados.vocabularies == do_treino
+    assert CategoricalEncoders.load(ENCODERS).vocabularies == do_treino
+    assert not os.path.exists(SAIDA)
+
+
+def test_passo_unico_de_encoders_libera_a_geracao_online(silver):
+    with pytest.raises(FileNotFoundError, match="--encoders"):
+        OnlineFeatureBuilder()
+
+    script = os.path.join(os.path.dirname(__file__), '..', 'app', 'use_cases', 'featureengineering.py')
+    subprocess.run([sys.executable, script, '--encoders'], check=True, capture_output=True)
+
+    assert CategoricalEncoders.load(ENCODERS).has('status_geral')
+    assert OnlineFeatureBuilder().engineer.encoders_path == ENCODERS
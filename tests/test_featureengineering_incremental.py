@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+from fixture_data import applicant, bronze_inicial, escrever_bronze, prospect, vaga
+from use_cases.featureengineering import CandidateFeatureEngineer
+from use_cases.pipeline import Pipeline
+
+SAIDA = 'app/data/silver/df_features.parquet'
+
+
+def gerar_silver(vagas, applicants, prospects):
+    escrever_bronze(vagas, applicants, prospects)
+    Pipeline.bronze()
+    Pipeline.silver()
+
+
+@pytest.fixture
+def contagem(monkeypatch):
+    """Conta as linhas que passam pelos cálculos por linha (compatibilidade e match de áreas)."""
+    linhas = {'compatibilidade': 0, 'areas': 0}
+    compatibilidade = CandidateFeatureEngineer._compatibilidade_bloco
+    match_areas = CandidateFeatureEngineer._calcular_match_profissional
+
+    def compatibilidade_contada(self, df_bloco, df_vagas):
+        linhas['compatibilidade'] += len(df_bloco)
+        return compatibilidade(self, df_bloco, df_vagas)
+
+    def match_areas_contado(self, row):
+        linhas['areas'] += 1
+        return match_areas(self, row)
+
+    monkeypatch.setattr(CandidateFeatureEngineer, '_compatibilidade_bloco', compatibilidade_contada)
+    monkeypatch.setattr(CandidateFeatureEngineer, '_calcular_match_profissional', match_areas_contado)
+    return linhas
+
+
+@pytest.fixture
+def silver_com_features(workdir):
+    """Silver da exportação inicial, encoders ajustados na base de treino e features já calculadas."""
+    vagas, applicants, prospects = bronze_inicial()
+    gerar_silver(vagas, applicants, prospects)
+    CandidateFeatureEngineer().process_all('app/data/silver/df_features_train.parquet',
+                                           trainmodel=True, snapshot=False)
+    CandidateFeatureEngineer().process_all(SAIDA, snapshot=False)
+    return vagas, applicants, prospects
+
+
+def test_incremental_igual_a_recalculo_completo(silver_com_features, contagem):
+    vagas, applicants, prospects = silver_com_features
+    # Uma vaga (2 candidaturas), um aplicante (1 candidatura) e uma candidatura alterados
+    vagas['4531'] = vaga('Desenvolvedor Java Sênior', estado='Rio de Janeiro', ingles='Intermediário',
+                         atividades='Desenvolvimento backend em Java, Spring e Kafka')
+    applicants['102'] = applicant('102', 'Carla', cv='Consultora SAP FI e CO', areas='TI - Sistemas e Ferramentas')
+    prospects['4530']['prospects'][1] = prospect('103', 'Diego', 'Proposta Aceita')
+    gerar_silver(vagas, applicants, prospects)
+
+    incremental = CandidateFeatureEngineer().process_all(SAIDA, incremental=True, snapshot=False)
+    assert contagem == {'compatibilidade': 4, 'areas': 4}
+
+    contagem.update(compatibilidade=0, areas=0)
+    completo = CandidateFeatureEngineer().process_all('app/data/silver/df_features_completo.parquet',
+                                                      snapshot=False)
+    assert contagem == {'compatibilidade': 6, 'areas': 6}
+
+    pd.testing.assert_frame_equal(incremental, completo)
+    pd.testing.assert_frame_equal(pd.read_parquet(SAIDA),
+                                  pd.read_parquet('app/data/silver/df_features_completo.parquet'))
+    linha = completo.set_index(['id_vaga', 'codigo']).loc[(4531, 101)]
+    assert linha['compatibilidade_vaga_cv_palavras'] > 0
+
+
+def test_incremental_sem_alteracoes_reaproveita_todas_as_linhas(silver_com_features, contagem, capsys):
+    anterior = pd.read_parquet(SAIDA)
+
+    atual = CandidateFeatureEngineer().process_all(SAIDA, incremental=True, snapshot=False)
+
+    assert contagem == {'compatibilidade': 0, 'areas': 0}
+    assert "6 linhas reaproveitadas, 0 linhas a recalcular" in capsys.readouterr().out
+    pd.testing.assert_frame_equal(atual, anterior)
+
+
+def test_incremental_sem_estado_recalcula_tudo(workdir, contagem):
+    gerar_silver(*bronze_inicial())
+    CandidateFeatureEngineer().process_all('app/data/silver/df_features_train.parquet',
+                                           trainmodel=True, snapshot=False)
+    contagem.update(compatibilidade=0, areas=0)
+
+    CandidateFeatureEngineer().process_all(SAIDA, incremental=True, snapshot=False)
+
+    assert contagem == {'compatibilidade': 6, 'areas': 6}
@@ -0,0 +1,127 @@
+import json
+import math
+import os
+
+import numpy as np
+import pytest
+
+from interface_adapters.inverted_index import BM25_B, BM25_K1, MAX_TERM_LENGTH, InvertedIndex
+
+CHAVES = ['100', '101', '102', '103', '104']
+DOCUMENTOS = [
+    {'python': 3, 'sql': 1, 'dados': 2},
+    {'java': 4, 'spring': 2, 'sql': 1},
+    {'python': 1, 'java': 1},
+    {'sap': 2, 'fi': 1, 'co': 1, 'dados': 1},
+    {'python': 1, 'sql': 1, 'dados': 1, 'x' * (MAX_TERM_LENGTH + 1): 5},
+]
+
+
+def bm25_referencia(termos):
+    """BM25 calculado documento a documento, sem o índice."""
+    documentos = [{t: tf for t, tf in doc.items() if len(t) <= MAX_TERM_LENGTH} for doc in DOCUMENTOS]
+    comprimentos = [sum(doc.values()) for doc in documentos]
+    media = sum(comprimentos) / len(documentos)
+    pontuacoes = []
+    for doc, comprimento in zip(documentos, comprimentos):
+        total = 0.0
+        for termo, peso in termos.items():
+            if termo not in doc:
+                continue
+            n = sum(termo in outro for outro in documentos)
+            idf = math.log(1 + (len(documentos) - n + 0.5) / (n + 0.5))
+            tf = doc[termo]
+            total += peso * idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * comprimento / media))
+        pontuacoes.append(total)
+    return pontuacoes
+
+
+@pytest.fixture(params=['memoria', 'disco'])
+def indice(request, tmp_path):
+    if request.param == 'memoria':
+        return InvertedIndex.from_documents(CHAVES, DOCUMENTOS)
+    return InvertedIndex.build(str(tmp_path / 'indice'), CHAVES, DOCUMENTOS, source='teste')
+
+
+@pytest.mark.parametrize('termos', [
+    {'python': 1.0},
+    {'python': 1.0, 'sql': 1.0, 'dados': 0.5},
+    {'java': 2.0, 'spring': 1.0, 'inexistente': 3.0},
+    {'sap': 1.0, 'x' * (MAX_TERM_LENGTH + 1): 1.0},
+])
+def test_scores_igual_ao_bm25_de_referencia(indice, termos):
+    np.testing.assert_allclose(indice.scores(termos), bm25_referencia(termos), rtol=1e-6)
+
+
+def test_query_ordena_por_pontuacao_e_chave(indice):
+    termos = {'python': 1.0, 'sql': 1.0, 'dados': 0.5}
+    referencia = bm25_referencia(termos)
+    esperado = sorted((chave for chave, p in zip(CHAVES, referencia) if p > 0),
+                      key=lambda chave: (-referencia[CHAVES.index(chave)], chave))
+
+    resultado = indice.query(termos, limit=10)
+
+    assert [chave for chave, _ in resultado] == esperado
+    np.testing.assert_allclose([p for _, p in resultado], [referencia[CHAVES.index(c)] for c in esperado], rtol=1e-6)
+    assert indice.query(termos, limit=2) == resultado[:2]
+
+
+def test_query_empate_pela_chave():
+    indice = InvertedIndex.from_documents(['b', 'c', 'a'], [{'python': 1}, {'python': 1}, {'python': 1}])
+
+    assert [chave for chave, _ in indice.query({'python': 1.0}, limit=3)] == ['a', 'b', 'c']
+
+
+def test_query_excluir(indice):
+    termos = {'python': 1.0, 'sql': 1.0, 'dados': 0.5}
+    completo = [chave for chave, _ in indice.query(termos, limit=10)]
+
+    resultado = indice.query(termos, limit=2, excluir=[completo[0], '999'])
+
+    assert [chave for chave, _ in resultado] == completo[1:3]
+    assert indice.query({'java': 1.0}, limit=10, excluir=['101', '102']) == []
+
+
+def test_query_sem_termos_em_comum(indice):
+    assert indice.query({'cobol': 1.0}, limit=5) == []
+    assert indice.query({}, limit=5) == []
+
+
+def test_reabre_o_indice_com_memory_map(tmp_path):
+    path = str(tmp_path / 'indice')
+    gravado = InvertedIndex.build(path, CHAVES, DOCUMENTOS, source='origem-1')
+    termos = {'python': 1.0, 'java': 0.5}
+
+    reaberto = InvertedIndex.open(path)
+
+    for nome in ('terms', 'offsets', 'doc_ids', 'tfs', 'doc_lengths', 'doc_keys'):
+        assert isinstance(getattr(reaberto, nome), np.memmap)
+    assert reaberto.meta['source'] == 'origem-1'
+    assert reaberto.meta['n_docs'] == len(CHAVES)
+    assert 'x' * (MAX_TERM_LENGTH + 1) not in reaberto.terms.tolist()
+    assert reaberto.query(termos, limit=10) == gravado.query(termos, limit=10)
+    assert reaberto.query(termos, limit=10) == InvertedIndex.from_documents(CHAVES, DOCUMENTOS).query(termos, limit=10)
+
+
+def test_open_recusa_indice_ausente_ou_de_outra_versao(tmp_path):
+    path = str(tmp_path / 'indice')
+    with pytest.raises(FileNotFoundError):
+        InvertedIndex.open(path)
+
+    InvertedIndex.build(path, CHAVES, DOCUMENTOS)
+    with open(os.path.join(path, '_meta.json'), encoding='utf-8') as f:
+        meta = json.load(f)
+    meta['version'] = '0'
+    with open(os.path.join(path, '_meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    assert InvertedIndex.read_meta(path) is None
+    with pytest.raises(FileNotFoundError):
+        InvertedIndex.open(path)
+
+
+def test_indice_vazio(tmp_path):
+    indice = InvertedIndex.build(str(tmp_path / 'indice'), [], [])
+
+    assert indice.n_docs == 0
+    assert indice.query({'python': 1.0}, limit=5) == []
@@ -0,0 +1,102 @@
+import json
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from fixture_data import bronze_inicial, escrever_bronze
+from interface_adapters.json_stream import iter_json_object, write_records_streaming
+from use_cases.pipeline import Pipeline
+
+OBJETO = {
+    '4530': {'titulo': 'Análise de "dados" — São Paulo', 'caminho': 'C:\\dados\\ção', 'emoji': '🚀 ok'},
+    '4531': {'lista': [1, 2.5, None, True, {'ç': 'ü'}], 'vazio': {}, 'texto': '{"não": "é objeto"}'},
+    '4,532': 12345678901234567890,
+    'ação': 'último',
+    'numero': -1.25e-3,
+    'nulo': None,
+}
+
+REGISTROS = [
+    {'codigo': '1', 'info': {'nome': 'Ana', 'idade': 30, 'areas': ['TI', 'Dados'],
+                             'historico': [{'empresa': 'X', 'anos': 2}]}, 'ativo': True, 'obs': None},
+    {'codigo': '2', 'info': {'nome': None, 'idade': 41, 'areas': [], 'nota': 7.5}, 'ativo': False, 'obs': None},
+    {'codigo': '3', 'info': {'idade': 25, 'historico': [{'empresa': 'Y', 'cargo': 'Dev'}]}, 'extra': 'só aqui'},
+    {'codigo': '4', 'info': {'nome': 'Duda', 'idade': 38, 'areas': ['RH']}, 'ativo': None},
+    {'codigo': '5', 'info': {'idade': 52}, 'obs': None},
+]
+
+
+def gravar_json(path, objeto, **opcoes):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(objeto, f, **opcoes)
+    return path
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 1 << 20])
+@pytest.mark.parametrize('opcoes', [{'ensure_ascii': False}, {'ensure_ascii': True}, {'indent': 3}])
+def test_iter_json_object_nos_limites_de_bloco(tmp_path, chunk_size, opcoes):
+    path = gravar_json(tmp_path / 'dados.json', OBJETO, **opcoes)
+
+    pares = list(iter_json_object(path, chunk_size=chunk_size))
+
+    assert pares == list(OBJETO.items())
+
+
+def test_iter_json_object_numero_no_fim_do_bloco(tmp_path):
+    # O número termina exatamente no fim do primeiro bloco e continua no seguinte
+    path = tmp_path / 'numero.json'
+    path.write_text('{"a": 1234567}', encoding='utf-8')
+
+    assert list(iter_json_object(path, chunk_size=9)) == [('a', 1234567)]
+
+
+@pytest.mark.parametrize('conteudo', ['{}', '  {\n}\n'])
+def test_iter_json_object_vazio(tmp_path, conteudo):
+    path = tmp_path / 'vazio.json'
+    path.write_text(conteudo, encoding='utf-8')
+
+    assert list(iter_json_object(path, chunk_size=7)) == []
+
+
+@pytest.mark.parametrize('conteudo', ['[1, 2]', '{"a": 1 "b": 2}', '{"a": 1,'])
+def test_iter_json_object_invalido(tmp_path, conteudo):
+    path = tmp_path / 'invalido.json'
+    path.write_text(conteudo, encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        list(iter_json_object(path, chunk_size=7))
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 3, 100])
+def test_write_records_streaming_igual_ao_json_normalize(tmp_path, batch_size):
+    esperado_path = tmp_path / 'esperado.parquet'
+    streaming_path = tmp_path / 'streaming.parquet'
+    pd.json_normalize(REGISTROS).to_parquet(esperado_path, index=False)
+
+    total = write_records_streaming(lambda: iter(REGISTROS), streaming_path, batch_size=batch_size)
+
+    assert total == len(REGISTROS)
+    assert pq.ParquetFile(streaming_path).metadata.num_row_groups == -(-len(REGISTROS) // batch_size)
+    esperado_schema = pq.read_schema(esperado_path).remove_metadata()
+    assert pq.read_schema(streaming_path).remove_metadata().equals(esperado_schema)
+    pd.testing.assert_frame_equal(pd.read_parquet(streaming_path), pd.read_parquet(esperado_path))
+
+
+def test_write_records_streaming_sem_registros(tmp_path):
+    path = tmp_path / 'vazio.parquet'
+
+    assert write_records_streaming(lambda: iter([]), path) == 0
+    assert pd.read_parquet(path).empty
+
+
+def test_bronze_streaming_igual_ao_modo_padrao(workdir):
+    escrever_bronze(*bronze_inicial())
+    tabelas = ('vagas', 'applicants', 'prospects')
+
+    Pipeline.bronze()
+    padrao = {nome: pd.read_parquet(f'app/data/bronze/{nome}.parquet') for nome in tabelas}
+    Pipeline.bronze(streaming=True, batch_size=2)
+
+    for nome in tabelas:
+        pd.testing.assert_frame_equal(pd.read_parquet(f'app/data/bronze/{nome}.parquet'), padrao[nome], obj=nome)
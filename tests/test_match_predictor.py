@@ -0,0 +1,28 @@
+import threading
+
+import numpy as np
+
+from use_cases.match_predictor import MatchPredictor
+
+
+def test_importancia_acumulada_por_varias_threads():
+    predictor = MatchPredictor()
+    predictor.feature_columns = ['a', 'b', 'c']
+    valores = np.array([[1.0, -2.0, 0.5], [-1.0, 2.0, 0.5]])
+    n_threads, n_lotes = 8, 200
+
+    def explicar():
+        for _ in range(n_lotes):
+            predictor._update_feature_importance(valores)
+
+    threads = [threading.Thread(target=explicar) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    acumulado = predictor.background_data['feature_importance_stats']
+    total = n_threads * n_lotes
+    assert acumulado['n'] == 2 * total
+    np.testing.assert_allclose(acumulado['soma'], [2.0 * total, 4.0 * total, 1.0 * total])
+    assert predictor.background_data['feature_importance'] == {'b': 2.0, 'a': 1.0, 'c': 0.5}
@@ -0,0 +1,116 @@
+import pandas as pd
+import pytest
+
+from fixture_data import applicant, bronze_inicial, escrever_bronze, prospect, vaga
+from use_cases.pipeline import Pipeline
+
+TABELAS = ('vagas', 'applicants', 'prospects')
+
+
+def ler_silver():
+    return {nome: pd.read_parquet(f'app/data/silver/{nome}.parquet') for nome in TABELAS}
+
+
+def carga(vagas, applicants, prospects, incremental):
+    escrever_bronze(vagas, applicants, prospects)
+    Pipeline.bronze()
+    manifesto = Pipeline.silver(incremental=incremental)
+    return manifesto, ler_silver()
+
+
+def assert_silver_igual(obtida, esperada):
+    for nome in TABELAS:
+        pd.testing.assert_frame_equal(obtida[nome], esperada[nome], obj=nome)
+
+
+def alterar(vagas, applicants, prospects):
+    """Inclui, altera e remove vagas, aplicantes e candidaturas da exportação inicial."""
+    # vagas: uma nova (com candidatos), uma alterada e uma removida com a sua lista de prospects
+    vagas['4535'] = vaga('Engenheiro de Dados', estado='Minas Gerais', data='10-06-2021')
+    vagas['4531'] = vaga('Desenvolvedor Java Sênior', estado='Rio de Janeiro', ingles='Intermediário')
+    del vagas['4532'], prospects['4532']
+    # applicants: um novo, um alterado e um removido que ainda tem candidatura
+    applicants['106'] = applicant('106', 'Gabriela', cv='Engenheira de dados, Spark e Python')
+    applicants['100'] = applicant('100', 'Ana', cv='Analista de sistemas sênior, Python e Airflow')
+    del applicants['104']
+    # prospects: situação alterada, vaga nova e a vaga sem candidatos que passa a ter um
+    prospects['4530']['prospects'][1] = prospect('103', 'Diego', 'Proposta Aceita')
+    prospects['4535'] = {'titulo': 'Engenheiro de Dados', 'modalidade': '',
+                         'prospects': [prospect('106', 'Gabriela'), prospect('101', 'Bruno')]}
+    prospects['4533']['prospects'].append(prospect('105', 'Fábio'))
+
+
+def test_silver_completa_aplica_schema_e_filtros(workdir):
+    _, silver = carga(*bronze_inicial(), incremental=False)
+
+    # A vaga sem candidatos e a candidatura de aplicante fora da exportação ficam de fora
+    assert silver['vagas']['codigo'].tolist() == [4530, 4531, 4532]
+    assert silver['applicants']['codigo'].tolist() == [100, 101, 102, 103, 104]
+    assert list(zip(silver['prospects']['vaga_codigo'], silver['prospects']['codigo'])) == [
+        (4530, 100), (4530, 103), (4531, 101), (4531, 104), (4532, 100), (4532, 102)]
+
+    assert silver['vagas']['codigo'].dtype == 'int64'
+    assert isinstance(silver['vagas']['perfil_vaga.nivel_ingles'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(silver['prospects']['data_candidatura'])
+    # Data fora do formato vira NaT
+    assert silver['vagas']['informacoes_basicas.limite_esperado_para_contratacao'].isna().all()
+
+
+def test_silver_incremental_igual_a_carga_completa(workdir):
+    vagas, applicants, prospects = bronze_inicial()
+    carga(vagas, applicants, prospects, incremental=False)
+
+    alterar(vagas, applicants, prospects)
+    manifesto, incremental = carga(vagas, applicants, prospects, incremental=True)
+    _, completa = carga(vagas, applicants, prospects, incremental=False)
+
+    assert manifesto['modo'] == 'incremental'
+    assert_silver_igual(incremental, completa)
+    assert manifesto['alteracoes'] == {
+        'vagas': {'novas': 1, 'alteradas': 1, 'removidas': 1},
+        'applicants': {'novos': 1, 'alterados': 1, 'removidos': 1},
+        'prospects': {'grupos_novos': 1, 'grupos_alterados': 2, 'grupos_removidos': 1},
+    }
+    assert manifesto['linhas'] == {nome: len(completa[nome]) for nome in TABELAS}
+
+
+def test_silver_incremental_concatena_linhas_tipadas_com_bronze(workdir):
+    """As linhas mantidas vêm da silver (int64, datas, categorias) e as novas da bronze (texto)."""
+    vagas, applicants, prospects = bronze_inicial()
+    carga(vagas, applicants, prospects, incremental=False)
+
+    vagas['4530'] = vaga('Consultor Control M', data='15-07-2021')
+    applicants['103'] = applicant('103', 'Diego', cv='Especialista em Control M')
+    _, incremental = carga(vagas, applicants, prospects, incremental=True)
+
+    for nome in ('vagas', 'applicants'):
+        assert incremental[nome]['codigo'].dtype == 'int64'
+    datas = incremental['vagas'].set_index('codigo')['informacoes_basicas.data_requicisao']
+    assert datas[4530] == pd.Timestamp('2021-07-15')
+    assert datas[4531] == pd.Timestamp('2021-05-04')
+    assert incremental['applicants'].set_index('codigo').loc[103, 'cv_pt'] == 'Especialista em Control M'
+
+    _, completa = carga(vagas, applicants, prospects, incremental=False)
+    assert_silver_igual(incremental, completa)
+
+
+def test_silver_incremental_sem_alteracoes_nao_regrava(workdir):
+    dados = bronze_inicial()
+    _, antes = carga(*dados, incremental=False)
+
+    manifesto, depois = carga(*dados, incremental=True)
+
+    assert manifesto['tabelas_regravadas'] == []
+    assert manifesto['grupos_prospects_reprocessados'] == 0
+    assert_silver_igual(depois, antes)
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_silver_incremental_sem_snapshot_faz_carga_completa(workdir, streaming):
+    escrever_bronze(*bronze_inicial())
+    Pipeline.bronze(streaming=streaming)
+
+    manifesto = Pipeline.silver(incremental=True)
+
+    assert manifesto['modo'] == 'completo'
+    assert manifesto['linhas'] == {'prospects': 6, 'vagas': 3, 'applicants': 5}
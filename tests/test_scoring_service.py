@@ -0,0 +1,108 @@
+import threading
+
+import numpy as np
+import pytest
+
+from use_cases.inference_plan import InferencePlan
+from use_cases.scoring_service import ScoringService
+
+N_FEATURES = 4
+N_PEDIDOS = 8
+LINHAS_POR_PEDIDO = 3
+
+
+class PredictorRegistrado:
+    """Predictor com um InferencePlan pequeno que registra o tamanho de cada lote pontuado."""
+
+    def __init__(self, erro=None):
+        rng = np.random.default_rng(0)
+        self.plan = InferencePlan(
+            [f'f{i}' for i in range(N_FEATURES)],
+            [rng.normal(size=(N_FEATURES, 5)), rng.normal(size=(5, 1))], [np.zeros(5), np.zeros(1)],
+            ['relu', 'sigmoid'], np.zeros(N_FEATURES), np.ones(N_FEATURES))
+        self.feature_columns = self.plan.feature_columns
+        self.erro = erro
+        self.lotes = []
+
+    def predict_batch(self, X):
+        self.lotes.append(len(X))
+        if self.erro is not None:
+            raise self.erro
+        return self.plan.predict_match(X)
+
+
+def pedidos():
+    rng = np.random.default_rng(1)
+    return [rng.normal(size=(LINHAS_POR_PEDIDO, N_FEATURES)) + i for i in range(N_PEDIDOS)]
+
+
+def enviar_ao_mesmo_tempo(servico, matrizes):
+    """Chama `submit` de uma thread por pedido, todas liberadas juntas; devolve os futures na ordem dos pedidos."""
+    barreira = threading.Barrier(len(matrizes))
+    futuros = [None] * len(matrizes)
+
+    def enviar(i):
+        barreira.wait()
+        futuros[i] = servico.submit(matrizes[i])
+
+    threads = [threading.Thread(target=enviar, args=(i,)) for i in range(len(matrizes))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return futuros
+
+
+def servico_de_um_lote(predictor):
+    # Janela longa: o lote fecha quando todas as linhas chegam
+    return ScoringService(predictor, max_batch_rows=N_PEDIDOS * LINHAS_POR_PEDIDO, max_delay_ms=500)
+
+
+def test_pedidos_concorrentes_recebem_as_proprias_linhas():
+    predictor = PredictorRegistrado()
+    matrizes = pedidos()
+
+    with servico_de_um_lote(predictor) as servico:
+        futuros = enviar_ao_mesmo_tempo(servico, matrizes)
+        resultados = [futuro.result(timeout=5) for futuro in futuros]
+        metricas = servico.metrics()
+
+    assert predictor.lotes == [N_PEDIDOS * LINHAS_POR_PEDIDO]
+    for X, probs in zip(matrizes, resultados):
+        np.testing.assert_allclose(probs, predictor.plan.predict_match(X))
+    assert metricas['batches'] == 1
+    assert metricas['requests'] == N_PEDIDOS
+    assert metricas['rows'] == N_PEDIDOS * LINHAS_POR_PEDIDO
+
+
+def test_erro_chega_a_todos_os_pedidos_do_lote():
+    erro = ValueError("falha na predição")
+    predictor = PredictorRegistrado(erro=erro)
+
+    with servico_de_um_lote(predictor) as servico:
+        futuros = enviar_ao_mesmo_tempo(servico, pedidos())
+        for futuro in futuros:
+            with pytest.raises(ValueError, match="falha na predição"):
+                futuro.result(timeout=5)
+
+        # O serviço continua atendendo depois do erro
+        predictor.erro = None
+        X = pedidos()[0]
+        np.testing.assert_allclose(servico.predict_batch(X, timeout=5), predictor.plan.predict_match(X))
+        metricas = servico.metrics()
+
+    assert predictor.lotes[0] == N_PEDIDOS * LINHAS_POR_PEDIDO
+    assert metricas['errors'] == 1
+    assert metricas['batches'] == 2
+
+
+def test_pedido_vazio_e_servico_parado():
+    predictor = PredictorRegistrado()
+    servico = ScoringService(predictor).start()
+
+    assert servico.submit(np.empty((0, N_FEATURES))).result(timeout=5).shape == (0,)
+    servico.stop()
+
+    assert predictor.lotes == []
+    with pytest.raises(RuntimeError):
+        servico.submit(pedidos()[0])